@@ -1,6 +1,8 @@
 from models.lead_model import LeadData
+from metrics.registry import TEMPLATE_SECONDS, timed
 
 
+@timed(TEMPLATE_SECONDS, template="intake_agent_message")
 def intake_agent_message(lead: LeadData) -> dict:
     """
     First-touch message (WhatsApp / Email) to welcome the lead
@@ -25,6 +27,7 @@ def intake_agent_message(lead: LeadData) -> dict:
     }
 
 
+@timed(TEMPLATE_SECONDS, template="nurture_agent_message")
 def nurture_agent_message(lead: LeadData, scoring_result: dict) -> dict:
     """
     Nurturing message to warm up Warm or Cold leads.
@@ -53,6 +56,7 @@ def nurture_agent_message(lead: LeadData, scoring_result: dict) -> dict:
     }
 
 
+@timed(TEMPLATE_SECONDS, template="ai_call_agent_script")
 def ai_call_agent_script(lead: LeadData, scoring_result: dict) -> dict:
     """
     Simple call script for the AI Call Agent (for Hot leads).
@@ -89,6 +93,7 @@ def ai_call_agent_script(lead: LeadData, scoring_result: dict) -> dict:
     }
 
 
+@timed(TEMPLATE_SECONDS, template="appointment_agent_message")
 def appointment_agent_message(lead: LeadData, scoring_result: dict | None = None) -> dict:
     """
     Hybrid Agent Output:
@@ -184,6 +189,7 @@ def generate_agent_action(lead: LeadData, routing_result: dict, scoring_result:
         "notes": "Low-priority / long-term nurture touch."
     }
 
+@timed(TEMPLATE_SECONDS, template="post_call_followup_agent_message")
 def post_call_followup_agent_message(
     lead: LeadData, 
     scenario: str = "confirmation", 
@@ -284,6 +290,7 @@ def post_call_followup_agent_message(
     }
 
 
+@timed(TEMPLATE_SECONDS, template="reengagement_agent_message")
 def reengagement_agent_message(
     lead: LeadData,
     days_inactive: int = 14,
@@ -1,4 +1,5 @@
 from models.lead_model import LeadData
+from metrics.registry import TEMPLATE_SECONDS, timed
 
 
 def classify_objection(objection: str) -> str:
@@ -43,6 +44,7 @@ def classify_objection(objection: str) -> str:
     return "general"
 
 
+@timed(TEMPLATE_SECONDS, template="objection_response")
 def generate_objection_response(
     lead: LeadData, scoring_result: dict, objection_text: str
 ) -> dict:
@@ -1,6 +1,8 @@
 from models.lead_model import LeadData
+from metrics.registry import STAGE_SECONDS, timed
 
 
+@timed(STAGE_SECONDS, stage="route_lead")
 def route_lead(lead: LeadData, scoring_result: dict) -> dict:
     """
     Simple rule-based routing engine for Sales360.
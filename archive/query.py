@@ -0,0 +1,338 @@
+"""
+archive/query.py
+────────────────
+Vectorised filter / group-by queries over the lead archive
+(archive/store.py), and a CLI for them.
+
+  python -m archive.query --group-by country_region
+  python -m archive.query --group-by call_decision,score_bucket --where country_region=UK
+  python -m archive.query --group-by day --since 2026-09-01 --latest --json
+
+Columns are memory-mapped read-only (numpy.memmap), so a query touches
+only the columns it needs and never copies the archive into the process.
+Filters on dictionary-encoded columns become a lookup table indexed by the
+codes; group keys are packed into one integer per row and counted with
+bincount, so the work is a handful of linear passes over fixed-width
+arrays — no per-row Python.
+
+Group-by dimensions: any categorical column, plus
+  score_bucket  — score // --bucket-width (default 10)
+  day           — UTC date of scored_at
+
+Per group: count, avg_score and the share of rows with each behaviour
+flag (email_opened_rate, link_clicked_rate, whatsapp_replied_rate).
+
+--latest keeps only each lead's last snapshot inside the time window, for
+"state of the book" questions rather than "all scorings".
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from archive.store import ARCHIVE_DIR, COLUMNS, DICT_COLUMNS, FLAG_BITS, StringTable, read_meta
+from scoring.scoring_engine import lead_region
+
+GROUPABLE = tuple(c for c in DICT_COLUMNS if c != "lead_id") + ("score_bucket", "day")
+
+# Above this many possible groups, keys are compacted with np.unique (a sort)
+_DENSE_GROUPS = 1 << 22
+
+# Bits the flags column occupies (see archive/store.py FLAG_BITS)
+_FLAG_SHIFT = 3
+
+
+class QueryError(ValueError):
+    pass
+
+
+class ArchiveReader:
+    """Read-only, memory-mapped view of an archive directory."""
+
+    def __init__(self, directory: str = ARCHIVE_DIR):
+        self.directory = directory
+        self._rows = -1
+        self._columns: dict[str, np.ndarray] = {}
+        self._tables = {c: StringTable(os.path.join(directory, f"{c}.dict")) for c in DICT_COLUMNS}
+
+    @property
+    def rows(self) -> int:
+        return read_meta(self.directory)["rows"]
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """Column arrays for the committed rows, remapped when rows were added."""
+        rows = self.rows
+        if rows != self._rows:
+            columns = {}
+            for name, (_, dtype, _) in COLUMNS.items():
+                if rows == 0:
+                    columns[name] = np.empty(0, dtype=dtype)
+                else:
+                    path = os.path.join(self.directory, f"{name}.col")
+                    columns[name] = np.memmap(path, dtype=dtype, mode="r", shape=(rows,))
+            self._columns, self._rows = columns, rows
+        return self._columns
+
+    def table(self, column: str) -> StringTable:
+        table = self._tables[column]
+        table.refresh()
+        return table
+
+    def stats(self) -> dict:
+        meta = read_meta(self.directory)
+        sizes = {}
+        for name in COLUMNS:
+            path = os.path.join(self.directory, f"{name}.col")
+            sizes[name] = os.path.getsize(path) if os.path.exists(path) else 0
+        return {
+            "directory":     self.directory,
+            "rows":          meta["rows"],
+            "updated_at":    meta.get("updated_at"),
+            "bytes":         sum(sizes.values()),
+            "column_bytes":  sizes,
+            "distinct":      {c: len(self.table(c).values) for c in DICT_COLUMNS},
+        }
+
+
+def _parse_time(value) -> float | None:
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise QueryError(f"not a timestamp or ISO-8601 time: {value!r}") from None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _last_per_lead(lead_ids: np.ndarray) -> np.ndarray:
+    """Row positions of each lead's last snapshot, in row order."""
+    if not len(lead_ids):
+        return np.empty(0, dtype=np.intp)
+    last = np.full(int(lead_ids.max()) + 1, -1, dtype=np.intp)
+    np.maximum.at(last, lead_ids, np.arange(len(lead_ids)))
+    return np.sort(last[last >= 0])
+
+
+def run_query(
+    reader: ArchiveReader,
+    group_by: list[str] | None = None,
+    where: dict[str, list[str]] | None = None,
+    since=None,
+    until=None,
+    min_score: int | None = None,
+    max_score: int | None = None,
+    latest: bool = False,
+    bucket_width: int = 10,
+    limit: int = 1000,
+) -> dict:
+    started = time.perf_counter()
+    group_by = list(group_by or [])
+    where = where or {}
+    for dimension in group_by:
+        if dimension not in GROUPABLE:
+            raise QueryError(f"cannot group by {dimension!r}; choose from {', '.join(GROUPABLE)}")
+    for column in where:
+        if column not in DICT_COLUMNS:
+            raise QueryError(f"cannot filter on {column!r}; choose from {', '.join(DICT_COLUMNS)}")
+    if bucket_width < 1:
+        raise QueryError("bucket_width must be at least 1")
+
+    cols = reader.columns()
+    total = len(cols["score"])
+    since, until = _parse_time(since), _parse_time(until)
+
+    # Row selection: time window first, so --latest means "as of until"
+    selected: np.ndarray | None = None
+    if since is not None or until is not None:
+        ts = cols["scored_at"]
+        mask = np.ones(total, dtype=bool)
+        if since is not None:
+            mask &= ts >= since
+        if until is not None:
+            mask &= ts < until
+        selected = np.flatnonzero(mask)
+    if latest:
+        lead_ids = cols["lead_id"] if selected is None else cols["lead_id"][selected]
+        last = _last_per_lead(lead_ids)
+        selected = last if selected is None else selected[last]
+
+    def column(name: str) -> np.ndarray:
+        return cols[name] if selected is None else cols[name][selected]
+
+    mask = None
+    for name, values in where.items():
+        table = reader.table(name)
+        lut = np.zeros(len(table.values), dtype=bool)
+        for value in values:
+            # Regions are archived normalised (lead_region); older rows may hold the raw spelling
+            candidates = {value, lead_region(value)} if name == "country_region" else {value}
+            for candidate in candidates:
+                code = table.codes.get(candidate)
+                if code is not None:
+                    lut[code] = True
+        hit = lut[column(name)]
+        mask = hit if mask is None else mask & hit
+    score = column("score")
+    if min_score is not None:
+        mask = (score >= min_score) if mask is None else mask & (score >= min_score)
+    if max_score is not None:
+        mask = (score <= max_score) if mask is None else mask & (score <= max_score)
+
+    def final(name: str) -> np.ndarray:
+        values = score if name == "score" else column(name)
+        return values if mask is None else values[mask]
+
+    # Pack the group dimensions into one integer key per row
+    score_rows = final("score")
+    n = len(score_rows)
+    key = None
+    decoders = []
+    cardinality = 1
+    for dimension in group_by:
+        if dimension == "score_bucket":
+            codes = (score_rows // bucket_width).astype(np.int64)
+            offset = int(codes.min()) if n else 0
+            codes -= offset
+            size = int(codes.max()) + 1 if n else 1
+            decode = lambda c, w=bucket_width, o=offset: f"{(c + o) * w}-{(c + o + 1) * w - 1}"
+        elif dimension == "day":
+            codes = (final("scored_at") // 86400).astype(np.int64)
+            offset = int(codes.min()) if n else 0
+            codes -= offset
+            size = int(codes.max()) + 1 if n else 1
+            decode = lambda c, o=offset: datetime.fromtimestamp((c + o) * 86400, timezone.utc).date().isoformat()
+        else:
+            values = reader.table(dimension).values
+            codes = final(dimension).astype(np.int64)
+            size = len(values)
+            decode = values.__getitem__
+        cardinality *= size
+        if cardinality >= 1 << 59:
+            raise QueryError("too many group-by combinations; drop a dimension")
+        if key is None:
+            key = codes
+        else:
+            key *= size
+            key += codes
+        decoders.append((decode, size))
+    if key is None:
+        key = np.zeros(n, dtype=np.int64)
+
+    if cardinality > _DENSE_GROUPS:
+        group_keys, key = np.unique(key, return_inverse=True)
+        slots = len(group_keys)
+    else:
+        group_keys, slots = None, cardinality
+
+    # Flags ride along in the low bits, so one bincount gives both the row
+    # count and each flag's count per group
+    score_sums = np.bincount(key, weights=score_rows, minlength=slots)
+    key <<= _FLAG_SHIFT
+    key |= final("flags")
+    by_flags = np.bincount(key, minlength=slots << _FLAG_SHIFT).reshape(slots, 1 << _FLAG_SHIFT)
+    counts = by_flags.sum(axis=1)
+    combos = np.arange(1 << _FLAG_SHIFT)
+    flag_counts = {flag: by_flags[:, (combos & bit) != 0].sum(axis=1) for flag, bit in FLAG_BITS.items()}
+
+    groups = []
+    present = np.flatnonzero(counts)
+    for slot in present[np.argsort(-counts[present], kind="stable")][:limit]:
+        packed = int(group_keys[slot]) if group_keys is not None else int(slot)
+        labels = {}
+        for dimension, (decode, size) in zip(reversed(group_by), reversed(decoders)):
+            packed, code = divmod(packed, size)
+            labels[dimension] = decode(code)
+        count = int(counts[slot])
+        groups.append({
+            **{d: labels[d] for d in group_by},
+            "count":     count,
+            "avg_score": round(float(score_sums[slot]) / count, 2),
+            **{f"{flag}_rate": round(float(flag_counts[flag][slot]) / count, 4) for flag in FLAG_BITS},
+        })
+
+    return {
+        "rows_total":   total,
+        "rows_matched": n,
+        "group_by":     group_by,
+        "groups":       groups,
+        "truncated":    len(present) > limit,
+        "elapsed_ms":   round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def parse_where(items: list[str]) -> dict[str, list[str]]:
+    """["country_region=UK", "country_region=Dubai", "call_decision=call_now"] → filters."""
+    where: dict[str, list[str]] = {}
+    for item in items:
+        column, sep, value = item.partition("=")
+        if not sep:
+            raise QueryError(f"filter {item!r} is not column=value")
+        where.setdefault(column.strip(), []).extend(v.strip() for v in value.split("|"))
+    return where
+
+
+def _print(result: dict) -> None:
+    print(f"{result['rows_matched']:,} of {result['rows_total']:,} rows in {result['elapsed_ms']:.1f} ms")
+    if not result["groups"]:
+        return
+    headers = list(result["groups"][0])
+    widths = {h: max(len(h), *(len(str(g[h])) for g in result["groups"])) for h in headers}
+    print("  ".join(h.ljust(widths[h]) for h in headers))
+    for group in result["groups"]:
+        print("  ".join(str(group[h]).ljust(widths[h]) for h in headers))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Group-by / filter queries over the SmartCore lead archive.")
+    parser.add_argument("--dir", default=ARCHIVE_DIR, help="Archive directory")
+    parser.add_argument("--group-by", default="", help=f"Comma-separated: {', '.join(GROUPABLE)}")
+    parser.add_argument("--where", action="append", default=[],
+                        help="column=value (repeatable; value1|value2 for any of)")
+    parser.add_argument("--since", help="ISO date/time or epoch seconds (inclusive)")
+    parser.add_argument("--until", help="ISO date/time or epoch seconds (exclusive)")
+    parser.add_argument("--min-score", type=int)
+    parser.add_argument("--max-score", type=int)
+    parser.add_argument("--latest", action="store_true", help="Only each lead's last snapshot")
+    parser.add_argument("--bucket-width", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--stats", action="store_true", help="Print archive size and exit")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args()
+
+    reader = ArchiveReader(args.dir)
+    if args.stats:
+        print(json.dumps(reader.stats(), indent=2))
+        return
+    try:
+        result = run_query(
+            reader,
+            group_by=[d.strip() for d in args.group_by.split(",") if d.strip()],
+            where=parse_where(args.where),
+            since=args.since, until=args.until,
+            min_score=args.min_score, max_score=args.max_score,
+            latest=args.latest, bucket_width=args.bucket_width, limit=args.limit,
+        )
+    except QueryError as e:
+        parser.error(str(e))
+    if args.json:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    else:
+        _print(result)
+
+
+if __name__ == "__main__":
+    main()
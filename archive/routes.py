@@ -0,0 +1,57 @@
+"""
+archive/routes.py
+─────────────────
+FastAPI router for the columnar lead archive (archive/store.py).
+
+Endpoints:
+  GET /archive/query?group_by=country_region,score_bucket
+  GET /archive/query?group_by=call_decision&where=country_region=UK&latest=true
+                                            → vectorised group-by over every
+                                              archived scoring (archive/query.py)
+  GET /archive/stats                        → rows, bytes per column, distinct values
+"""
+
+from fastapi import APIRouter, HTTPException, Query
+
+from archive.query import GROUPABLE, ArchiveReader, QueryError, parse_where, run_query
+from archive.store import ArchiveError
+from profiling.profiler import ProfiledRoute
+
+router = APIRouter(prefix="/archive", tags=["Lead archive"], route_class=ProfiledRoute)
+
+_reader = ArchiveReader()
+
+
+@router.get("/query")
+def archive_query(
+    group_by: str = Query(default="", description=f"Comma-separated: {', '.join(GROUPABLE)}"),
+    where: list[str] = Query(default=[], description="column=value, repeatable; value1|value2 for any of"),
+    since: str = Query(default=None, description="ISO date/time or epoch seconds (inclusive)"),
+    until: str = Query(default=None, description="ISO date/time or epoch seconds (exclusive)"),
+    min_score: int = Query(default=None),
+    max_score: int = Query(default=None),
+    latest: bool = Query(default=False, description="Only each lead's last snapshot in the window"),
+    bucket_width: int = Query(default=10, ge=1, le=100),
+    limit: int = Query(default=1000, ge=1, le=100_000),
+):
+    """
+    Count, average score and behaviour-flag rates per group, scanned
+    straight from the memory-mapped archive — no Zoho round trip.
+    """
+    try:
+        result = run_query(
+            _reader,
+            group_by=[d.strip() for d in group_by.split(",") if d.strip()],
+            where=parse_where(where),
+            since=since, until=until,
+            min_score=min_score, max_score=max_score,
+            latest=latest, bucket_width=bucket_width, limit=limit,
+        )
+    except (QueryError, ArchiveError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"success": True, **result}
+
+
+@router.get("/stats")
+def archive_stats():
+    return {"success": True, **_reader.stats()}
@@ -0,0 +1,340 @@
+"""
+archive/store.py
+────────────────
+Append-only columnar archive of every scored / routed lead snapshot, for
+historical analytics (score distributions by region, call_decision mix
+over time, ...) without re-downloading the book from Zoho.
+
+Every score_store change is buffered in memory and appended to the
+archive every SMARTCORE_ARCHIVE_FLUSH_S (and on shutdown). On disk, one
+directory:
+
+  meta.json        format version, committed row count
+  <column>.col     one fixed-width little-endian array per column
+  <column>.dict    string table of a dictionary-encoded column, one value
+                   per line; a row stores the value's line number
+
+Columns (see COLUMNS): scored_at (float64 epoch — the entry's own
+scored_at, so replayed or restored entries land on the day they were
+scored), score (int16), flags (uint8 bitmask of the behaviour flags),
+lead_id (uint32 code) and the categorical segments as uint16 codes; the
+region is stored normalised (scoring_engine.lead_region). Code 0 is
+always "unknown".
+
+Readers (archive/query.py) memory-map the column files, so a scan reads
+the page cache directly and nothing is parsed or copied per row.
+
+Appends are crash-safe and multi-worker safe: a flush takes an exclusive
+file lock, truncates each column back to the committed row count (which
+drops any half-written tail of a crashed flush), appends, fsyncs, then
+commits the new row count by atomically replacing meta.json.
+
+The writer needs only the standard library; numpy is imported by the
+query side only, so archiving adds nothing to startup.
+
+Environment variables:
+  SMARTCORE_ARCHIVE             — "0" disables archiving
+  SMARTCORE_ARCHIVE_DIR         — archive directory (default "lead_archive")
+  SMARTCORE_ARCHIVE_FLUSH_S     — flush interval (default 5)
+  SMARTCORE_ARCHIVE_MAX_BUFFER  — buffered rows before new ones are dropped
+                                  (default 100000)
+"""
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from array import array
+from datetime import datetime
+
+from metrics.registry import counter
+from scoring.score_store import add_listener
+from scoring.scoring_engine import lead_region
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.environ.get("SMARTCORE_ARCHIVE", "1") != "0"
+ARCHIVE_DIR = os.environ.get("SMARTCORE_ARCHIVE_DIR", "lead_archive")
+FLUSH_SECONDS = float(os.environ.get("SMARTCORE_ARCHIVE_FLUSH_S", "5"))
+MAX_BUFFER = int(os.environ.get("SMARTCORE_ARCHIVE_MAX_BUFFER", "100000"))
+
+FORMAT_VERSION = 1
+UNKNOWN = "unknown"
+
+# column → (array typecode, numpy dtype, dictionary-encoded)
+COLUMNS = {
+    "scored_at":      ("d", "<f8", False),
+    "score":          ("h", "<i2", False),
+    "flags":          ("B", "u1",  False),
+    "lead_id":        ("I", "<u4", True),
+    "intent_level":   ("H", "<u2", True),
+    "call_decision":  ("H", "<u2", True),
+    "country_region": ("H", "<u2", True),
+    "industry_type":  ("H", "<u2", True),
+    "lead_source":    ("H", "<u2", True),
+    "entry_channel":  ("H", "<u2", True),
+    "assigned_agent": ("H", "<u2", True),
+    "source":         ("H", "<u2", True),
+}
+DICT_COLUMNS = tuple(c for c, (_, _, encoded) in COLUMNS.items() if encoded)
+
+# Bits of the flags column
+FLAG_BITS = {"email_opened": 1, "link_clicked": 2, "whatsapp_replied": 4}
+
+_MAX_CODE = {"H": 0xFFFF, "I": 0xFFFFFFFF}
+
+
+def _timestamp(scored_at) -> float:
+    """Epoch seconds of a score_store scored_at (ISO-8601); now if missing or unreadable."""
+    if isinstance(scored_at, (int, float)):
+        return float(scored_at)
+    try:
+        return datetime.fromisoformat(scored_at).timestamp()
+    except (TypeError, ValueError):
+        return time.time()
+
+ARCHIVE_ROWS = counter(
+    "smartcore_archive_rows_total",
+    "Lead snapshots archived (written) or lost to a full buffer (dropped).",
+    ("outcome",),
+)
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def read_meta(directory: str) -> dict:
+    try:
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        return {"format": FORMAT_VERSION, "rows": 0}
+    if meta.get("format") != FORMAT_VERSION:
+        raise ArchiveError(f"archive {directory} has format {meta.get('format')}, expected {FORMAT_VERSION}")
+    return meta
+
+
+class StringTable:
+    """Append-only value ↔ code table of one dictionary-encoded column."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.values: list[str] = [UNKNOWN]
+        self.codes: dict[str, int] = {UNKNOWN: 0}
+        self._offset = 0
+
+    def refresh(self) -> None:
+        """Picks up values appended since the last read (by any process)."""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b"\n") + 1  # ignore a torn last line
+        for value in data[:end].decode("utf-8").split("\n")[:-1]:
+            self.codes.setdefault(value, len(self.values))
+            self.values.append(value)
+        self._offset += end
+
+    def mark_read(self) -> None:
+        self._offset = os.path.getsize(self.path)
+
+    def encode(self, value, new: list[str], limit: int) -> int:
+        if value is None or value == "":
+            return 0
+        value = str(value).replace("\n", " ")
+        code = self.codes.get(value)
+        if code is None:
+            if len(self.values) > limit:
+                return 0  # table full: archived as unknown
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+            new.append(value)
+        return code
+
+
+class ArchiveWriter:
+    def __init__(self, directory: str = ARCHIVE_DIR, max_buffer: int = MAX_BUFFER):
+        self.directory = directory
+        self.max_buffer = max_buffer
+        self._buffer: list[tuple] = []
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._tables = {c: StringTable(os.path.join(directory, f"{c}.dict")) for c in DICT_COLUMNS}
+
+    def append(self, entry: dict) -> None:
+        """Buffers one lead snapshot (score_store entry)."""
+        lead = entry.get("lead") or {}
+        scoring = entry.get("scoring") or {}
+        routing = entry.get("routing") or {}
+        flags = 0
+        for flag, bit in FLAG_BITS.items():
+            if lead.get(flag):
+                flags |= bit
+        row = (
+            _timestamp(entry.get("scored_at")),
+            max(-32768, min(32767, int(scoring.get("score") or 0))),
+            flags,
+            entry.get("lead_id"),
+            scoring.get("intent_level"),
+            scoring.get("call_decision"),
+            lead_region(lead.get("country_region"), lead.get("country")) or None,
+            lead.get("industry_type"),
+            lead.get("lead_source"),
+            lead.get("entry_channel"),
+            routing.get("assigned_agent"),
+            entry.get("source"),
+        )
+        with self._buffer_lock:
+            if len(self._buffer) >= self.max_buffer:
+                ARCHIVE_ROWS.labels(outcome="dropped").inc()
+                return
+            self._buffer.append(row)
+
+    def append_columns(self, columns: dict[str, object]) -> int:
+        """
+        Appends already encoded columns — lists or contiguous buffers (e.g.
+        numpy arrays of the COLUMNS dtype) of equal length, with codes from
+        intern(). For bulk loads and benchmarks.
+        """
+        data = {}
+        for name, (typecode, _, _) in COLUMNS.items():
+            values = columns[name]
+            data[name] = _pack(typecode, values) if isinstance(values, (list, tuple)) else memoryview(values).cast("B")
+        widths = {name: array(COLUMNS[name][0]).itemsize for name in COLUMNS}
+        counts = {len(blob) // widths[name] for name, blob in data.items()}
+        if len(counts) != 1 or any(len(blob) % widths[name] for name, blob in data.items()):
+            raise ArchiveError("columns differ in length")
+
+        with self._flush_lock, self._locked():
+            meta = read_meta(self.directory)
+            rows = meta["rows"]
+            for name, blob in data.items():
+                self._append_column(name, rows, blob)
+            n = counts.pop()
+            self._commit(meta, rows + n)
+        return n
+
+    def flush(self) -> int:
+        """Writes the buffered rows; returns how many were written."""
+        with self._buffer_lock:
+            rows_in, self._buffer = self._buffer, []
+        if not rows_in:
+            return 0
+
+        with self._flush_lock, self._locked():
+            meta = read_meta(self.directory)
+            rows = meta["rows"]
+            columns = list(zip(*rows_in))
+            for i, (name, (typecode, _, encoded)) in enumerate(COLUMNS.items()):
+                values = columns[i]
+                if encoded:
+                    values = self._encode(name, values)
+                self._append_column(name, rows, _pack(typecode, values))
+            self._commit(meta, rows + len(rows_in))
+
+        ARCHIVE_ROWS.labels(outcome="written").inc(len(rows_in))
+        return len(rows_in)
+
+    def intern(self, column: str, values: list[str]) -> list[int]:
+        """Codes for `values` in a dictionary-encoded column, adding new ones."""
+        with self._flush_lock, self._locked():
+            return self._encode(column, values)
+
+    def table(self, column: str) -> StringTable:
+        table = self._tables[column]
+        table.refresh()
+        return table
+
+    # ── Internals ─────────────────────────────────────────────────────────
+    def _locked(self):
+        os.makedirs(self.directory, exist_ok=True)
+        return _FileLock(os.path.join(self.directory, ".lock"))
+
+    def _encode(self, column: str, values) -> list[int]:
+        """Encodes under the file lock; new values are persisted first."""
+        table = self._tables[column]
+        table.refresh()
+        new: list[str] = []
+        codes = [table.encode(v, new, _MAX_CODE[COLUMNS[column][0]]) for v in values]
+        if new:
+            with open(table.path, "ab") as f:
+                f.write(("\n".join(new) + "\n").encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+            table.mark_read()
+        return codes
+
+    def _append_column(self, name: str, rows: int, data) -> None:
+        path = os.path.join(self.directory, f"{name}.col")
+        with open(path, "ab") as f:
+            f.truncate(rows * array(COLUMNS[name][0]).itemsize)  # drop a crashed flush's tail
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _commit(self, meta: dict, rows: int) -> None:
+        meta = {**meta, "format": FORMAT_VERSION, "rows": rows,
+                "columns": {c: dtype for c, (_, dtype, _) in COLUMNS.items()}, "updated_at": time.time()}
+        path = os.path.join(self.directory, "meta.json")
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, path)
+
+
+class _FileLock:
+    """Exclusive flock, so workers sharing the directory append in turn."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __enter__(self):
+        self._f = open(self.path, "a")
+        fcntl.flock(self._f, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        fcntl.flock(self._f, fcntl.LOCK_UN)
+        self._f.close()
+
+
+def _pack(typecode: str, values) -> bytes:
+    packed = array(typecode, values)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+# ── Process-wide writer fed by score_store ────────────────────────────────
+archive_writer = ArchiveWriter()
+
+
+def archive_entry(entry: dict | None, previous: dict | None) -> None:
+    """score_store listener: archives every new snapshot (removals are not rows)."""
+    if entry is not None:
+        archive_writer.append(entry)
+
+
+def flush_archive() -> None:
+    try:
+        archive_writer.flush()
+    except Exception:
+        logger.exception("Lead archive flush failed")
+
+
+async def flush_periodically(interval: float = FLUSH_SECONDS) -> None:
+    """Background task started from the app lifespan."""
+    while True:
+        await asyncio.sleep(interval)
+        await asyncio.to_thread(flush_archive)
+
+
+if ENABLED:
+    add_listener(archive_entry)
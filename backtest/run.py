@@ -0,0 +1,310 @@
+"""
+backtest/run.py
+───────────────
+Replays a historical lead file through two rule versions side by side
+and reports what would change.
+
+  python -m backtest.run --data leads.jsonl --a git:HEAD --b current
+  python -m backtest.run --data zoho_export.csv --zoho --a current --b learned
+  python -m backtest.run --synthetic 2000000 --a git:HEAD~1 --b current --out diff.json
+
+Versions are described in backtest/versions.py. For every lead, both
+versions score it (batch engines: the learned engine scores a whole chunk
+at once) and route it; the report has:
+
+  summary       leads, share whose intent / call_decision / agent changed,
+                mean score delta, throughput
+  transitions   intent_level, call_decision and assigned_agent matrices
+                (rows = version A, columns = version B)
+  segments      per country_region / industry_type / lead_source /
+                entry_channel value: leads, avg score A → B, Hot share
+                A → B, how many changed intent or agent
+  score_delta   histogram of B − A
+  samples       up to --samples lead ids per intent transition
+
+Memory stays bounded whatever the file size: the input is streamed in
+chunks of --chunk-size rows, at most two chunks per worker are in flight,
+and workers send back only aggregates. Chunks run in a process pool
+(--workers, default all cores), each worker loading both versions once.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+SEGMENTS = ("country_region", "industry_type", "lead_source", "entry_channel")
+TRANSITIONS = ("intent_level", "call_decision", "assigned_agent")
+
+# Per segment value: leads, score sum A, score sum B, Hot A, Hot B, intent changed, agent changed
+_SEGMENT_FIELDS = 7
+
+_worker: dict = {}
+
+
+# ── Worker side ─────────────────────────────────────────────────────────────
+def _init_worker(spec_a: str, spec_b: str, zoho: bool, samples: int) -> None:
+    from backtest.versions import load_version
+    _worker.update(a=load_version(spec_a), b=load_version(spec_b), zoho=zoho, samples=samples)
+
+
+def _decode(kind: str, payload) -> tuple[list, list, int]:
+    """A chunk → (leads, ids, invalid rows)."""
+    from pydantic import ValidationError
+
+    from models.codec import LEAD_ADAPTER, LEAD_LIST_ADAPTER, loads
+    from models.lead_model import LeadData
+
+    if kind == "synthetic":
+        from bench.synthetic import make_lead_dicts
+        index, size, seed = payload
+        rows = make_lead_dicts(size, seed + index)
+        for i, row in enumerate(rows):
+            row["lead_id"] = f"S{index}-{i}"
+        leads = LEAD_LIST_ADAPTER.validate_python(rows)
+        return leads, [lead.lead_id for lead in leads], 0
+
+    if kind == "jsonl" and not _worker["zoho"]:
+        try:  # whole chunk in one validate_json call; per line only if a row is bad
+            leads = LEAD_LIST_ADAPTER.validate_json(b"[" + b",".join(payload) + b"]")
+            return leads, [lead.lead_id for lead in leads], 0
+        except ValueError:
+            pass
+
+    if _worker["zoho"]:
+        from zoho.zoho_client import lead_data_from_record
+        to_lead = lead_data_from_record
+    else:
+        fields = set(LeadData.model_fields)
+        to_lead = lambda row: LEAD_ADAPTER.validate_python(  # noqa: E731
+            {k: v for k, v in row.items() if k in fields and v not in ("", None)})
+
+    leads, ids, invalid = [], [], 0
+    for item in payload:
+        try:
+            row = loads(item) if kind == "jsonl" else item
+            lead = to_lead(row)
+        except (ValueError, ValidationError, TypeError):
+            invalid += 1
+            continue
+        leads.append(lead)
+        ids.append(lead.lead_id or row.get("id"))
+    return leads, ids, invalid
+
+
+def _run_chunk(kind: str, payload) -> dict:
+    leads, ids, invalid = _decode(kind, payload)
+    version_a, version_b = _worker["a"], _worker["b"]
+    scorings_a = version_a.score_chunk(leads)
+    scorings_b = version_b.score_chunk(leads)
+
+    transitions = Counter()
+    segments: dict[tuple[str, str], list[int]] = defaultdict(lambda: [0] * _SEGMENT_FIELDS)
+    deltas = Counter()
+    samples: dict[tuple[str, str], list] = defaultdict(list)
+    limit = _worker["samples"]
+
+    for lead, lead_id, a, b in zip(leads, ids, scorings_a, scorings_b):
+        agent_a = version_a.route(lead, a).get("assigned_agent")
+        agent_b = version_b.route(lead, b).get("assigned_agent")
+        intent_a, intent_b = a["intent_level"], b["intent_level"]
+        transitions["intent_level", intent_a, intent_b] += 1
+        transitions["call_decision", a["call_decision"], b["call_decision"]] += 1
+        transitions["assigned_agent", agent_a, agent_b] += 1
+        deltas[b["score"] - a["score"]] += 1
+        if intent_a != intent_b and len(samples[intent_a, intent_b]) < limit:
+            samples[intent_a, intent_b].append(lead_id)
+
+        row = (1, a["score"], b["score"], intent_a == "Hot", intent_b == "Hot",
+               intent_a != intent_b, agent_a != agent_b)
+        for dimension in SEGMENTS:
+            bucket = segments[dimension, getattr(lead, dimension) or "unknown"]
+            for i, value in enumerate(row):
+                bucket[i] += value
+
+    return {"leads": len(leads), "invalid": invalid, "transitions": transitions,
+            "segments": dict(segments), "deltas": deltas, "samples": dict(samples)}
+
+
+# ── Input ───────────────────────────────────────────────────────────────────
+def _chunks(args):
+    """Yields (kind, payload) chunks without reading ahead of the caller."""
+    size = args.chunk_size
+    if args.synthetic:
+        for index, start in enumerate(range(0, args.synthetic, size)):
+            yield "synthetic", (index, min(size, args.synthetic - start), args.seed)
+        return
+
+    if args.data.endswith(".csv"):
+        with open(args.data, newline="", encoding="utf-8") as f:
+            chunk = []
+            for row in csv.DictReader(f):
+                chunk.append(row)
+                if len(chunk) >= size:
+                    yield "csv", chunk
+                    chunk = []
+            if chunk:
+                yield "csv", chunk
+        return
+
+    with open(args.data, "rb") as f:
+        chunk = []
+        for line in f:
+            line = line.strip()
+            if line:
+                chunk.append(line)
+                if len(chunk) >= size:
+                    yield "jsonl", chunk
+                    chunk = []
+        if chunk:
+            yield "jsonl", chunk
+
+
+# ── Aggregation and report ──────────────────────────────────────────────────
+class Totals:
+    def __init__(self, samples: int):
+        self.leads = 0
+        self.invalid = 0
+        self.transitions = Counter()
+        self.segments: dict[tuple[str, str], list[int]] = defaultdict(lambda: [0] * _SEGMENT_FIELDS)
+        self.deltas = Counter()
+        self.samples: dict[tuple[str, str], list] = defaultdict(list)
+        self.sample_limit = samples
+
+    def merge(self, part: dict) -> None:
+        self.leads += part["leads"]
+        self.invalid += part["invalid"]
+        self.transitions.update(part["transitions"])
+        self.deltas.update(part["deltas"])
+        for key, values in part["segments"].items():
+            bucket = self.segments[key]
+            for i, value in enumerate(values):
+                bucket[i] += value
+        for key, ids in part["samples"].items():
+            room = self.sample_limit - len(self.samples[key])
+            self.samples[key].extend(ids[:max(room, 0)])
+
+    def report(self, spec_a: str, spec_b: str, elapsed: float) -> dict:
+        n = self.leads or 1
+        matrices = {}
+        changed = {}
+        for dimension in TRANSITIONS:
+            cells = {(a, b): c for (d, a, b), c in self.transitions.items() if d == dimension}
+            labels = sorted({str(a) for a, _ in cells} | {str(b) for _, b in cells})
+            matrices[dimension] = {
+                "labels": labels,
+                "counts": [[cells.get((row, col), 0) for col in labels] for row in labels],
+            }
+            changed[dimension] = round(sum(c for (a, b), c in cells.items() if a != b) / n, 4)
+
+        segments = {}
+        for (dimension, value), (count, sum_a, sum_b, hot_a, hot_b, intent_moved, agent_moved) in sorted(
+                self.segments.items(), key=lambda kv: (kv[0][0], -kv[1][0])):
+            segments.setdefault(dimension, []).append({
+                "value":          value,
+                "leads":          count,
+                "avg_score_a":    round(sum_a / count, 2),
+                "avg_score_b":    round(sum_b / count, 2),
+                "avg_score_delta": round((sum_b - sum_a) / count, 2),
+                "hot_share_a":    round(hot_a / count, 4),
+                "hot_share_b":    round(hot_b / count, 4),
+                "intent_changed": intent_moved,
+                "agent_changed":  agent_moved,
+            })
+
+        return {
+            "a": spec_a,
+            "b": spec_b,
+            "summary": {
+                "leads":            self.leads,
+                "invalid_rows":     self.invalid,
+                "changed_share":    changed,
+                "mean_score_delta": round(sum(d * c for d, c in self.deltas.items()) / n, 3),
+                "elapsed_s":        round(elapsed, 2),
+                "leads_per_s":      round(self.leads / elapsed) if elapsed else None,
+            },
+            "transitions": matrices,
+            "segments":    segments,
+            "score_delta": {str(d): c for d, c in sorted(self.deltas.items())},
+            "samples":     {f"{a} -> {b}": ids for (a, b), ids in sorted(self.samples.items())},
+        }
+
+
+def _print(report: dict, top: int) -> None:
+    s = report["summary"]
+    print(f"\n{report['a']}  →  {report['b']}")
+    print(f"{s['leads']:,} leads ({s['invalid_rows']:,} invalid rows skipped) in {s['elapsed_s']} s, "
+          f"{s['leads_per_s']:,} leads/s")
+    print(f"mean score delta {s['mean_score_delta']:+}; changed: "
+          + ", ".join(f"{d} {v:.1%}" for d, v in s["changed_share"].items()))
+
+    for dimension, matrix in report["transitions"].items():
+        labels = matrix["labels"]
+        width = max([12, *map(len, labels)]) + 2
+        print(f"\n{dimension} (rows A, columns B)")
+        print(" " * width + "".join(label[:width - 2].rjust(width) for label in labels))
+        for label, row in zip(labels, matrix["counts"]):
+            print(label.ljust(width) + "".join(f"{c:>{width},}" for c in row))
+
+    for dimension, rows in report["segments"].items():
+        print(f"\n{dimension} (top {top} by leads)")
+        print(f"  {'value':<24}{'leads':>10}{'score A':>9}{'score B':>9}{'Δ':>7}{'hot A':>8}{'hot B':>8}"
+              f"{'moved':>9}")
+        for row in rows[:top]:
+            print(f"  {str(row['value'])[:23]:<24}{row['leads']:>10,}{row['avg_score_a']:>9.1f}"
+                  f"{row['avg_score_b']:>9.1f}{row['avg_score_delta']:>+7.1f}{row['hot_share_a']:>8.1%}"
+                  f"{row['hot_share_b']:>8.1%}{row['intent_changed']:>9,}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backtest two scoring / routing rule versions side by side.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--data", help="Historical leads as .jsonl or .csv")
+    source.add_argument("--synthetic", type=int, metavar="N", help="Replay N synthetic leads instead")
+    parser.add_argument("--zoho", action="store_true", help="Rows are raw Zoho lead records")
+    parser.add_argument("--a", default="git:HEAD", help="Baseline version (default git:HEAD)")
+    parser.add_argument("--b", default="current", help="Candidate version (default current)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--samples", type=int, default=5, help="Lead ids kept per intent transition")
+    parser.add_argument("--top", type=int, default=10, help="Segment values printed per dimension")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", help="Write the full report JSON here")
+    args = parser.parse_args()
+
+    from backtest.versions import VersionError, load_version
+    try:  # fail fast, before any worker starts
+        load_version(args.a), load_version(args.b)
+    except VersionError as e:
+        parser.error(str(e))
+
+    totals = Totals(args.samples)
+    started = time.perf_counter()
+    window = 2 * args.workers
+    with ProcessPoolExecutor(args.workers, initializer=_init_worker,
+                             initargs=(args.a, args.b, args.zoho, args.samples)) as pool:
+        pending = set()
+        for kind, payload in _chunks(args):
+            pending.add(pool.submit(_run_chunk, kind, payload))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    totals.merge(future.result())
+        for future in pending:
+            totals.merge(future.result())
+
+    report = totals.report(args.a, args.b, time.perf_counter() - started)
+    if args.out:  # before printing, so the report survives a display problem
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    _print(report, args.top)
+    if args.out:
+        print(f"\nSaved {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+backtest/versions.py
+────────────────────
+Rule versions a backtest can replay leads through.
+
+  current            scoring/scoring_engine.py + agents/routing_engine.py
+                     as they are in the working tree
+  git:<ref>          both files as committed at <ref> (e.g. git:HEAD~3,
+                     git:main) — compare a local edit against the last commit
+  path:<dir>         <dir>/scoring/scoring_engine.py and
+                     <dir>/agents/routing_engine.py (another checkout or a
+                     scratch copy); a file missing there falls back to current
+  learned[:<file>]   the learned engine (scoring/learned_engine.py) with the
+                     current routing; <file> defaults to SMARTCORE_SCORING_MODEL
+
+Older sources are executed as private modules (never put in sys.modules),
+so two versions of the same file live side by side in one process. Their
+own imports resolve against the current tree.
+"""
+
+import os
+import subprocess
+import types
+
+SCORING_PATH = "scoring/scoring_engine.py"
+ROUTING_PATH = "agents/routing_engine.py"
+
+
+class VersionError(ValueError):
+    pass
+
+
+class RuleVersion:
+    """score_chunk(leads) → scoring results; route(lead, scoring) → routing result."""
+
+    def __init__(self, spec: str, score_chunk, route):
+        self.spec = spec
+        self.score_chunk = score_chunk
+        self.route = route
+
+
+def _module_from_source(source: str, origin: str) -> types.ModuleType:
+    module = types.ModuleType(f"backtest_version:{origin}")
+    module.__file__ = origin
+    exec(compile(source, origin, "exec"), module.__dict__)
+    return module
+
+
+def _git_source(ref: str, path: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", "show", f"{ref}:{path}"], capture_output=True, text=True, check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError) as e:
+        detail = getattr(e, "stderr", "") or str(e)
+        raise VersionError(f"cannot read {path} at {ref}: {detail.strip()}")
+
+
+def _rules(spec: str, scoring, routing) -> RuleVersion:
+    score = scoring.score_lead
+    return RuleVersion(spec, lambda leads: [score(lead) for lead in leads], routing.route_lead)
+
+
+def load_version(spec: str) -> RuleVersion:
+    from agents import routing_engine
+    from scoring import scoring_engine
+
+    kind, _, arg = spec.partition(":")
+    if kind == "current":
+        return _rules(spec, scoring_engine, routing_engine)
+
+    if kind == "git":
+        if not arg:
+            raise VersionError("git: needs a ref, e.g. git:HEAD")
+        scoring = _module_from_source(_git_source(arg, SCORING_PATH), f"{arg}:{SCORING_PATH}")
+        routing = _module_from_source(_git_source(arg, ROUTING_PATH), f"{arg}:{ROUTING_PATH}")
+        return _rules(spec, scoring, routing)
+
+    if kind == "path":
+        modules = []
+        for path, current in ((SCORING_PATH, scoring_engine), (ROUTING_PATH, routing_engine)):
+            full = os.path.join(arg, path)
+            if os.path.exists(full):
+                with open(full, encoding="utf-8") as f:
+                    modules.append(_module_from_source(f.read(), full))
+            else:
+                modules.append(current)
+        return _rules(spec, *modules)
+
+    if kind == "learned":
+        from scoring.learned_engine import MODEL_PATH, LearnedModel, ModelUnavailable
+        try:
+            model = LearnedModel.load(arg or MODEL_PATH)
+        except ModelUnavailable as e:
+            raise VersionError(str(e))
+        return RuleVersion(spec, model.score_batch, routing_engine.route_lead)
+
+    raise VersionError(f"unknown version {spec!r}; use current, git:<ref>, path:<dir> or learned[:<file>]")
@@ -0,0 +1,115 @@
+"""
+bench/archive_bench.py
+──────────────────────
+Scan cost of the columnar lead archive (archive/query.py) at scale.
+
+  python -m bench.archive_bench                        # 10M rows, temp dir
+  python -m bench.archive_bench --rows 1000000 --dir /tmp/arch --keep
+  python -m bench.archive_bench --budget-ms 1000       # exit 1 if a query is slower
+
+Builds an archive of --rows synthetic snapshots (segment mix from
+bench/synthetic.py's weights, ~--leads distinct leads rescored over 90
+days) through ArchiveWriter.append_columns, then times representative
+queries: best of --repeats, with the page cache warm, as a dashboard
+would hit them.
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from archive.query import ArchiveReader, run_query
+from archive.store import COLUMNS, ArchiveWriter
+from bench.synthetic import ENTRY_CHANNELS, INDUSTRIES, LEAD_SOURCES, REGIONS
+
+INTENTS = [("Hot", 15), ("Warm", 35), ("Cold", 50)]
+DECISIONS = [("call_now", 20), ("call_after_intake", 30), ("no_call_for_now", 40), ("no_call", 10)]
+AGENTS = [("ai_call_agent", 25), ("intake_agent", 35), ("nurture_agent", 30), (None, 10)]
+SOURCES = [("zoho_notification", 60), ("pipeline", 25), ("next_action", 15)]
+
+QUERIES = {
+    "count by country_region":            dict(group_by=["country_region"]),
+    "score distribution by region":       dict(group_by=["country_region", "score_bucket"]),
+    "call_decision mix, UK + Dubai":      dict(group_by=["call_decision"], where={"country_region": ["UK", "Dubai"]}),
+    "daily hot leads, last 30 days":      dict(group_by=["day"], where={"intent_level": ["Hot"]}, since="recent"),
+    "latest state by call_decision":      dict(group_by=["call_decision"], latest=True),
+}
+
+
+def _column(writer: ArchiveWriter, name: str, weighted: list[tuple], rng, n: int) -> np.ndarray:
+    values = [v for v, _ in weighted]
+    weights = np.array([w for _, w in weighted], dtype=float)
+    codes = np.array(writer.intern(name, values), dtype=COLUMNS[name][1])
+    return codes[rng.choice(len(values), size=n, p=weights / weights.sum())]
+
+
+def build(directory: str, rows: int, leads: int, seed: int, chunk: int = 2_000_000) -> float:
+    writer = ArchiveWriter(directory)
+    rng = np.random.default_rng(seed)
+    lead_codes = np.array(writer.intern("lead_id", [f"L{i}" for i in range(leads)]), dtype="<u4")
+    now = time.time()
+    started = time.perf_counter()
+    for start in range(0, rows, chunk):
+        n = min(chunk, rows - start)
+        writer.append_columns({
+            "scored_at":      np.sort(now - 90 * 86400 + (start + np.arange(n)) * (90 * 86400 / rows)),
+            "score":          np.clip(rng.normal(45, 20, n), 0, 100).astype("<i2"),
+            "flags":          ((rng.random(n) < 0.4) | (rng.random(n) < 0.15) << 1
+                               | (rng.random(n) < 0.05) << 2).astype("u1"),
+            "lead_id":        lead_codes[rng.integers(0, leads, n)],
+            "intent_level":   _column(writer, "intent_level", INTENTS, rng, n),
+            "call_decision":  _column(writer, "call_decision", DECISIONS, rng, n),
+            "country_region": _column(writer, "country_region", REGIONS, rng, n),
+            "industry_type":  _column(writer, "industry_type", INDUSTRIES, rng, n),
+            "lead_source":    _column(writer, "lead_source", LEAD_SOURCES, rng, n),
+            "entry_channel":  _column(writer, "entry_channel", ENTRY_CHANNELS, rng, n),
+            "assigned_agent": _column(writer, "assigned_agent", AGENTS, rng, n),
+            "source":         _column(writer, "source", SOURCES, rng, n),
+        })
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Columnar lead archive benchmark.")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--leads", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--dir", help="Archive directory (default: a temp dir)")
+    parser.add_argument("--keep", action="store_true", help="Keep the archive afterwards")
+    parser.add_argument("--budget-ms", type=float, help="Fail if any query's best time exceeds this")
+    args = parser.parse_args()
+
+    directory = args.dir or tempfile.mkdtemp(prefix="smartcore_archive_")
+    try:
+        build_s = build(directory, args.rows, args.leads, args.seed)
+        reader = ArchiveReader(directory)
+        stats = reader.stats()
+        print(f"archive  {stats['rows']:,} rows, {stats['bytes'] / 1e6:.0f} MB, built in {build_s:.1f} s")
+
+        slow = []
+        for name, query in QUERIES.items():
+            if query.get("since") == "recent":
+                query = {**query, "since": time.time() - 30 * 86400}
+            best = float("inf")
+            for _ in range(args.repeats):
+                result = run_query(reader, **query)
+                best = min(best, result["elapsed_ms"])
+            print(f"  {name:<36}{best:>9.1f} ms  ({result['rows_matched']:,} rows, {len(result['groups'])} groups)")
+            if args.budget_ms is not None and best > args.budget_ms:
+                slow.append(name)
+    finally:
+        if not args.keep:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    if args.budget_ms is not None:
+        print(f"\nbudget {args.budget_ms:g} ms: {'OVER — ' + ', '.join(slow) if slow else 'ok'}")
+        sys.exit(1 if slow else 0)
+
+
+if __name__ == "__main__":
+    main()
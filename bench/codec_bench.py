@@ -0,0 +1,87 @@
+"""
+bench/codec_bench.py
+────────────────────
+Per-lead JSON decode / encode cost: FastAPI's default path vs models/codec.py.
+
+  python -m bench.codec_bench
+  python -m bench.codec_bench --sizes 100 10000 --out codec.json
+
+Decode
+  default   json.loads + LeadData(**item) per lead   (FastAPI body validation)
+  adapter   LEAD_LIST_ADAPTER.validate_json(body)    (batch endpoint path)
+  construct orjson.loads + model_construct            (validation skipped)
+
+Encode (a list of score_lead results)
+  default   jsonable_encoder + json.dumps             (JSONResponse)
+  orjson    FastJSONResponse.render
+"""
+
+import argparse
+import json
+import time
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from bench.synthetic import make_lead_dicts
+from models.codec import LEAD_LIST_ADAPTER, FastJSONResponse, decode_leads
+from models.lead_model import LeadData
+from scoring.scoring_engine import score_lead
+
+
+def _per_item_ns(fn, n_items: int, min_time: float = 0.2) -> float:
+    loops, elapsed = 0, 0.0
+    start = time.perf_counter()
+    while elapsed < min_time:
+        fn()
+        loops += 1
+        elapsed = time.perf_counter() - start
+    return elapsed / loops / n_items * 1e9
+
+
+def run(sizes: list[int]) -> list[dict]:
+    results = []
+    for n in sizes:
+        dicts = make_lead_dicts(n)
+        body = json.dumps(dicts).encode()
+        scored = [score_lead(lead) for lead in LEAD_LIST_ADAPTER.validate_python(dicts)]
+        response = FastJSONResponse(None)
+
+        row = {
+            "batch_size": n,
+            "decode_default_ns":  _per_item_ns(lambda: [LeadData(**d) for d in json.loads(body)], n),
+            "decode_adapter_ns":  _per_item_ns(lambda: decode_leads(body), n),
+            "decode_construct_ns": _per_item_ns(
+                lambda: [LeadData.model_construct(**d) for d in orjson.loads(body)], n
+            ),
+            "encode_default_ns":  _per_item_ns(
+                lambda: json.dumps(jsonable_encoder(scored), ensure_ascii=False, separators=(",", ":")).encode(), n
+            ),
+            "encode_orjson_ns":   _per_item_ns(lambda: response.render(scored), n),
+        }
+        results.append(row)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lead payload encode/decode benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument("--out", help="Optional path to write results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.sizes)
+
+    print(f"{'batch':>7} {'dec default':>12} {'dec adapter':>12} {'dec construct':>13} {'enc default':>12} {'enc orjson':>11}  (ns/lead)")
+    for r in results:
+        print(
+            f"{r['batch_size']:>7} {r['decode_default_ns']:>12.0f} {r['decode_adapter_ns']:>12.0f} "
+            f"{r['decode_construct_ns']:>13.0f} {r['encode_default_ns']:>12.0f} {r['encode_orjson_ns']:>11.0f}"
+        )
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+bench/hot_index_bench.py
+────────────────────────
+Build / update / top_k cost of indexes/hot_lead_index.py on a large book.
+
+  python -m bench.hot_index_bench
+  python -m bench.hot_index_bench --leads 1000000 --updates 100000
+"""
+
+import argparse
+import random
+import time
+
+from indexes.hot_lead_index import HotLeadIndex
+
+REGIONS = ["uk", "dubai", "nigeria", "kenya", "ghana", "south africa"]
+INDUSTRIES = ["fx/crypto", "brokerage", "sme", "b2b", "saas"]
+DECISIONS = ["call_now", "call_after_intake", "no_call_for_now", "no_call"]
+
+
+def _lead(rng: random.Random, i: int) -> tuple:
+    return (
+        str(i),
+        rng.randint(0, 100),
+        rng.random() * 1e9,
+        {"region": rng.choice(REGIONS), "industry": rng.choice(INDUSTRIES), "call_decision": rng.choice(DECISIONS)},
+        {"full_name": f"Lead {i}", "company": None, "intent_level": None},
+    )
+
+
+def _time_ms(fn, repeat: int = 200) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hot-lead index benchmark.")
+    parser.add_argument("--leads", type=int, default=1_000_000)
+    parser.add_argument("--updates", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    index = HotLeadIndex()
+
+    started = time.perf_counter()
+    for i in range(args.leads):
+        index.upsert(*_lead(rng, i))
+    build_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(args.updates):
+        index.upsert(*_lead(rng, rng.randrange(args.leads)))
+    update_us = (time.perf_counter() - started) / args.updates * 1e6
+
+    print(f"build {args.leads} leads: {build_s:.1f}s   update: {update_us:.1f} us/op")
+    queries = {
+        "top 50":                           lambda: index.top_k(50),
+        "top 50 region=uk":                 lambda: index.top_k(50, region="uk"),
+        "top 50 call_decision=call_now":    lambda: index.top_k(50, call_decision="call_now"),
+        "top 50 region+industry+decision":  lambda: index.top_k(50, region="uk", industry="sme", call_decision="call_now"),
+        "top 1000":                         lambda: index.top_k(1000),
+    }
+    for label, fn in queries.items():
+        print(f"{label:>34}: {_time_ms(fn):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
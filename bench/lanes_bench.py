@@ -0,0 +1,72 @@
+"""
+bench/lanes_bench.py
+────────────────────
+Hot-lane latency with and without a large bulk batch running.
+
+  python -m bench.lanes_bench
+  python -m bench.lanes_bench --batch 100000 --hot 2000
+
+Submits `--hot` single-lead hot-lane jobs (score → route → action) at a
+steady rate, first on an idle process, then while a `--batch`-lead
+pipeline batch runs on the bulk lane, and prints hot p50/p99 for both.
+"""
+
+import argparse
+import threading
+import time
+
+from bench.synthetic import make_lead_dicts
+from jobs.lanes import BULK, HOT, LANES
+from models.codec import LEAD_LIST_ADAPTER
+from pipeline.decision_pipeline import PipelineItem, resolve_stages, run_pipeline, run_pipeline_batch
+
+_HOT_LEAD = {
+    "country_region": "UK", "industry_type": "FX/Crypto", "company": "Exness",
+    "title": "CEO", "link_clicked": True, "whatsapp_replied": True,
+}
+
+
+def _hot_latencies(n: int, interval_s: float) -> list[float]:
+    stages = resolve_stages(["route", "action"])
+    item = PipelineItem.model_validate({"lead": _HOT_LEAD})
+    latencies = []
+    for _ in range(n):
+        started = time.perf_counter()
+        LANES[HOT].submit(run_pipeline, item, stages).result()
+        latencies.append((time.perf_counter() - started) * 1000)
+        time.sleep(interval_s)
+    return sorted(latencies)
+
+
+def _pct(samples: list[float], p: float) -> float:
+    return samples[min(len(samples) - 1, int(p * len(samples)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hot-lane latency under bulk load.")
+    parser.add_argument("--batch", type=int, default=100_000)
+    parser.add_argument("--hot", type=int, default=1000)
+    parser.add_argument("--interval-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    idle = _hot_latencies(args.hot, args.interval_ms / 1000)
+
+    items = [PipelineItem(lead=lead) for lead in LEAD_LIST_ADAPTER.validate_python(make_lead_dicts(args.batch))]
+    batch_done = threading.Event()
+    batch_started = time.perf_counter()
+    future = LANES[BULK].submit(run_pipeline_batch, items, ["route", "action"])
+    future.add_done_callback(lambda _: batch_done.set())
+
+    loaded = _hot_latencies(args.hot, args.interval_ms / 1000)
+    overlap = not batch_done.is_set()
+    future.result()
+    batch_s = time.perf_counter() - batch_started
+
+    print(f"bulk batch: {args.batch} leads in {batch_s:.2f}s (still running at end of hot run: {overlap})")
+    print(f"{'':>12} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for label, samples in (("idle", idle), ("under batch", loaded)):
+        print(f"{label:>12} {_pct(samples, 0.5):>8.3f} {_pct(samples, 0.99):>8.3f} {samples[-1]:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
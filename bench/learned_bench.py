@@ -0,0 +1,65 @@
+"""
+bench/learned_bench.py
+──────────────────────
+Per-lead latency of the learned scoring engine (batch NumPy inference)
+against the rule engine, at batch sizes from 1 to 100k.
+
+  python -m bench.learned_bench
+  python -m bench.learned_bench --sizes 1 100 10000 --model scoring_model.npz
+
+Without --model, a model is fitted on synthetic history first (see
+scoring/train.py --synthetic); the weights do not change the cost. For
+each size it reports µs per lead for the rules, for the whole learned
+path, and for its two parts (feature extraction, matrix product + bands),
+best of --repeats.
+"""
+
+import argparse
+import time
+
+from bench.synthetic import make_lead_dicts
+from models.codec import LEAD_LIST_ADAPTER
+from scoring.learned_engine import LearnedModel, featurize
+from scoring.scoring_engine import score_lead
+from scoring.train import synthetic_history, train
+
+DEFAULT_SIZES = [1, 10, 100, 1_000, 10_000, 100_000]
+
+
+def _best_us_per_lead(fn, n: int, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best / n * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Learned vs rule scoring latency.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--model", help="Weights file (default: fit on synthetic history)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    if args.model:
+        model = LearnedModel.load(args.model)
+    else:
+        model, _ = train(*synthetic_history(20_000, args.seed), l2=1.0, holdout=0.0, seed=args.seed)
+
+    leads_all = LEAD_LIST_ADAPTER.validate_python(make_lead_dicts(max(args.sizes), args.seed))
+    print(f"{'batch':>8}  {'rules':>9}  {'learned':>9}  {'features':>9}  {'model':>9}   µs per lead")
+    for n in args.sizes:
+        leads = leads_all[:n]
+        repeats = args.repeats if n <= 10_000 else max(1, args.repeats // 2)
+        features = featurize(leads)
+        rules = _best_us_per_lead(lambda: [score_lead(lead) for lead in leads], n, repeats)
+        learned = _best_us_per_lead(lambda: model.score_batch(leads), n, repeats)
+        extract = _best_us_per_lead(lambda: featurize(leads), n, repeats)
+        infer = _best_us_per_lead(lambda: model.scores(features), n, repeats)
+        print(f"{n:>8,}  {rules:>9.2f}  {learned:>9.2f}  {extract:>9.2f}  {infer:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+bench/metrics_bench.py
+──────────────────────
+Cost of the metrics instrumentation (metrics/registry.py).
+
+  python -m bench.metrics_bench
+  python -m bench.metrics_bench --n 500000
+
+Prints ns per call for an empty function bare vs wrapped by timed(), and
+for each instrumented engine stage called through its wrapper vs its
+original (functools __wrapped__), so the difference is the per-stage
+overhead.
+"""
+
+import argparse
+import time
+
+from agents.agent_behaviors import nurture_agent_message
+from agents.routing_engine import route_lead
+from cadence.cadence_engine import decide_next_agent
+from metrics.registry import histogram, STAGE_BUCKETS, timed
+from models.lead_model import LeadData
+from scoring.scoring_engine import score_lead
+
+_LEAD = LeadData(country_region="UK", industry_type="FX/Crypto", company="Exness",
+                 title="CEO", link_clicked=True)
+
+
+def _ns_per_call(fn, n: int) -> float:
+    started = time.perf_counter_ns()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter_ns() - started) / n
+
+
+def _best_of(fn, n: int, rounds: int = 5) -> float:
+    return min(_ns_per_call(fn, n) for _ in range(rounds))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Metrics instrumentation overhead.")
+    parser.add_argument("--n", type=int, default=200_000)
+    args = parser.parse_args()
+
+    def noop():
+        return None
+
+    bench_hist = histogram("smartcore_bench_seconds", "bench only", ("stage",), buckets=STAGE_BUCKETS)
+    wrapped_noop = timed(bench_hist, stage="noop")(noop)
+
+    scoring = score_lead(_LEAD)
+    cases = {
+        "noop":                  (noop, wrapped_noop),
+        "score_lead":            (lambda: score_lead.__wrapped__(_LEAD), lambda: score_lead(_LEAD)),
+        "route_lead":            (lambda: route_lead.__wrapped__(_LEAD, scoring), lambda: route_lead(_LEAD, scoring)),
+        "decide_next_agent":     (lambda: decide_next_agent.__wrapped__(_LEAD, scoring, None, 3, None),
+                                  lambda: decide_next_agent(_LEAD, scoring, None, 3, None)),
+        "nurture_agent_message": (lambda: nurture_agent_message.__wrapped__(_LEAD, scoring),
+                                  lambda: nurture_agent_message(_LEAD, scoring)),
+    }
+
+    print(f"{'':>22} {'bare ns':>10} {'timed ns':>10} {'overhead ns':>12}")
+    for label, (bare, wrapped) in cases.items():
+        b, w = _best_of(bare, args.n), _best_of(wrapped, args.n)
+        print(f"{label:>22} {b:>10.0f} {w:>10.0f} {w - b:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+bench/micro.py
+──────────────
+Micro-benchmarks for the decision engine functions, with regression gates.
+
+  python -m bench.micro run                                  # print results
+  python -m bench.micro run --out results.json --sizes 1 100 10000
+  python -m bench.micro run --save-baseline                  # → bench/baseline.json
+  python -m bench.micro compare results.json                 # vs bench/baseline.json
+  python -m bench.micro run --compare --threshold 10         # run + gate in one go
+
+For each function and batch size (inputs from bench/synthetic.py, same
+seed every run) it reports:
+  ns_per_op          best of --repeats timed passes over the batch
+  blocks_per_op      net allocated memory blocks per call, results kept
+  peak_bytes_per_op  tracemalloc peak over one pass / batch size
+
+Functions are called as deployed, i.e. through their metrics wrappers.
+compare exits with status 1 when any ns_per_op is more than --threshold
+percent slower than the baseline, so it can gate CI.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from agents.agent_behaviors import (
+    ai_call_agent_script,
+    appointment_agent_message,
+    generate_agent_action,
+    intake_agent_message,
+    nurture_agent_message,
+    post_call_followup_agent_message,
+    reengagement_agent_message,
+)
+from agents.objection_agent import classify_objection, generate_objection_response
+from agents.routing_engine import route_lead
+from bench.synthetic import make_lead_dicts, make_objections
+from cadence.cadence_engine import decide_next_agent
+from cadence.cadence_runner import run_cadence_action
+from models.codec import LEAD_LIST_ADAPTER
+from scoring.scoring_engine import score_lead
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_SIZES = [1, 100, 10_000]
+LAST_AGENTS = [None, "intake_agent", "nurture_agent", "ai_call_agent", "appointment_agent"]
+OUTCOMES = [None, "no_answer", "booked", "not_interested", "call_completed"]
+SCENARIOS = ["confirmation", "reminder", "missed_call", "no_show", "after_call"]
+
+
+def _cases(n: int, seed: int) -> dict:
+    """name → list of zero-argument calls, one per op in the batch."""
+    leads = LEAD_LIST_ADAPTER.validate_python(make_lead_dicts(n, seed))
+    objections = make_objections(n, seed)
+    scorings = [score_lead(lead) for lead in leads]
+    routings = [route_lead(lead, s) for lead, s in zip(leads, scorings)]
+    cadence = [
+        decide_next_agent(lead, s, LAST_AGENTS[i % len(LAST_AGENTS)], i % 30, OUTCOMES[i % len(OUTCOMES)])
+        for i, (lead, s) in enumerate(zip(leads, scorings))
+    ]
+    triples = list(zip(leads, scorings, range(n)))
+
+    return {
+        "score_lead": [lambda lead=lead: score_lead(lead) for lead in leads],
+        "route_lead": [lambda lead=lead, s=s: route_lead(lead, s) for lead, s, _ in triples],
+        "decide_next_agent": [
+            lambda lead=lead, s=s, i=i: decide_next_agent(
+                lead, s, LAST_AGENTS[i % len(LAST_AGENTS)], i % 30, OUTCOMES[i % len(OUTCOMES)])
+            for lead, s, i in triples
+        ],
+        "run_cadence_action": [
+            lambda lead=lead, s=s, i=i: run_cadence_action(lead, s, cadence[i], i % 30, "whatsapp")
+            for lead, s, i in triples
+        ],
+        "classify_objection": [lambda text=text: classify_objection(text) for text in objections],
+        "generate_objection_response": [
+            lambda lead=lead, s=s, i=i: generate_objection_response(lead, s, objections[i])
+            for lead, s, i in triples
+        ],
+        "generate_agent_action": [
+            lambda lead=lead, s=s, i=i: generate_agent_action(lead, routings[i], s) for lead, s, i in triples
+        ],
+        "intake_agent_message": [lambda lead=lead: intake_agent_message(lead) for lead in leads],
+        "nurture_agent_message": [lambda lead=lead, s=s: nurture_agent_message(lead, s) for lead, s, _ in triples],
+        "ai_call_agent_script": [lambda lead=lead, s=s: ai_call_agent_script(lead, s) for lead, s, _ in triples],
+        "appointment_agent_message": [
+            lambda lead=lead, s=s: appointment_agent_message(lead, s) for lead, s, _ in triples
+        ],
+        "post_call_followup_agent_message": [
+            lambda lead=lead, i=i: post_call_followup_agent_message(lead, SCENARIOS[i % len(SCENARIOS)], "whatsapp")
+            for lead, _, i in triples
+        ],
+        "reengagement_agent_message": [
+            lambda lead=lead, i=i: reengagement_agent_message(lead, 7 + i % 60, "email") for lead, _, i in triples
+        ],
+    }
+
+
+def _time_pass(calls: list) -> float:
+    started = time.perf_counter_ns()
+    for call in calls:
+        call()
+    return time.perf_counter_ns() - started
+
+
+def _measure(calls: list, repeats: int, min_ops: int) -> dict:
+    n = len(calls)
+    passes = max(1, min_ops // n)  # small batches are looped so timings are stable
+
+    best = float("inf")
+    for _ in range(repeats):
+        elapsed = sum(_time_pass(calls) for _ in range(passes))
+        best = min(best, elapsed / (passes * n))
+
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    results = [call() for call in calls]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks_after = sys.getallocatedblocks()
+    del results
+
+    return {
+        "ns_per_op":         round(best, 1),
+        "blocks_per_op":     round((blocks_after - blocks_before) / n, 2),
+        "peak_bytes_per_op": round(peak / n, 1),
+    }
+
+
+def run(sizes: list[int], seed: int = 7, repeats: int = 5, min_ops: int = 20_000,
+        only: list[str] | None = None) -> dict:
+    results: dict[str, dict[str, dict]] = {}
+    for n in sizes:
+        for name, calls in _cases(n, seed).items():
+            if only and name not in only:
+                continue
+            results.setdefault(name, {})[str(n)] = _measure(calls, repeats, min_ops)
+    return {
+        "meta": {
+            "python":     platform.python_version(),
+            "platform":   platform.platform(),
+            "seed":       seed,
+            "sizes":      sizes,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold_pct: float) -> list[dict]:
+    """One row per (function, batch size) present in both runs."""
+    rows = []
+    for name, sizes in current["results"].items():
+        for size, cur in sizes.items():
+            base = baseline.get("results", {}).get(name, {}).get(size)
+            if base is None:
+                continue
+            change = (cur["ns_per_op"] - base["ns_per_op"]) / base["ns_per_op"] * 100
+            rows.append({
+                "function":   name,
+                "batch_size": int(size),
+                "base_ns":    base["ns_per_op"],
+                "current_ns": cur["ns_per_op"],
+                "change_pct": round(change, 1),
+                "regression": change > threshold_pct,
+            })
+    return rows
+
+
+def _print_results(report: dict) -> None:
+    sizes = [str(s) for s in report["meta"]["sizes"]]
+    print(f"{'function':<34}" + "".join(f"{'ns/op @' + s:>16}" for s in sizes) + f"{'blocks/op':>11}{'peak B/op':>11}")
+    for name, by_size in report["results"].items():
+        cells = "".join(f"{by_size[s]['ns_per_op']:>16.0f}" if s in by_size else f"{'-':>16}" for s in sizes)
+        last = by_size[sizes[-1]] if sizes[-1] in by_size else next(iter(by_size.values()))
+        print(f"{name:<34}{cells}{last['blocks_per_op']:>11.1f}{last['peak_bytes_per_op']:>11.0f}")
+
+
+def _print_comparison(rows: list[dict], threshold_pct: float) -> bool:
+    print(f"{'function':<34}{'batch':>7}{'base ns':>10}{'now ns':>10}{'change':>9}")
+    for r in rows:
+        flag = "  REGRESSION" if r["regression"] else ""
+        print(f"{r['function']:<34}{r['batch_size']:>7}{r['base_ns']:>10.0f}{r['current_ns']:>10.0f}"
+              f"{r['change_pct']:>8.1f}%{flag}")
+    regressions = [r for r in rows if r["regression"]]
+    print(f"\n{len(regressions)} regression(s) over {threshold_pct:g}% in {len(rows)} comparisons")
+    return not regressions
+
+
+def _load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save(report: dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved {path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Decision engine micro-benchmarks.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="Run the suite")
+    run_p.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    run_p.add_argument("--seed", type=int, default=7)
+    run_p.add_argument("--repeats", type=int, default=5)
+    run_p.add_argument("--only", nargs="+", help="Only these functions")
+    run_p.add_argument("--out", help="Write results JSON here")
+    run_p.add_argument("--save-baseline", action="store_true", help=f"Also write {DEFAULT_BASELINE}")
+    run_p.add_argument("--compare", action="store_true", help="Gate against the baseline after running")
+    run_p.add_argument("--baseline", default=DEFAULT_BASELINE)
+    run_p.add_argument("--threshold", type=float, default=10.0, help="Allowed slowdown in percent")
+
+    cmp_p = sub.add_parser("compare", help="Compare a results file against the baseline")
+    cmp_p.add_argument("current")
+    cmp_p.add_argument("--baseline", default=DEFAULT_BASELINE)
+    cmp_p.add_argument("--threshold", type=float, default=10.0, help="Allowed slowdown in percent")
+
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        ok = _print_comparison(compare(_load(args.baseline), _load(args.current), args.threshold), args.threshold)
+        sys.exit(0 if ok else 1)
+
+    report = run(args.sizes, seed=args.seed, repeats=args.repeats, only=args.only)
+    _print_results(report)
+    if args.out:
+        _save(report, args.out)
+    if args.save_baseline:
+        _save(report, args.baseline)
+    if args.compare:
+        print()
+        ok = _print_comparison(compare(_load(args.baseline), report, args.threshold), args.threshold)
+        sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+bench/payload_bench.py
+──────────────────────
+Bytes on the wire and time spent per /zoho/leads page, before and after
+field projection, the compact format and response compression.
+
+  python -m bench.payload_bench
+  python -m bench.payload_bench --sizes 50 200 --out payload.json
+
+Variants (each a normalised page, as the endpoint returns it)
+  before    every field as objects via JSONResponse (the old path)
+  objects   every field as objects via FastJSONResponse (orjson)
+  projected fields=name,score,status as objects
+  compact   fields=name,score,status, format=compact
+
+For each: raw / gzip / br bytes (br only with the brotli package), and
+serialise and compress µs per page at the middleware's default levels.
+"""
+
+import argparse
+import json
+import random
+import time
+import zlib
+
+from fastapi.responses import JSONResponse
+
+from bench.synthetic import make_lead_dicts
+from compression.middleware import BR_QUALITY, GZIP_LEVEL, brotli
+from loadtest.fake_zoho import _record
+from models.codec import FastJSONResponse
+from zoho.zoho_client import compact_leads, normalise_lead, parse_lead_fields
+
+PROJECTION = "name,score,status"
+
+
+def _raw_records(n: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    records = []
+    for lead in make_lead_dicts(n, seed):
+        record = _record(lead)
+        fit, behaviour, intent = rng.randint(0, 100), rng.randint(0, 100), rng.randint(0, 100)
+        record.update({
+            "SmartScore_Fit": fit, "SmartScore_Behaviour": behaviour, "SmartScore_Intent": intent,
+            "SmartCore_Score": round(fit * 0.4 + behaviour * 0.3 + intent * 0.3),
+        })
+        records.append(record)
+    return records
+
+
+def _per_call_us(fn, min_time: float = 0.2) -> float:
+    loops, elapsed = 0, 0.0
+    start = time.perf_counter()
+    while elapsed < min_time:
+        fn()
+        loops += 1
+        elapsed = time.perf_counter() - start
+    return elapsed / loops * 1e6
+
+
+def _gzip(body: bytes) -> bytes:
+    z = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return z.compress(body) + z.flush()
+
+
+def run(sizes: list[int]) -> list[dict]:
+    results = []
+    for n in sizes:
+        raw = _raw_records(n)
+        fields = parse_lead_fields(PROJECTION)
+        full = [normalise_lead(r) for r in raw]
+        projected = [normalise_lead(r, fields) for r in raw]
+        info = {"count": n, "page": 1, "per_page": n, "more_records": True}
+        payloads = {
+            "before":    (JSONResponse, {"success": True, "leads": full, **info}),
+            "objects":   (FastJSONResponse, {"success": True, "leads": full, **info}),
+            "projected": (FastJSONResponse, {"success": True, "leads": projected, **info}),
+            "compact":   (FastJSONResponse, {"success": True, **compact_leads(projected, fields), **info}),
+        }
+        for variant, (response_class, content) in payloads.items():
+            renderer = response_class(None)
+            body = renderer.render(content)
+            row = {
+                "page_size":    n,
+                "variant":      variant,
+                "raw_bytes":    len(body),
+                "gzip_bytes":   len(_gzip(body)),
+                "br_bytes":     len(brotli.compress(body, quality=BR_QUALITY)) if brotli else None,
+                "serialise_us": _per_call_us(lambda: renderer.render(content)),
+                "gzip_us":      _per_call_us(lambda: _gzip(body)),
+                "br_us":        _per_call_us(lambda: brotli.compress(body, quality=BR_QUALITY)) if brotli else None,
+            }
+            results.append(row)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lead list payload size / serialisation benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--out", help="Optional path to write results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.sizes)
+
+    def opt(value, fmt):
+        return format(value, fmt) if value is not None else format("—", ">8")
+
+    print(f"{'page':>5} {'variant':>10} {'raw B':>8} {'gzip B':>8} {'br B':>8} "
+          f"{'serialise µs':>13} {'gzip µs':>8} {'br µs':>8}")
+    for r in results:
+        print(
+            f"{r['page_size']:>5} {r['variant']:>10} {r['raw_bytes']:>8} {r['gzip_bytes']:>8} "
+            f"{opt(r['br_bytes'], '>8')} {r['serialise_us']:>13.0f} {r['gzip_us']:>8.0f} "
+            f"{opt(r['br_us'], '>8.0f')}"
+        )
+    if not brotli:
+        print("(brotli not installed — br columns skipped)")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+bench/synthetic.py
+──────────────────
+Seeded synthetic leads and objections for benchmarks and load tests.
+
+Field distributions follow the real book roughly: mostly UK / Dubai /
+Nigeria, a brokerage-heavy industry mix with real broker names (so the
+ICP keyword rules in score_lead fire), a spread of titles from founder to
+analyst, and behaviour flags that get rarer down the funnel (opened >
+clicked > replied, with replies mostly from leads that clicked). Contact
+details are formatted inconsistently on purpose, the way they arrive from
+different lead_source / entry_channel paths.
+
+  make_lead_dicts(n, seed)   → list of LeadData-shaped dicts
+  make_objections(n, seed)   → list of objection texts
+Same seed, same data.
+"""
+
+import random
+
+REGIONS = [("UK", 30), ("Dubai", 22), ("Nigeria", 20), ("Kenya", 8), ("Ghana", 6),
+           ("South Africa", 6), (None, 8)]
+INDUSTRIES = [("FX/Crypto", 35), ("Brokerage", 12), ("SME", 20), ("B2B", 15),
+              ("SaaS", 8), (None, 10)]
+BROKERS = ["Exness", "IC Markets", "Pepperstone", "XM", "FXCM", "OANDA", "Plus500",
+           "eToro", "Eightcap", "VT Markets", "Vantage"]
+TITLES = [("CEO", 10), ("Founder", 10), ("Head of Sales", 12), ("Director", 8),
+          ("Marketing Manager", 15), ("Sales Manager", 15), ("IB Manager", 8),
+          ("Analyst", 7), ("Owner", 5), (None, 10)]
+LEAD_SOURCES = [("Website", 30), ("Referral", 10), ("Partner", 8), ("Inbound Demo", 7),
+                ("Facebook Ads", 20), ("LinkedIn", 15), ("Cold Outreach", 10)]
+ENTRY_CHANNELS = [("website", 35), ("dm", 20), ("whatsapp", 20), ("referral", 10), ("email", 15)]
+DECISION_LEVELS = [("owner", 15), ("decision maker", 20), ("influencer", 35), (None, 30)]
+BUSINESS_SIZES = [("1-5", 30), ("6-20", 30), ("21-50", 20), ("51+", 10), (None, 10)]
+BUDGETS = [("yes", 35), ("no", 25), ("not sure", 20), (None, 20)]
+CHALLENGES = [None, None, "Slow follow-up on leads", "No CRM discipline",
+              "Leads go cold before we call", "Too many unqualified leads"]
+SERVICES = ["ai_calls", "whatsapp", "crm_setup", "lead_scoring", "email_nurture"]
+DIAL_CODES = {"UK": "44", "Dubai": "971", "Nigeria": "234", "Kenya": "254",
+              "Ghana": "233", "South Africa": "27"}
+FIRST_NAMES = ["James", "Amara", "Fatima", "Chinedu", "Sarah", "Omar", "Grace", "David",
+               "Aisha", "Tunde", "Emma", "Yusuf", "Kwame", "Lerato", "Priya", "Michael"]
+LAST_NAMES = ["Smith", "Okafor", "Al Mansouri", "Mensah", "Adeyemi", "Khan", "Brown",
+              "Mwangi", "Naidoo", "Patel", "Johnson", "Eze", "Haddad", "Otieno"]
+
+OBJECTIONS = [
+    ("It's too expensive for us right now.", 14),
+    ("We don't have the budget this quarter.", 10),
+    ("Can you send me some info by email?", 12),
+    ("Not a good time, call me later.", 12),
+    ("We already use HubSpot for this.", 8),
+    ("We're on Zoho CRM already.", 6),
+    ("I'm not sure it would work for us.", 10),
+    ("We don't get enough leads to justify it.", 6),
+    ("It's not a priority for us at the moment.", 8),
+    ("I need to check with my partner first.", 6),
+    ("Who are you again? Never heard of Sales360.", 4),
+    ("Hmm, okay.", 4),
+]
+
+
+def _pick(rng: random.Random, weighted: list[tuple]):
+    values, weights = zip(*weighted)
+    return rng.choices(values, weights=weights, k=1)[0]
+
+
+def _phone(rng: random.Random, region: str | None) -> str | None:
+    code = DIAL_CODES.get(region)
+    if code is None or rng.random() < 0.15:
+        return None
+    number = f"{rng.randint(700, 999)}{rng.randint(1000000, 9999999)}"
+    style = rng.random()
+    if style < 0.4:
+        return f"+{code}{number}"
+    if style < 0.7:
+        return f"+{code} {number[:3]} {number[3:6]} {number[6:]}"
+    return f"0{number}"
+
+
+def make_lead_dicts(n: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    leads = []
+    for i in range(n):
+        region = _pick(rng, REGIONS)
+        industry = _pick(rng, INDUSTRIES)
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        if industry in ("FX/Crypto", "Brokerage") and rng.random() < 0.6:
+            company = rng.choice(BROKERS)
+        else:
+            company = f"{last} {rng.choice(['Holdings', 'Ltd', 'Group', 'Digital', 'Partners'])}"
+        domain = company.lower().replace(" ", "") + ".com"
+        if rng.random() < 0.3:
+            domain = rng.choice(["gmail.com", "yahoo.com", "outlook.com"])
+
+        email_opened = rng.random() < 0.55
+        link_clicked = email_opened and rng.random() < 0.45
+        whatsapp_replied = rng.random() < (0.35 if link_clicked else 0.05)
+
+        leads.append({
+            "lead_id":             str(4_000_000 + i),
+            "full_name":           f"{first} {last}",
+            "email":               f"{first}.{last}{i}@{domain}".lower().replace(" ", ""),
+            "phone":               _phone(rng, region),
+            "company":             company,
+            "title":               _pick(rng, TITLES),
+            "country_region":      region,
+            "industry_type":       industry,
+            "lead_source":         _pick(rng, LEAD_SOURCES),
+            "entry_channel":       _pick(rng, ENTRY_CHANNELS),
+            "business_size":       _pick(rng, BUSINESS_SIZES),
+            "monthly_lead_volume": rng.choice([None, 10, 25, 40, 80, 150, 400]),
+            "budget_readiness":    _pick(rng, BUDGETS),
+            "decision_level":      _pick(rng, DECISION_LEVELS),
+            "current_challenges":  rng.choice(CHALLENGES),
+            "interested_services": rng.sample(SERVICES, k=rng.randint(1, 3)),
+            "email_opened":        email_opened,
+            "link_clicked":        link_clicked,
+            "whatsapp_replied":    whatsapp_replied,
+        })
+    return leads
+
+
+def make_objections(n: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    return [_pick(rng, OBJECTIONS) for _ in range(n)]
@@ -1,4 +1,5 @@
 from models.lead_model import LeadData
+from metrics.registry import STAGE_SECONDS, timed
 
 
 def determine_cadence_profile(
@@ -47,6 +48,7 @@ def determine_cadence_profile(
 
 
 
+@timed(STAGE_SECONDS, stage="decide_next_agent")
 def decide_next_agent(
     lead: LeadData,
     scoring_result: dict,
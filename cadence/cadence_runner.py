@@ -5,7 +5,9 @@ from agents.agent_behaviors import (
     post_call_followup_agent_message,
     reengagement_agent_message,
 )
+from metrics.registry import STAGE_SECONDS, timed
 
+@timed(STAGE_SECONDS, stage="run_cadence_action")
 def run_cadence_action(
     lead: LeadData,
     scoring_result: dict,
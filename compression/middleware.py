@@ -0,0 +1,158 @@
+"""
+compression/middleware.py
+─────────────────────────
+ASGI middleware compressing large text responses (lead lists, archive
+queries, batch scores) for clients that accept it: brotli ("br") when the
+brotli package is installed and preferred by the client, else gzip.
+
+Bodies under SMARTCORE_COMPRESS_MIN_BYTES are sent as they are — below
+about a kilobyte the CPU costs more than the bytes save. Responses that
+already have a Content-Encoding, or a content type that is not text /
+JSON, pass through untouched. A whole-body response is compressed in one
+go (with a correct Content-Length); a streamed one chunk by chunk.
+
+Pure ASGI like metrics/middleware.py, so uncompressed responses are not
+buffered. Bytes before and after are counted in
+smartcore_compression_bytes_total{encoding, stage=in|out}.
+
+Environment variables:
+  SMARTCORE_COMPRESS            — "0" disables compression
+  SMARTCORE_COMPRESS_MIN_BYTES  — smallest body compressed (default 1024)
+  SMARTCORE_COMPRESS_GZIP_LEVEL — zlib level 1–9 (default 5)
+  SMARTCORE_COMPRESS_BR_QUALITY — brotli quality 0–11 (default 4)
+"""
+
+import os
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from metrics.registry import counter
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip is offered
+    brotli = None
+
+ENABLED = os.environ.get("SMARTCORE_COMPRESS", "1") != "0"
+MIN_BYTES = int(os.environ.get("SMARTCORE_COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.environ.get("SMARTCORE_COMPRESS_GZIP_LEVEL", "5"))
+BR_QUALITY = int(os.environ.get("SMARTCORE_COMPRESS_BR_QUALITY", "4"))
+
+_COMPRESSIBLE = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+COMPRESSION_BYTES = counter(
+    "smartcore_compression_bytes_total",
+    "Response bytes through compression, by encoding and stage (in = before, out = after).",
+    ("encoding", "stage"),
+)
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """The best encoding we offer that Accept-Encoding allows (q > 0), or None."""
+    offered = ("br", "gzip") if brotli is not None else ("gzip",)
+    weights = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            weights[name.strip()] = q
+    wildcard = weights.get("*", 0.0)
+    best = max(offered, key=lambda e: weights.get(e, wildcard))
+    return best if weights.get(best, wildcard) > 0 else None
+
+
+class _Gzip:
+    def __init__(self):
+        self._z = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._z.compress(data) + self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes) -> bytes:
+        return self._z.compress(data) + self._z.flush()
+
+
+class _Brotli:
+    def __init__(self):
+        self._c = brotli.Compressor(quality=BR_QUALITY)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._c.process(data) + self._c.flush()
+
+    def finish(self, data: bytes) -> bytes:
+        return self._c.process(data) + self._c.finish()
+
+
+_COMPRESSORS = {"gzip": _Gzip, "br": _Brotli}
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ENABLED:
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        compressor = None
+        passthrough = False
+        in_counter = COMPRESSION_BYTES.labels(encoding=encoding, stage="in")
+        out_counter = COMPRESSION_BYTES.labels(encoding=encoding, stage="out")
+
+        async def send_wrapper(message):
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(raw=start["headers"])
+                content_type = headers.get("content-type", "")
+                if (
+                    (not more and len(body) < self.minimum_size)
+                    or "content-encoding" in headers
+                    or not content_type.startswith(_COMPRESSIBLE)
+                ):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+
+                compressor = _COMPRESSORS[encoding]()
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if not more:
+                    data = compressor.finish(body)
+                    headers["Content-Length"] = str(len(data))
+                    in_counter.inc(len(body))
+                    out_counter.inc(len(data))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": data})
+                    return
+                del headers["Content-Length"]
+                await send(start)
+
+            data = compressor.chunk(body) if more else compressor.finish(body)
+            in_counter.inc(len(body))
+            out_counter.inc(len(data))
+            await send({"type": "http.response.body", "body": data, "more_body": more})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,319 @@
+"""
+dispatch/dispatcher.py
+──────────────────────
+Dispatch stage for outbound agent actions: instead of each generated
+message being sent the moment it exists (3am in Lagos included, one HTTP
+call per send), it is queued in a bucket keyed by
+
+  (channel, lead time zone, window opening time)
+
+and released when that window opens (dispatch/windows.py), in batches of
+up to SMARTCORE_DISPATCH_BATCH messages per gateway call
+(dispatch/gateway.py). A background task checks the buckets every
+SMARTCORE_DISPATCH_TICK_S, so messages queued while their window is open
+still go out together on the next tick rather than one by one.
+
+An action becomes one message per channel in its channel_suggestion
+("whatsapp + email" → both; call scripts → call). A lead has at most one
+pending message per channel: a newer action replaces the queued one.
+
+A batch the gateway rejects goes back to its bucket and is retried on
+the next tick, up to SMARTCORE_DISPATCH_MAX_ATTEMPTS sends per message;
+the rest of that tick's batches wait too. A bucket whose window closed
+before it could be released (the service was down) moves to the next
+window. Pending messages are kept in warm-restart snapshots
+(state/snapshots.py), so a deploy does not lose them.
+
+Environment variables:
+  SMARTCORE_DISPATCH_BATCH         — messages per gateway call (default 500)
+  SMARTCORE_DISPATCH_TICK_S        — release check interval (default 15)
+  SMARTCORE_DISPATCH_MAX_ATTEMPTS  — sends per message before it is dropped
+                                     (default 5)
+  SMARTCORE_DISPATCH_MAX_PENDING   — queued messages before new ones are
+                                     refused (default 200000)
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+from dispatch.gateway import make_gateway
+from dispatch.windows import CHANNELS, lead_timezone, send_window
+from metrics.registry import counter, register_gauge
+from models.lead_model import LeadData
+from state.snapshots import register_section
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = int(os.environ.get("SMARTCORE_DISPATCH_BATCH", "500"))
+TICK_SECONDS = float(os.environ.get("SMARTCORE_DISPATCH_TICK_S", "15"))
+MAX_ATTEMPTS = int(os.environ.get("SMARTCORE_DISPATCH_MAX_ATTEMPTS", "5"))
+MAX_PENDING = int(os.environ.get("SMARTCORE_DISPATCH_MAX_PENDING", "200000"))
+
+# appointment_agent_message joins the SDR call script and the WhatsApp
+# opener into one message; only the opener goes to the lead
+_WHATSAPP_PART = "\n\n---\n\nWHATSAPP VERSION\n\n"
+
+MESSAGES = counter(
+    "smartcore_dispatch_messages_total",
+    "Outbound messages by channel and outcome (queued, replaced, sent, retried, "
+    "rescheduled, dropped, no_contact).",
+    ("channel", "outcome"),
+)
+BATCHES = counter(
+    "smartcore_dispatch_batches_total",
+    "Outbound gateway calls by channel and outcome (sent, failed).",
+    ("channel", "outcome"),
+)
+
+
+class DispatchFull(Exception):
+    pass
+
+
+def action_channels(action: dict) -> list[str]:
+    if action.get("message_type") == "call_script":
+        return ["call"]
+    suggestion = (action.get("channel_suggestion") or "").lower()
+    return [c for c in CHANNELS if c in suggestion] or ["whatsapp"]
+
+
+def channel_body(action: dict, channel: str) -> str | None:
+    body = action.get("message") or action.get("script")
+    if body and channel != "call" and _WHATSAPP_PART in body:
+        body = body.split(_WHATSAPP_PART, 1)[1]
+    return body
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec="seconds")
+
+
+class Dispatcher:
+    def __init__(self, gateway=None, batch_size: int = BATCH_SIZE, max_pending: int = MAX_PENDING):
+        self._gateway = gateway
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        # (channel, tz, opens_at) → {"closes_at": float, "messages": {lead key: message}}
+        self._buckets: dict[tuple[str, str, float], dict] = {}
+        # (channel, lead key) → the bucket holding that lead's pending message
+        self._where: dict[tuple[str, str], tuple[str, str, float]] = {}
+        self._lock = threading.Lock()
+        self._release_lock = asyncio.Lock()
+
+    @property
+    def gateway(self):
+        if self._gateway is None:
+            self._gateway = make_gateway()
+        return self._gateway
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    # ── Queueing ────────────────────────────────────────────────────────────
+    def enqueue(self, lead: LeadData, action: dict, now: float | None = None) -> list[dict]:
+        """
+        Queues an agent action; returns one entry per channel with the
+        time it will be released. Actions without a message (no_action)
+        queue nothing. Raises DispatchFull when the queue is at capacity.
+        """
+        now = now or time.time()
+        tz = lead_timezone(lead)
+        scheduled = []
+        with self._lock:
+            for channel in action_channels(action):
+                body = channel_body(action, channel)
+                if not body:
+                    continue
+                to = lead.email if channel == "email" else lead.phone
+                if not to:
+                    MESSAGES.labels(channel=channel, outcome="no_contact").inc()
+                    scheduled.append({"channel": channel, "queued": False, "reason": "no_contact"})
+                    continue
+
+                key = lead.lead_id or to
+                replaced = self._remove(channel, key)
+                if not replaced and len(self._where) >= self.max_pending:
+                    raise DispatchFull(f"dispatch queue is full ({self.max_pending} pending)")
+
+                opens_at, closes_at = send_window(tz, channel, now)
+                self._add({
+                    "id":           uuid.uuid4().hex,
+                    "lead_id":      lead.lead_id,
+                    "channel":      channel,
+                    "to":           to,
+                    "name":         lead.full_name,
+                    "timezone":     tz,
+                    "agent":        action.get("agent"),
+                    "message_type": action.get("message_type"),
+                    "body":         body,
+                    "queued_at":    now,
+                    "send_after":   opens_at,
+                    "send_before":  closes_at,
+                    "attempts":     0,
+                }, key)
+                MESSAGES.labels(channel=channel, outcome="replaced" if replaced else "queued").inc()
+                scheduled.append({
+                    "channel":     channel,
+                    "queued":      True,
+                    "timezone":    tz,
+                    "window_open": opens_at <= now,
+                    "send_after":  _iso(max(opens_at, now)),
+                    "send_before": _iso(closes_at),
+                    "replaced":    replaced,
+                })
+        return scheduled
+
+    def _add(self, message: dict, key: str) -> None:
+        bucket_key = (message["channel"], message["timezone"], message["send_after"])
+        bucket = self._buckets.setdefault(bucket_key, {"closes_at": message["send_before"], "messages": {}})
+        bucket["messages"][key] = message
+        self._where[(message["channel"], key)] = bucket_key
+
+    def _remove(self, channel: str, key: str) -> bool:
+        bucket_key = self._where.pop((channel, key), None)
+        if bucket_key is None:
+            return False
+        bucket = self._buckets[bucket_key]
+        del bucket["messages"][key]
+        if not bucket["messages"]:
+            del self._buckets[bucket_key]
+        return True
+
+    def _reschedule(self, message: dict, key: str, now: float) -> None:
+        message["send_after"], message["send_before"] = send_window(message["timezone"], message["channel"], now)
+        self._add(message, key)
+
+    # ── Release ─────────────────────────────────────────────────────────────
+    def _take_due(self, now: float, force: bool) -> list[tuple[str, list[tuple[str, dict]]]]:
+        """Pops every bucket that is due; returns (channel, [(lead key, message)]) batches."""
+        batches = []
+        with self._lock:
+            for bucket_key in [k for k in self._buckets if force or k[2] <= now]:
+                channel = bucket_key[0]
+                bucket = self._buckets.pop(bucket_key)
+                items = list(bucket["messages"].items())
+                for key, _ in items:
+                    del self._where[(channel, key)]
+                if not force and bucket["closes_at"] <= now:
+                    for key, message in items:
+                        self._reschedule(message, key, now)
+                    MESSAGES.labels(channel=channel, outcome="rescheduled").inc(len(items))
+                    continue
+                for start in range(0, len(items), self.batch_size):
+                    batches.append((channel, items[start:start + self.batch_size]))
+        return batches
+
+    def _requeue(self, channel: str, items: list[tuple[str, dict]], now: float, failed: bool) -> None:
+        with self._lock:
+            for key, message in items:
+                if (channel, key) in self._where:
+                    continue  # a newer action for this lead was queued meanwhile
+                if failed:
+                    message["attempts"] += 1
+                    if message["attempts"] >= MAX_ATTEMPTS:
+                        MESSAGES.labels(channel=channel, outcome="dropped").inc()
+                        continue
+                    MESSAGES.labels(channel=channel, outcome="retried").inc()
+                if message["send_before"] <= now:
+                    self._reschedule(message, key, now)
+                else:
+                    self._add(message, key)
+
+    async def release(self, now: float | None = None, force: bool = False) -> dict:
+        """
+        Sends every bucket whose window is open — every bucket at all with
+        force=True (operator override). Returns counts for this call.
+        """
+        async with self._release_lock:
+            now = now or time.time()
+            batches = self._take_due(now, force)
+            sent = failed = 0
+            for n, (channel, items) in enumerate(batches):
+                try:
+                    await self.gateway.send_batch(channel, [message for _, message in items])
+                except Exception as e:  # custom gateways may raise anything
+                    logger.warning("Outbound %s batch of %d failed: %s", channel, len(items), e)
+                    BATCHES.labels(channel=channel, outcome="failed").inc()
+                    self._requeue(channel, items, now, failed=True)
+                    for later_channel, later_items in batches[n + 1:]:
+                        self._requeue(later_channel, later_items, now, failed=False)
+                    failed = len(items)
+                    break
+                BATCHES.labels(channel=channel, outcome="sent").inc()
+                MESSAGES.labels(channel=channel, outcome="sent").inc(len(items))
+                sent += len(items)
+            return {"batches": len(batches), "sent": sent, "failed": failed, "pending": len(self)}
+
+    # ── Introspection / snapshots ───────────────────────────────────────────
+    def summary(self, now: float | None = None) -> list[dict]:
+        now = now or time.time()
+        with self._lock:
+            buckets = sorted(self._buckets.items(), key=lambda kv: (kv[0][2], kv[0][0], kv[0][1]))
+            return [{
+                "channel":    channel,
+                "timezone":   tz,
+                "opens_at":   _iso(opens_at),
+                "closes_at":  _iso(bucket["closes_at"]),
+                "open":       opens_at <= now < bucket["closes_at"],
+                "pending":    len(bucket["messages"]),
+            } for (channel, tz, opens_at), bucket in buckets]
+
+    def pending_by_channel(self) -> dict[tuple[str], int]:
+        counts = dict.fromkeys(CHANNELS, 0)
+        with self._lock:
+            for (channel, _, _), bucket in self._buckets.items():
+                counts[channel] += len(bucket["messages"])
+        return {(channel,): n for channel, n in counts.items()}
+
+    def dump(self) -> list:
+        with self._lock:
+            return [(key, message) for bucket in self._buckets.values() for key, message in bucket["messages"].items()]
+
+    def load(self, data: list) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self._where.clear()
+            for key, message in data:
+                self._add(message, key)
+
+
+# ── Process-wide dispatcher ────────────────────────────────────────────────
+_dispatcher: Dispatcher | None = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> Dispatcher:
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = Dispatcher()
+    return _dispatcher
+
+
+async def release_periodically(interval: float = TICK_SECONDS) -> None:
+    dispatcher = get_dispatcher()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await dispatcher.release()
+        except Exception:
+            logger.exception("Dispatch release failed")
+
+
+async def close_dispatcher() -> None:
+    """Closes the gateway; pending messages stay queued for the next start (snapshot)."""
+    if _dispatcher is not None and _dispatcher._gateway is not None:
+        await _dispatcher._gateway.aclose()
+
+
+register_section("dispatch:pending", 1, lambda: get_dispatcher().dump(), lambda data: get_dispatcher().load(data))
+register_gauge(
+    "smartcore_dispatch_pending", "Outbound messages waiting for their send window, per channel.",
+    lambda: get_dispatcher().pending_by_channel(), ("channel",),
+)
@@ -0,0 +1,99 @@
+"""
+dispatch/gateway.py
+───────────────────
+Outbound gateways: where the dispatcher (dispatch/dispatcher.py) hands
+each released batch of messages.
+
+A gateway is any object with
+
+  async send_batch(channel, messages) -> None   # raise GatewayError to retry
+  async aclose() -> None
+
+Built in:
+  log    logs one line per batch and sends nothing (the default, so
+         dispatching can be switched on before a provider is wired up)
+  http   POSTs {"channel", "messages": [...]} to
+         SMARTCORE_OUTBOUND_URL/<channel> over one keep-alive connection;
+         any non-2xx answer fails the batch
+  module.path:factory
+         your own: factory() is called once and must return a gateway
+
+For local runs, python -m dispatch.gateway_standin stands in for the
+provider (SMARTCORE_OUTBOUND_GATEWAY=http,
+SMARTCORE_OUTBOUND_URL=http://127.0.0.1:8791/outbound).
+
+Environment variables:
+  SMARTCORE_OUTBOUND_GATEWAY     — "log" (default), "http" or module:factory
+  SMARTCORE_OUTBOUND_URL         — base URL for the http gateway
+  SMARTCORE_OUTBOUND_TOKEN       — sent as "Authorization: Bearer <token>"
+  SMARTCORE_OUTBOUND_TIMEOUT_S   — per-batch request timeout (default 15)
+"""
+
+import importlib
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+class GatewayError(Exception):
+    pass
+
+
+class LogGateway:
+    name = "log"
+
+    async def send_batch(self, channel: str, messages: list[dict]) -> None:
+        logger.info("Outbound %s batch of %d (log gateway, not sent): %s", channel, len(messages),
+                    ", ".join(str(m["lead_id"]) for m in messages[:5]) + (" ..." if len(messages) > 5 else ""))
+
+    async def aclose(self) -> None:
+        pass
+
+
+class HttpGateway:
+    name = "http"
+
+    def __init__(self, base_url: str, token: str | None = None, timeout: float = 15.0):
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"Authorization": f"Bearer {token}"} if token else {}
+        self.timeout = timeout
+        self._client = None
+
+    async def send_batch(self, channel: str, messages: list[dict]) -> None:
+        import httpx  # deferred until the first batch; keeps it off the startup path
+
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout, headers=self.headers)
+        try:
+            response = await self._client.post(
+                f"{self.base_url}/{channel}", json={"channel": channel, "messages": messages},
+            )
+        except httpx.HTTPError as e:
+            raise GatewayError(f"{channel} batch to {self.base_url}: {type(e).__name__}: {e}")
+        if not response.is_success:
+            raise GatewayError(f"{channel} batch to {self.base_url}: HTTP {response.status_code}")
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def make_gateway(spec: str | None = None):
+    spec = spec or os.environ.get("SMARTCORE_OUTBOUND_GATEWAY", "log")
+    if spec == "log":
+        return LogGateway()
+    if spec == "http":
+        url = os.environ.get("SMARTCORE_OUTBOUND_URL")
+        if not url:
+            raise ValueError("SMARTCORE_OUTBOUND_GATEWAY=http needs SMARTCORE_OUTBOUND_URL")
+        return HttpGateway(
+            url,
+            token=os.environ.get("SMARTCORE_OUTBOUND_TOKEN"),
+            timeout=float(os.environ.get("SMARTCORE_OUTBOUND_TIMEOUT_S", "15")),
+        )
+    module_name, _, attr = spec.partition(":")
+    if not attr:
+        raise ValueError(f"unknown outbound gateway {spec!r}; use log, http or module:factory")
+    return getattr(importlib.import_module(module_name), attr)()
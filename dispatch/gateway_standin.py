@@ -0,0 +1,90 @@
+"""
+dispatch/gateway_standin.py
+───────────────────────────
+Local stand-in for the outbound messaging provider: accepts the batches
+the http gateway (dispatch/gateway.py) POSTs and appends every message to
+a JSONL file, so dispatch can be exercised without texting anyone.
+
+  python -m dispatch.gateway_standin --port 8791 --out outbound.jsonl --fail-rate 0.1
+  SMARTCORE_OUTBOUND_GATEWAY=http SMARTCORE_OUTBOUND_URL=http://127.0.0.1:8791/outbound uvicorn main:app
+
+POST /outbound/<channel>   body {"channel", "messages": [...]} → 202
+                           (503 for a --fail-rate share of batches)
+GET  /health               → batches and messages received per channel
+"""
+
+import argparse
+import json
+import random
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHANNELS = ("whatsapp", "email", "call")
+
+
+def make_handler(out_path: str, fail_rate: float, seed: int):
+    lock = threading.Lock()
+    rng = random.Random(seed)
+    received = {"batches": Counter(), "messages": Counter(), "rejected": Counter()}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            prefix, _, channel = self.path.rpartition("/")
+            if prefix != "/outbound" or channel not in CHANNELS:
+                self.send_error(404)
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                messages = json.loads(self.rfile.read(length))["messages"]
+            except (ValueError, KeyError, TypeError):
+                self.send_error(400, "Expected {\"channel\", \"messages\": [...]}")
+                return
+            with lock:
+                if rng.random() < fail_rate:
+                    received["rejected"][channel] += 1
+                    self._reply(503, {"detail": "injected failure"})
+                    return
+                with open(out_path, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(m) + "\n" for m in messages))
+                received["batches"][channel] += 1
+                received["messages"][channel] += len(messages)
+            self._reply(202, {"accepted": len(messages)})
+
+        def do_GET(self):
+            if self.path != "/health":
+                self.send_error(404)
+                return
+            with lock:
+                self._reply(200, {k: dict(v) for k, v in received.items()})
+
+        def _reply(self, status: int, body: dict):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local outbound gateway stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8791)
+    parser.add_argument("--out", default="outbound.jsonl")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of batches answered with 503")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.out, args.fail_rate, args.seed))
+    print(f"Outbound gateway stand-in on http://{args.host}:{args.port}/outbound/<channel> → {args.out}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+dispatch/routes.py
+──────────────────
+FastAPI router for the outbound dispatch stage (dispatch/dispatcher.py).
+
+Endpoints:
+  POST /dispatch/actions        body: a /cadence/run body (lead, last_agent,
+                                days_inactive, ...) → runs score → cadence →
+                                agent action and queues that action for the
+                                region's send window
+  GET  /dispatch/queue          → pending buckets: channel, time zone,
+                                  window, message count
+  POST /dispatch/release        → send whatever is due now
+  POST /dispatch/release?force=true
+                                → send everything pending, windows or not
+
+Only messages SmartCore generated itself are queued — callers pass the
+cadence inputs, never a message body — and both POSTs need the admin key
+(X-SmartCore-Admin-Key, see security/admin_key.py), so the gateway is not
+an open relay. /cadence/run?dispatch=true queues the action it generates
+the same way, with the same key.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from dispatch.dispatcher import DispatchFull, get_dispatcher
+from models.lead_model import LeadData
+from pipeline.decision_pipeline import PipelineItem, resolve_stages, run_pipeline
+from profiling.profiler import ProfiledRoute
+from security.admin_key import require_admin_key
+
+router = APIRouter(prefix="/dispatch", tags=["Outbound dispatch"], route_class=ProfiledRoute)
+
+
+_ACTION_STAGES = resolve_stages(["cadence", "action"])
+
+
+def dispatch_action(lead: LeadData, action: dict) -> list[dict]:
+    try:
+        return get_dispatcher().enqueue(lead, action)
+    except DispatchFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "60"})
+
+
+@router.post("/actions", dependencies=[Depends(require_admin_key)])
+def queue_action(payload: PipelineItem):
+    action = run_pipeline(payload, _ACTION_STAGES)["agent_action"]
+    return {"success": True, "agent_action": action, "dispatch": dispatch_action(payload.lead, action)}
+
+
+@router.get("/queue")
+def queue_summary():
+    dispatcher = get_dispatcher()
+    buckets = dispatcher.summary()
+    return {"success": True, "pending": len(dispatcher), "buckets": buckets}
+
+
+@router.post("/release", dependencies=[Depends(require_admin_key)])
+async def release(force: bool = Query(default=False, description="Ignore send windows")):
+    return {"success": True, **(await get_dispatcher().release(force=force))}
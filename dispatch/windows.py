@@ -0,0 +1,139 @@
+"""
+dispatch/windows.py
+───────────────────
+Region-local send windows: when a WhatsApp message, an email or a call
+may go out to a lead, in the lead's own time zone.
+
+A lead's time zone comes from its country_region, then its country, then
+its phone's calling code (see REGION_TIMEZONES); anything else falls back
+to SMARTCORE_DISPATCH_DEFAULT_TZ.
+
+Default windows (local time, end exclusive):
+
+  whatsapp   09:00–20:00  Mon–Sat
+  email      08:00–18:00  Mon–Fri
+  call       10:00–17:00  Mon–Fri
+
+Environment variables:
+  SMARTCORE_DISPATCH_DEFAULT_TZ  — time zone for leads with no known
+                                   region (default "Europe/London")
+  SMARTCORE_DISPATCH_WINDOWS     — overrides, e.g.
+                                   "call=10-16/mon-fri;whatsapp=8-21/mon-sun"
+"""
+
+import os
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from models.lead_model import LeadData
+
+CHANNELS = ("whatsapp", "email", "call")
+
+DEFAULT_TZ = os.environ.get("SMARTCORE_DISPATCH_DEFAULT_TZ", "Europe/London")
+
+REGION_TIMEZONES = {
+    "uk": "Europe/London", "united kingdom": "Europe/London", "england": "Europe/London",
+    "dubai": "Asia/Dubai", "uae": "Asia/Dubai", "united arab emirates": "Asia/Dubai",
+    "nigeria": "Africa/Lagos",
+    "kenya": "Africa/Nairobi",
+    "ghana": "Africa/Accra",
+    "south africa": "Africa/Johannesburg",
+    "usa": "America/New_York", "us": "America/New_York", "united states": "America/New_York",
+    "canada": "America/Toronto",
+}
+
+# Calling code → time zone, longest codes first so "+234" is not read as "+2"
+_PHONE_TIMEZONES = (
+    ("971", "Asia/Dubai"),
+    ("234", "Africa/Lagos"),
+    ("254", "Africa/Nairobi"),
+    ("233", "Africa/Accra"),
+    ("44", "Europe/London"),
+    ("27", "Africa/Johannesburg"),
+    ("1", "America/New_York"),
+)
+
+_DAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+# channel → (start hour, end hour, weekdays with Monday = 0)
+DEFAULT_WINDOWS = {
+    "whatsapp": (9, 20, frozenset(range(6))),
+    "email":    (8, 18, frozenset(range(5))),
+    "call":     (10, 17, frozenset(range(5))),
+}
+
+
+def _parse_days(spec: str) -> frozenset[int]:
+    first, _, last = spec.partition("-")
+    start = _DAYS.index(first)
+    end = _DAYS.index(last or first)
+    return frozenset((start + n) % 7 for n in range((end - start) % 7 + 1))
+
+
+def parse_windows(spec: str) -> dict[str, tuple[int, int, frozenset[int]]]:
+    """
+    "call=10-16/mon-fri;email=8-18" → window overrides. Days default to
+    every day. Raises ValueError on anything malformed.
+    """
+    windows = {}
+    for part in filter(None, (p.strip() for p in spec.split(";"))):
+        channel, _, rule = part.partition("=")
+        channel = channel.strip().lower()
+        hours, _, days = rule.strip().partition("/")
+        try:
+            start, end = (int(h) for h in hours.split("-"))
+            weekdays = _parse_days(days.strip().lower()) if days else frozenset(range(7))
+        except ValueError:
+            raise ValueError(f"bad send window {part!r}; expected e.g. call=10-17/mon-fri")
+        if channel not in CHANNELS or not 0 <= start < end <= 24:
+            raise ValueError(f"bad send window {part!r}; channels are {', '.join(CHANNELS)}")
+        windows[channel] = (start, end, weekdays)
+    return windows
+
+
+WINDOWS = {**DEFAULT_WINDOWS, **parse_windows(os.environ.get("SMARTCORE_DISPATCH_WINDOWS", ""))}
+
+_zones: dict[str, ZoneInfo] = {}
+
+
+def zone(name: str) -> ZoneInfo:
+    if name not in _zones:
+        try:
+            _zones[name] = ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            _zones[name] = ZoneInfo(DEFAULT_TZ)
+    return _zones[name]
+
+
+def lead_timezone(lead: LeadData) -> str:
+    for value in (lead.country_region, lead.country):
+        key = (value or "").strip().lower()
+        if key in REGION_TIMEZONES:
+            return REGION_TIMEZONES[key]
+    digits = "".join(c for c in (lead.phone or "") if c.isdigit())
+    if (lead.phone or "").strip().startswith(("+", "00")):
+        digits = digits.removeprefix("00")
+        for code, tz in _PHONE_TIMEZONES:
+            if digits.startswith(code):
+                return tz
+    return DEFAULT_TZ
+
+
+def send_window(tz_name: str, channel: str, now: float) -> tuple[float, float]:
+    """
+    (opens_at, closes_at) epoch seconds of the window that is open at
+    `now`, or else the next one to open.
+    """
+    start_hour, end_hour, weekdays = WINDOWS[channel]
+    tz = zone(tz_name)
+    today = datetime.fromtimestamp(now, tz).date()
+    for offset in range(8):
+        day = today + timedelta(days=offset)
+        if day.weekday() not in weekdays:
+            continue
+        opens = datetime(day.year, day.month, day.day, start_hour, tzinfo=tz)
+        closes = (datetime(day.year, day.month, day.day, tzinfo=tz) + timedelta(hours=end_hour)
+                  if end_hour == 24 else datetime(day.year, day.month, day.day, end_hour, tzinfo=tz))
+        if closes.timestamp() > now:
+            return opens.timestamp(), closes.timestamp()
+    raise ValueError(f"no send window for {channel}")
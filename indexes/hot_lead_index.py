@@ -0,0 +1,313 @@
+"""
+indexes/hot_lead_index.py
+─────────────────────────
+Incrementally maintained ranking of leads for "who to call next".
+
+Order: score (desc), then recency of the last behaviour signal (desc —
+email_opened / link_clicked / whatsapp_replied turning on), then lead id.
+
+Kept in step with scoring/score_store.py through a listener, so every
+rescore (Zoho notification, pipeline, decision endpoint) updates it.
+Listeners only fire in the process that recorded the change, so with a
+shared state backend reconcile_from_store() also brings it in line with
+score_store on the segment-aggregate reconcile schedule (see
+indexes/segment_aggregates.py); leads it had not seen take their
+scored_at as signal time.
+
+Structure: one sorted key list for the whole book plus one per region,
+industry and call_decision value. Each list is a list of small sorted
+chunks (≤ CHUNK_SIZE) with an index of chunk maxima, so:
+  update  — bisect over chunks + bisect within one chunk: O(log n)
+            (the in-chunk shift is bounded by CHUNK_SIZE)
+  top_k   — walk chunks from the front: O(k) with one filter,
+            plus skipped non-matches when several filters are combined
+"""
+
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime
+
+from scoring.score_store import add_listener, all_lead_states
+from scoring.scoring_engine import lead_region
+from state.snapshots import register_section
+
+CHUNK_SIZE = 512
+
+BEHAVIOUR_FLAGS = ("email_opened", "link_clicked", "whatsapp_replied")
+
+
+class SortedKeyList:
+    """Sorted list of unique, comparable keys split into bounded chunks."""
+
+    def __init__(self):
+        self._chunks: list[list] = []
+        self._maxes: list = []
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    @classmethod
+    def from_sorted(cls, keys: list) -> "SortedKeyList":
+        """Bulk build from already sorted, unique keys (no per-key bisect)."""
+        built = cls()
+        built._chunks = [keys[i:i + CHUNK_SIZE] for i in range(0, len(keys), CHUNK_SIZE)]
+        built._maxes = [chunk[-1] for chunk in built._chunks]
+        built._len = len(keys)
+        return built
+
+    def add(self, key) -> None:
+        if not self._chunks:
+            self._chunks.append([key])
+            self._maxes.append(key)
+            self._len = 1
+            return
+
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            pos -= 1
+            self._chunks[pos].append(key)
+            self._maxes[pos] = key
+        else:
+            insort(self._chunks[pos], key)
+        self._len += 1
+
+        if len(self._chunks[pos]) > CHUNK_SIZE:
+            chunk = self._chunks[pos]
+            half = len(chunk) // 2
+            self._chunks[pos:pos + 1] = [chunk[:half], chunk[half:]]
+            self._maxes[pos:pos + 1] = [chunk[half - 1], chunk[-1]]
+
+    def remove(self, key) -> None:
+        pos = bisect_left(self._maxes, key)
+        chunk = self._chunks[pos]
+        i = bisect_left(chunk, key)
+        del chunk[i]
+        self._len -= 1
+
+        if not chunk:
+            del self._chunks[pos]
+            del self._maxes[pos]
+        elif i == len(chunk):
+            self._maxes[pos] = chunk[-1]
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            yield from chunk
+
+
+class HotLeadIndex:
+    def __init__(self):
+        self._all = SortedKeyList()
+        self._by_dimension: dict[str, dict[str, SortedKeyList]] = {
+            "region": {}, "industry": {}, "call_decision": {},
+        }
+        # lead_id → (key, {dimension: value}, summary)
+        self._leads: dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        # lead_ids upserted / removed by the listener while a reconcile is running
+        self._changed: set[str] | None = None
+
+    def __len__(self) -> int:
+        return len(self._leads)
+
+    def upsert(self, lead_id: str, score: int, last_signal_at: float,
+               dimensions: dict[str, str], summary: dict) -> None:
+        key = (-score, -last_signal_at, lead_id)
+        with self._lock:
+            self._upsert(lead_id, key, dimensions, summary)
+            if self._changed is not None:
+                self._changed.add(lead_id)
+
+    def remove(self, lead_id: str) -> None:
+        with self._lock:
+            self._remove(lead_id)
+            if self._changed is not None:
+                self._changed.add(lead_id)
+
+    def begin_reconcile(self) -> None:
+        """Starts recording listener changes; call before reading the states for reconcile()."""
+        with self._lock:
+            self._changed = set()
+
+    def reconcile(self, rows: list[tuple]) -> int:
+        """
+        Brings the index in line with (lead_id, key, dimensions, summary)
+        rows built from a store read, changing only the leads that differ.
+        Leads the listener touched since begin_reconcile() are left as they
+        are — the listener saw a newer state than the read. Returns how many
+        leads were added, removed or re-ranked.
+        """
+        with self._lock:
+            skip, self._changed = self._changed or set(), None
+            seen, moved = set(), 0
+            for lead_id, key, dimensions, summary in rows:
+                seen.add(lead_id)
+                if lead_id in skip or self._leads.get(lead_id) == (key, dimensions, summary):
+                    continue
+                self._upsert(lead_id, key, dimensions, summary)
+                moved += 1
+            for lead_id in [i for i in self._leads if i not in seen and i not in skip]:
+                self._remove(lead_id)
+                moved += 1
+            return moved
+
+    def last_signal_at(self, lead_id: str) -> float | None:
+        item = self._leads.get(lead_id)
+        return -item[0][1] if item else None
+
+    def top_k(self, k: int = 50, **filters: str | None) -> list[dict]:
+        """
+        Highest-ranked leads, optionally filtered by region, industry and/or
+        call_decision (exact; case-insensitive for industry, and region
+        normalised like the index, so "UK" and "United Kingdom" match "uk").
+        """
+        normalise = {"region": lead_region, "industry": _norm}
+        filters = {d: normalise.get(d, str)(v) for d, v in filters.items() if v}
+
+        with self._lock:
+            source = self._all
+            for dimension, value in filters.items():
+                candidate = self._by_dimension[dimension].get(value)
+                if candidate is None:
+                    return []
+                if len(candidate) < len(source):
+                    source = candidate
+
+            results = []
+            for key in source:
+                _, dimensions, summary = self._leads[key[2]]
+                if all(dimensions.get(d) == v for d, v in filters.items()):
+                    results.append({
+                        "lead_id":        key[2],
+                        "score":          -key[0],
+                        "last_signal_at": -key[1] or None,
+                        **dimensions,
+                        **summary,
+                    })
+                    if len(results) >= k:
+                        break
+            return results
+
+    def dump_state(self) -> list[tuple]:
+        """(lead_id, key, dimensions, summary) rows, for state/snapshots.py."""
+        with self._lock:
+            return [(lead_id, *item) for lead_id, item in self._leads.items()]
+
+    def load_state(self, rows: list[tuple]) -> None:
+        """Replaces the index with dumped rows, building each list in one pass."""
+        leads = {lead_id: (tuple(key), dimensions, summary) for lead_id, key, dimensions, summary in rows}
+        ordered = sorted(item[0] for item in leads.values())
+        buckets: dict[str, dict[str, list]] = {d: {} for d in self._by_dimension}
+        for key in ordered:
+            for dimension, value in leads[key[2]][1].items():
+                buckets[dimension].setdefault(value, []).append(key)
+
+        by_dimension = {
+            dimension: {value: SortedKeyList.from_sorted(keys) for value, keys in values.items()}
+            for dimension, values in buckets.items()
+        }
+        with self._lock:
+            self._all = SortedKeyList.from_sorted(ordered)
+            self._by_dimension = by_dimension
+            self._leads = leads
+
+    def _upsert(self, lead_id: str, key: tuple, dimensions: dict[str, str], summary: dict) -> None:
+        self._remove(lead_id)
+        self._all.add(key)
+        for dimension, value in dimensions.items():
+            self._by_dimension[dimension].setdefault(value, SortedKeyList()).add(key)
+        self._leads[lead_id] = (key, dimensions, summary)
+
+    def _remove(self, lead_id: str) -> None:
+        item = self._leads.pop(lead_id, None)
+        if item is None:
+            return
+        key, dimensions, _ = item
+        self._all.remove(key)
+        for dimension, value in dimensions.items():
+            bucket = self._by_dimension[dimension][value]
+            bucket.remove(key)
+            if not len(bucket):
+                del self._by_dimension[dimension][value]
+
+
+def _norm(value: str | None) -> str:
+    return (value or "").strip().lower()
+
+
+# ── Process-wide index fed by score_store ─────────────────────────────────
+hot_lead_index = HotLeadIndex()
+
+
+def index_entry(entry: dict | None, previous: dict | None) -> None:
+    """score_store listener: applies one lead change to the index."""
+    if entry is None:
+        hot_lead_index.remove(previous["lead_id"])
+        return
+
+    lead = entry["lead"]
+
+    # Recency moves only when a behaviour signal turns on
+    prior_lead = (previous or {}).get("lead") or {}
+    signal_now = any(lead.get(f) for f in BEHAVIOUR_FLAGS)
+    signal_new = any(lead.get(f) and not prior_lead.get(f) for f in BEHAVIOUR_FLAGS)
+    last_signal_at = hot_lead_index.last_signal_at(entry["lead_id"]) or 0.0
+    if signal_new or (signal_now and not last_signal_at):
+        last_signal_at = time.time()
+
+    score, dimensions, summary = _entry_fields(entry)
+    hot_lead_index.upsert(entry["lead_id"], score, last_signal_at, dimensions, summary)
+
+
+def _entry_fields(entry: dict) -> tuple[int, dict, dict]:
+    lead, scoring = entry["lead"], entry["scoring"]
+    dimensions = {
+        "region":        lead_region(lead.get("country_region"), lead.get("country")),
+        "industry":      _norm(lead.get("industry_type")),
+        "call_decision": scoring.get("call_decision") or "",
+    }
+    summary = {
+        "full_name":    lead.get("full_name"),
+        "company":      lead.get("company"),
+        "intent_level": scoring.get("intent_level"),
+    }
+    return int(scoring.get("score") or 0), dimensions, summary
+
+
+def reconcile_from_store(states: list[dict] | None = None) -> int:
+    """
+    Brings the index in line with score_store, keeping signal recency for
+    leads already indexed. When states are passed in, the caller must have
+    called hot_lead_index.begin_reconcile() before reading them. Returns how
+    many leads were added, removed or re-ranked.
+    """
+    if states is None:
+        hot_lead_index.begin_reconcile()
+        states = all_lead_states()
+    rows = []
+    for entry in states:
+        lead_id = entry["lead_id"]
+        last_signal_at = hot_lead_index.last_signal_at(lead_id)
+        if last_signal_at is None:
+            last_signal_at = 0.0
+            if any(entry["lead"].get(f) for f in BEHAVIOUR_FLAGS):
+                last_signal_at = _timestamp(entry.get("scored_at")) or time.time()
+        score, dimensions, summary = _entry_fields(entry)
+        rows.append((lead_id, (-score, -last_signal_at, lead_id), dimensions, summary))
+    return hot_lead_index.reconcile(rows)
+
+
+def _timestamp(iso: str | None) -> float | None:
+    try:
+        return datetime.fromisoformat(iso).timestamp() if iso else None
+    except ValueError:
+        return None
+
+
+add_listener(index_entry)
+
+# last_signal_at exists only here, so the index is snapshotted for restarts
+register_section("index:hot_leads", 2, hot_lead_index.dump_state, hot_lead_index.load_state,
+                 reconcile_from_store)
@@ -0,0 +1,232 @@
+"""
+indexes/identity_index.py
+─────────────────────────
+Who is this lead, really? The same person arrives through several
+lead_source / entry_channel paths with differently formatted contact
+details; these keys make the copies collide:
+
+  email  — trimmed, lower-cased, "+tag" dropped, dots ignored for Gmail
+  phone  — E.164 (+<country code><number>); local numbers use the lead's
+           country_region to pick the country code
+  name   — hash of normalised company + full name (legal suffixes and
+           punctuation ignored); only when both are present, since a
+           bare name is not specific enough
+
+Two leads are the same identity when any key matches.
+
+  IdentityIndex   — process-wide key → lead_id map, fed by score_store;
+                    O(1) lookups for "have we seen this person already?"
+  dedup_leads()   — collapses duplicates inside one batch (transitively,
+                    so A~B by email and B~C by phone is one group) and
+                    merges behaviour flags before scoring / routing
+"""
+
+import hashlib
+import re
+import threading
+
+from models.lead_model import LeadData
+from scoring.score_store import add_listener, all_lead_states
+from state.snapshots import register_section
+
+BEHAVIOUR_FLAGS = ("email_opened", "link_clicked", "whatsapp_replied")
+
+# country_region / country → calling code, for numbers written locally
+CALLING_CODES = {
+    "uk": "44", "united kingdom": "44", "england": "44",
+    "nigeria": "234",
+    "dubai": "971", "uae": "971", "united arab emirates": "971",
+    "kenya": "254",
+    "ghana": "233",
+    "south africa": "27",
+    "usa": "1", "us": "1", "united states": "1", "canada": "1",
+}
+
+_GMAIL_DOMAINS = {"gmail.com", "googlemail.com"}
+_LEGAL_SUFFIXES = {"ltd", "limited", "llc", "inc", "plc", "corp", "co", "fze", "fzco", "gmbh"}
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_email(email: str | None) -> str | None:
+    if not email or "@" not in email:
+        return None
+    local, _, domain = email.strip().lower().rpartition("@")
+    local = local.split("+", 1)[0]
+    if domain in _GMAIL_DOMAINS:
+        local, domain = local.replace(".", ""), "gmail.com"
+    return f"{local}@{domain}" if local and domain else None
+
+
+def normalize_phone(phone: str | None, region: str | None = None) -> str | None:
+    """E.164 form of a phone number, or None if it cannot be determined."""
+    if not phone:
+        return None
+    raw = phone.strip().replace("(0)", "")  # "+44 (0)7911 ..." style
+    digits = re.sub(r"\D", "", raw)
+    if not digits:
+        return None
+
+    if raw.startswith("+"):
+        pass
+    elif digits.startswith("00"):
+        digits = digits[2:]
+    else:
+        code = CALLING_CODES.get((region or "").strip().lower())
+        if digits.startswith("0") and code:
+            digits = code + digits.lstrip("0")
+        elif code and not digits.startswith(code):
+            digits = code + digits
+        elif not code and len(digits) <= 10:
+            return None  # local number, unknown country
+
+    return f"+{digits}" if 8 <= len(digits) <= 15 else None
+
+
+def company_name_key(company: str | None, full_name: str | None) -> str | None:
+    name = " ".join(_NON_WORD.sub(" ", (full_name or "").lower()).split())
+    words = _NON_WORD.sub(" ", (company or "").lower()).split()
+    company_norm = " ".join(w for w in words if w not in _LEGAL_SUFFIXES)
+    if not name or not company_norm:
+        return None
+    return hashlib.blake2b(f"{company_norm}|{name}".encode(), digest_size=12).hexdigest()
+
+
+def identity_keys(lead: LeadData) -> list[str]:
+    """All identity keys for a lead, prefixed by kind ("email:", "phone:", "name:")."""
+    keys = []
+    email = normalize_email(lead.email)
+    if email:
+        keys.append("email:" + email)
+    phone = normalize_phone(lead.phone, lead.country_region or lead.country)
+    if phone:
+        keys.append("phone:" + phone)
+    name = company_name_key(lead.company, lead.full_name)
+    if name:
+        keys.append("name:" + name)
+    return keys
+
+
+class IdentityIndex:
+    def __init__(self):
+        self._by_key: dict[str, str] = {}       # identity key → lead_id
+        self._keys: dict[str, list[str]] = {}   # lead_id → its keys
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def lookup(self, lead: LeadData) -> str | None:
+        """lead_id of a known lead sharing any identity key, else None."""
+        for key in identity_keys(lead):
+            lead_id = self._by_key.get(key)
+            if lead_id is not None:
+                return lead_id
+        return None
+
+    def add(self, lead_id: str, lead: LeadData) -> None:
+        keys = identity_keys(lead)
+        with self._lock:
+            self._remove(lead_id)
+            for key in keys:
+                self._by_key.setdefault(key, lead_id)
+            self._keys[lead_id] = keys
+
+    def remove(self, lead_id: str) -> None:
+        with self._lock:
+            self._remove(lead_id)
+
+    def dump_state(self) -> dict:
+        """Key maps, for state/snapshots.py."""
+        with self._lock:
+            return {"by_key": dict(self._by_key), "keys": dict(self._keys)}
+
+    def load_state(self, data: dict) -> None:
+        with self._lock:
+            self._by_key = data["by_key"]
+            self._keys = data["keys"]
+
+    def _remove(self, lead_id: str) -> None:
+        for key in self._keys.pop(lead_id, ()):
+            if self._by_key.get(key) == lead_id:
+                del self._by_key[key]
+
+
+def merge_leads(leads: list[LeadData]) -> LeadData:
+    """
+    One lead from several copies of the same person: the first copy wins,
+    empty fields are filled from later copies, behaviour flags are OR-ed.
+    """
+    merged = leads[0].model_dump()
+    for other in leads[1:]:
+        for field, value in other.model_dump().items():
+            if field in BEHAVIOUR_FLAGS:
+                merged[field] = bool(merged[field] or value)
+            elif merged[field] in (None, "", []) and value not in (None, "", []):
+                merged[field] = value
+    return LeadData.model_validate(merged)
+
+
+def dedup_leads(leads: list[LeadData]) -> tuple[list[LeadData], list[list[int]], dict]:
+    """
+    Collapses duplicates within a batch.
+
+    Returns (unique_leads, groups, stats):
+      unique_leads — merged lead per identity, in first-seen order
+      groups       — for each unique lead, the input positions it came from
+      stats        — {"input", "unique", "duplicates", "dedup_ratio"}
+    """
+    parent = list(range(len(leads)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    first_with_key: dict[str, int] = {}
+    for i, lead in enumerate(leads):
+        for key in identity_keys(lead):
+            j = first_with_key.setdefault(key, i)
+            if j != i:
+                a, b = find(i), find(j)
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+
+    grouped: dict[int, list[int]] = {}
+    for i in range(len(leads)):
+        grouped.setdefault(find(i), []).append(i)
+
+    groups = list(grouped.values())
+    unique = [
+        leads[g[0]] if len(g) == 1 else merge_leads([leads[i] for i in g])
+        for g in groups
+    ]
+    duplicates = len(leads) - len(unique)
+    stats = {
+        "input":       len(leads),
+        "unique":      len(unique),
+        "duplicates":  duplicates,
+        "dedup_ratio": round(duplicates / len(leads), 4) if leads else 0.0,
+    }
+    return unique, groups, stats
+
+
+# ── Process-wide index of known leads, fed by score_store ─────────────────
+identity_index = IdentityIndex()
+
+
+def index_entry(entry: dict | None, previous: dict | None) -> None:
+    """score_store listener: keeps the identity index in step."""
+    if entry is None:
+        identity_index.remove(previous["lead_id"])
+    else:
+        identity_index.add(entry["lead_id"], LeadData.model_validate(entry["lead"]))
+
+
+def rebuild_from_store() -> None:
+    for state in all_lead_states():
+        index_entry(state, None)
+
+
+add_listener(index_entry)
+register_section("index:identity", 1, identity_index.dump_state, identity_index.load_state, rebuild_from_store)
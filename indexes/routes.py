@@ -0,0 +1,80 @@
+"""
+indexes/routes.py
+─────────────────
+FastAPI router for SmartCore's in-memory lead indexes.
+
+Endpoints:
+  GET /leads/top?k=50                       → hottest leads right now
+  GET /leads/top?region=uk&call_decision=call_now
+                                            → filtered by region / industry / call_decision
+  GET /leads/identity?email=...&phone=...  → known lead_id for this person, if any
+  GET /stats/segments                       → dashboard tiles: counts and average
+                                              score per segment
+"""
+
+import time
+
+from fastapi import APIRouter, Query
+
+from models.lead_model import LeadData
+
+from indexes.hot_lead_index import hot_lead_index
+from indexes.identity_index import identity_index, identity_keys
+from indexes.segment_aggregates import segment_aggregates
+from profiling.profiler import ProfiledRoute
+
+router = APIRouter(tags=["Lead indexes"], route_class=ProfiledRoute)
+
+
+@router.get("/leads/top")
+def top_leads(
+    k: int = Query(default=50, ge=1, le=1000, description="Number of leads to return"),
+    region: str = Query(default=None, description="e.g. 'uk', 'dubai', 'nigeria'"),
+    industry: str = Query(default=None, description="e.g. 'fx/crypto', 'sme'"),
+    call_decision: str = Query(default=None, description="e.g. 'call_now', 'call_after_intake'"),
+):
+    """
+    Ranked by score, then by how recently a behaviour signal came in.
+    Served from the incrementally maintained index — no Zoho round trip.
+    """
+    started = time.perf_counter()
+    leads = hot_lead_index.top_k(k, region=region, industry=industry, call_decision=call_decision)
+    return {
+        "success":    True,
+        "count":      len(leads),
+        "indexed":    len(hot_lead_index),
+        "leads":      leads,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
+
+
+@router.get("/leads/identity")
+def lead_identity(
+    email: str = Query(default=None),
+    phone: str = Query(default=None),
+    country_region: str = Query(default=None, description="Used to read local phone numbers"),
+    company: str = Query(default=None),
+    full_name: str = Query(default=None),
+):
+    """
+    Looks up a person by normalised email, E.164 phone or company + name.
+    Returns the lead_id SmartCore already knows them under, or null.
+    """
+    lead = LeadData(email=email, phone=phone, country_region=country_region,
+                    company=company, full_name=full_name)
+    return {
+        "success": True,
+        "lead_id": identity_index.lookup(lead),
+        "keys":    identity_keys(lead),
+        "indexed": len(identity_index),
+    }
+
+
+@router.get("/stats/segments")
+def segment_stats():
+    """
+    Lead count and average score by intent_level, country_region,
+    industry_type, lead_source and assigned_agent. Maintained incrementally
+    as leads are scored and routed; reconciled periodically in the background.
+    """
+    return {"success": True, **segment_aggregates.snapshot()}
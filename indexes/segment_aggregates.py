@@ -0,0 +1,206 @@
+"""
+indexes/segment_aggregates.py
+─────────────────────────────
+Dashboard summary tiles — lead count and average score per segment —
+maintained incrementally instead of iterating the whole lead list.
+
+Segments:
+  intent_level    — from the scoring result
+  country_region  — from the lead, normalised like score_lead (lead_region)
+  industry_type   — from the lead
+  lead_source     — from the lead
+  assigned_agent  — from the routing result ("unknown" until the lead is routed)
+
+Every score_store change subtracts the lead's previous contribution and
+adds the new one, so reading the stats is O(number of segment values),
+independent of the size of the book.
+
+Listeners only fire in the process that recorded the change, so with a
+shared state backend other workers' changes (and any missed deltas) are
+picked up by reconcile(), which rebuilds from score_store and reports how
+far the incremental counts had drifted. The same periodic task rebuilds the
+hot-lead index (indexes/hot_lead_index.py) from the same read of the store.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+
+from indexes.hot_lead_index import hot_lead_index, reconcile_from_store as reconcile_hot_leads
+from scoring.score_store import add_listener, all_lead_states
+from scoring.scoring_engine import lead_region
+from state.snapshots import register_section
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_SECONDS = float(os.environ.get("SMARTCORE_STATS_RECONCILE_S", "300"))
+
+DIMENSIONS = ("intent_level", "country_region", "industry_type", "lead_source", "assigned_agent")
+
+UNKNOWN = "unknown"
+
+
+def _segments(entry: dict) -> dict[str, str]:
+    lead = entry.get("lead") or {}
+    scoring = entry.get("scoring") or {}
+    routing = entry.get("routing") or {}
+    return {
+        "intent_level":   scoring.get("intent_level") or UNKNOWN,
+        "country_region": lead_region(lead.get("country_region"), lead.get("country")) or UNKNOWN,
+        "industry_type":  lead.get("industry_type") or UNKNOWN,
+        "lead_source":    lead.get("lead_source") or UNKNOWN,
+        "assigned_agent": routing.get("assigned_agent") or UNKNOWN,
+    }
+
+
+def _score(entry: dict) -> int:
+    return int((entry.get("scoring") or {}).get("score") or 0)
+
+
+class SegmentAggregates:
+    def __init__(self):
+        # dimension → value → [count, score_sum]
+        self._totals: dict[str, dict[str, list[int]]] = {d: {} for d in DIMENSIONS}
+        self._count = 0
+        self._score_sum = 0
+        self._lock = threading.Lock()
+        self.last_reconciled_at: float | None = None
+        self.last_drift: int = 0
+        # lead_id → latest entry (None once deleted) while a rebuild is running
+        self._changed: dict[str, dict | None] | None = None
+
+    def apply(self, entry: dict | None, previous: dict | None) -> None:
+        """Applies one lead change as a delta (score_store listener signature)."""
+        with self._lock:
+            if previous is not None:
+                self._add(previous, -1)
+            if entry is not None:
+                self._add(entry, +1)
+            if self._changed is not None:
+                self._changed[(entry or previous)["lead_id"]] = entry
+
+    def begin_reconcile(self) -> None:
+        """Starts recording lead changes; call before reading the states for reconcile()."""
+        with self._lock:
+            self._changed = {}
+
+    def reconcile(self, states: list[dict]) -> int:
+        """
+        Rebuilds the aggregates from a full list of lead states and swaps
+        them in. Leads that changed since begin_reconcile() are counted at
+        their latest entry rather than as read, so listener deltas landing
+        mid-rebuild are not lost. Returns the number of (segment, value)
+        counts that differed.
+        """
+        fresh = SegmentAggregates()
+        for state in states:
+            fresh._add(state, +1)
+
+        with self._lock:
+            if self._changed:
+                read = {state["lead_id"]: state for state in states}
+                for lead_id, entry in self._changed.items():
+                    if lead_id in read:
+                        fresh._add(read[lead_id], -1)
+                    if entry is not None:
+                        fresh._add(entry, +1)
+            self._changed = None
+            drift = _count_drift(self._totals, fresh._totals)
+            self._totals = fresh._totals
+            self._count = fresh._count
+            self._score_sum = fresh._score_sum
+            self.last_reconciled_at = time.time()
+            self.last_drift = drift
+        return drift
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "total_leads":   self._count,
+                "average_score": _avg(self._score_sum, self._count),
+                "segments": {
+                    dimension: {
+                        value: {"count": count, "average_score": _avg(score_sum, count)}
+                        for value, (count, score_sum) in sorted(values.items())
+                    }
+                    for dimension, values in self._totals.items()
+                },
+                "last_reconciled_at": self.last_reconciled_at,
+                "last_drift":         self.last_drift,
+            }
+
+    def dump_state(self) -> dict:
+        """Raw counters, for state/snapshots.py (snapshot() is the API view)."""
+        with self._lock:
+            return {
+                "totals":    {d: {v: list(b) for v, b in values.items()} for d, values in self._totals.items()},
+                "count":     self._count,
+                "score_sum": self._score_sum,
+            }
+
+    def load_state(self, data: dict) -> None:
+        totals = {d: dict(data["totals"].get(d, {})) for d in DIMENSIONS}
+        with self._lock:
+            self._totals = totals
+            self._count = data["count"]
+            self._score_sum = data["score_sum"]
+
+    def _add(self, entry: dict, sign: int) -> None:
+        score = _score(entry)
+        self._count += sign
+        self._score_sum += sign * score
+        for dimension, value in _segments(entry).items():
+            bucket = self._totals[dimension].setdefault(value, [0, 0])
+            bucket[0] += sign
+            bucket[1] += sign * score
+            if bucket[0] <= 0:
+                del self._totals[dimension][value]
+
+
+def _avg(total: int, count: int) -> float | None:
+    return round(total / count, 2) if count > 0 else None
+
+
+def _count_drift(old: dict, new: dict) -> int:
+    drift = 0
+    for dimension in DIMENSIONS:
+        values = old[dimension].keys() | new[dimension].keys()
+        for value in values:
+            if old[dimension].get(value, [0, 0]) != new[dimension].get(value, [0, 0]):
+                drift += 1
+    return drift
+
+
+# ── Process-wide aggregates fed by score_store ────────────────────────────
+segment_aggregates = SegmentAggregates()
+
+
+def reconcile_from_store() -> int:
+    """Full recount from score_store; run periodically to catch drift."""
+    segment_aggregates.begin_reconcile()
+    return segment_aggregates.reconcile(all_lead_states())
+
+
+async def reconcile_periodically(interval: float = RECONCILE_SECONDS) -> None:
+    """Background task started from the app lifespan; also reconciles the hot-lead index."""
+    while True:
+        try:
+            segment_aggregates.begin_reconcile()
+            hot_lead_index.begin_reconcile()
+            states = await asyncio.to_thread(all_lead_states)
+            drift = await asyncio.to_thread(segment_aggregates.reconcile, states)
+            if drift:
+                logger.warning("Segment aggregates drifted on %d segment values; reconciled", drift)
+            moved = await asyncio.to_thread(reconcile_hot_leads, states)
+            if moved:
+                logger.info("Hot-lead index picked up %d changes from score_store", moved)
+        except Exception:
+            logger.exception("Segment aggregate / hot-lead index reconciliation failed")
+        await asyncio.sleep(interval)
+
+
+add_listener(segment_aggregates.apply)
+register_section("index:segments", 2, segment_aggregates.dump_state, segment_aggregates.load_state,
+                 reconcile_from_store)
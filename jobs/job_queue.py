@@ -0,0 +1,289 @@
+"""
+jobs/job_queue.py
+─────────────────
+Bounded job queues for accept-and-enqueue endpoints.
+
+Two backends with the same interface:
+  MemoryJobQueue  — in-process, fastest, lost on restart
+  SqliteJobQueue  — durable; jobs survive a restart and can be shared by
+                    several workers/processes on the same host
+
+Jobs carry a lane ("hot" or "bulk", see jobs/lanes.py); workers claim
+from one lane only, so hot jobs never queue behind bulk ones. Each lane
+refuses new work with QueueFull once `maxsize` of its jobs are waiting or
+running (back-pressure), so callers can answer 429 instead of queueing
+without limit.
+
+Job record shape (as returned by get()):
+  {"id", "lane", "status": queued|running|done|failed, "payload",
+   "callback_url", "result", "error", "attempts", "created_at", "updated_at"}
+
+Environment variables:
+  SMARTCORE_JOB_BACKEND     — "memory" (default) or "sqlite"
+  SMARTCORE_JOB_DB          — SQLite file, default smartcore_jobs.db
+  SMARTCORE_JOB_QUEUE_SIZE  — max queued + running jobs per lane, default 1000
+  SMARTCORE_JOB_LEASE_S     — sqlite only: seconds before an unfinished
+                              'running' job is handed out again, default 60
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+
+class QueueFull(Exception):
+    """Raised by enqueue() when the queue is at capacity."""
+
+
+# How many finished jobs to keep for status lookups
+FINISHED_RETENTION = 10_000
+
+
+def _new_job(payload: dict, callback_url: str | None, lane: str) -> dict:
+    now = time.time()
+    return {
+        "id":           uuid.uuid4().hex,
+        "lane":         lane,
+        "status":       "queued",
+        "payload":      payload,
+        "callback_url": callback_url,
+        "result":       None,
+        "error":        None,
+        "attempts":     0,
+        "created_at":   now,
+        "updated_at":   now,
+    }
+
+
+class MemoryJobQueue:
+    """In-process bounded queue. Not durable."""
+
+    def __init__(self, maxsize: int = 1000):
+        self.maxsize = maxsize
+        self._queues: dict[str, queue.Queue] = {}
+        self._jobs: dict[str, dict] = {}
+        self._finished: OrderedDict[str, None] = OrderedDict()
+        self._active: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def enqueue(self, payload: dict, callback_url: str | None = None, lane: str = "bulk") -> dict:
+        with self._lock:
+            if self._active.get(lane, 0) >= self.maxsize:
+                raise QueueFull(f"Job queue full ({self.maxsize} {lane} jobs)")
+            job = _new_job(payload, callback_url, lane)
+            self._jobs[job["id"]] = job
+            self._active[lane] = self._active.get(lane, 0) + 1
+        self._lane_queue(lane).put(job["id"])
+        return dict(job)
+
+    def claim(self, timeout: float = 0.5, lane: str = "bulk") -> dict | None:
+        try:
+            job_id = self._lane_queue(lane).get(timeout=timeout)
+        except queue.Empty:
+            return None
+        with self._lock:
+            job = self._jobs[job_id]
+            job["status"] = "running"
+            job["attempts"] += 1
+            job["updated_at"] = time.time()
+            return dict(job)
+
+    def complete(self, job_id: str, result: dict) -> None:
+        self._finish(job_id, "done", result=result)
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._finish(job_id, "failed", error=error)
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def depth(self, lane: str | None = None) -> int:
+        """Jobs queued or running (in one lane, or all)."""
+        if lane is not None:
+            return self._active.get(lane, 0)
+        return sum(self._active.values())
+
+    def _lane_queue(self, lane: str) -> queue.Queue:
+        with self._lock:
+            return self._queues.setdefault(lane, queue.Queue())
+
+    def _finish(self, job_id: str, status: str, result: dict | None = None, error: str | None = None) -> None:
+        with self._lock:
+            job = self._jobs[job_id]
+            job.update(status=status, result=result, error=error, updated_at=time.time())
+            self._active[job["lane"]] -= 1
+
+            self._finished[job_id] = None
+            if len(self._finished) > FINISHED_RETENTION:
+                oldest_id, _ = self._finished.popitem(last=False)
+                del self._jobs[oldest_id]
+
+
+class SqliteJobQueue:
+    """
+    Durable bounded queue in a single SQLite file (WAL mode).
+    A claimed job holds a lease; jobs left 'running' past their lease by a
+    crashed or restarted process are claimed again.
+    """
+
+    def __init__(self, path: str = "smartcore_jobs.db", maxsize: int = 1000, lease_seconds: float = 60.0):
+        self.path = path
+        self.maxsize = maxsize
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        self._finished_since_purge = 0
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id           TEXT PRIMARY KEY,
+                lane         TEXT NOT NULL DEFAULT 'bulk',
+                status       TEXT NOT NULL,
+                payload      TEXT NOT NULL,
+                callback_url TEXT,
+                result       TEXT,
+                error        TEXT,
+                attempts     INTEGER NOT NULL DEFAULT 0,
+                created_at   REAL NOT NULL,
+                updated_at   REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_lane_status_created ON jobs (lane, status, created_at)")
+
+    def enqueue(self, payload: dict, callback_url: str | None = None, lane: str = "bulk") -> dict:
+        job = _new_job(payload, callback_url, lane)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                (active,) = self._conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE lane = ? AND status IN ('queued', 'running')",
+                    (lane,),
+                ).fetchone()
+                if active >= self.maxsize:
+                    raise QueueFull(f"Job queue full ({self.maxsize} {lane} jobs)")
+                self._conn.execute(
+                    "INSERT INTO jobs (id, lane, status, payload, callback_url, attempts, created_at, updated_at) "
+                    "VALUES (?, ?, 'queued', ?, ?, 0, ?, ?)",
+                    (job["id"], lane, json.dumps(payload), callback_url, job["created_at"], job["updated_at"]),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        with self._wakeup:
+            self._wakeup.notify_all()
+        return job
+
+    def claim(self, timeout: float = 0.5, lane: str = "bulk") -> dict | None:
+        job = self._claim_one(lane)
+        if job is None:
+            # Woken early by a local enqueue; other processes are picked up by polling
+            with self._wakeup:
+                self._wakeup.wait(timeout)
+            job = self._claim_one(lane)
+        return job
+
+    def complete(self, job_id: str, result: dict) -> None:
+        self._finish(job_id, "done", result=json.dumps(result), error=None)
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._finish(job_id, "failed", result=None, error=error)
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def depth(self, lane: str | None = None) -> int:
+        sql = "SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')"
+        params: tuple = ()
+        if lane is not None:
+            sql += " AND lane = ?"
+            params = (lane,)
+        with self._lock:
+            (active,) = self._conn.execute(sql, params).fetchone()
+        return active
+
+    def _claim_one(self, lane: str) -> dict | None:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self._conn.execute(
+                    "SELECT * FROM jobs WHERE lane = ? "
+                    "  AND (status = 'queued' OR (status = 'running' AND updated_at < ?)) "
+                    "ORDER BY created_at LIMIT 1",
+                    (lane, now - self.lease_seconds),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    (now, row[0]),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        job = self._row_to_job(row)
+        job.update(status="running", attempts=job["attempts"] + 1, updated_at=now)
+        return job
+
+    def _finish(self, job_id: str, status: str, result: str | None, error: str | None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status, result, error, time.time(), job_id),
+            )
+            self._finished_since_purge += 1
+            if self._finished_since_purge >= 100:
+                self._finished_since_purge = 0
+                self._conn.execute(
+                    "DELETE FROM jobs WHERE status IN ('done', 'failed') AND id NOT IN ("
+                    "  SELECT id FROM jobs WHERE status IN ('done', 'failed') "
+                    "  ORDER BY updated_at DESC LIMIT ?)",
+                    (FINISHED_RETENTION,),
+                )
+
+    @staticmethod
+    def _row_to_job(row) -> dict:
+        job_id, lane, status, payload, callback_url, result, error, attempts, created_at, updated_at = row
+        return {
+            "id":           job_id,
+            "lane":         lane,
+            "status":       status,
+            "payload":      json.loads(payload),
+            "callback_url": callback_url,
+            "result":       json.loads(result) if result else None,
+            "error":        error,
+            "attempts":     attempts,
+            "created_at":   created_at,
+            "updated_at":   updated_at,
+        }
+
+
+def queue_from_env() -> MemoryJobQueue | SqliteJobQueue:
+    """Builds the queue selected by SMARTCORE_JOB_BACKEND."""
+    maxsize = int(os.environ.get("SMARTCORE_JOB_QUEUE_SIZE", "1000"))
+    if os.environ.get("SMARTCORE_JOB_BACKEND", "memory") == "sqlite":
+        return SqliteJobQueue(
+            os.environ.get("SMARTCORE_JOB_DB", "smartcore_jobs.db"),
+            maxsize,
+            lease_seconds=float(os.environ.get("SMARTCORE_JOB_LEASE_S", "60")),
+        )
+    return MemoryJobQueue(maxsize)
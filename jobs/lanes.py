@@ -0,0 +1,193 @@
+"""
+jobs/lanes.py
+─────────────
+Priority lanes so hot leads never wait behind bulk work.
+
+  hot   — leads score_lead marks Hot / call_now, or whose whatsapp_replied
+          just flipped to true. Own thread pool, never shared.
+  bulk  — everything else: batch scoring, rescoring, dashboard traffic.
+
+Each lane has its own concurrency budget and latency samples (queue wait +
+run time). Endpoints pick the lane with score_for_lane(), which scores the
+lead on a small triage pool of its own — not on the event loop the lanes
+are there to keep free, and not on the hot lane, whose threads are kept
+for work already known to be hot. Because Python threads share one GIL,
+a dedicated pool alone is not enough while a large batch is running, so
+bulk loops call yield_to_hot() between chunks and pause while hot work is
+in flight.
+
+Environment variables (the lane ones size both the lane's request pool
+and its async job workers, see jobs/workers.py):
+  SMARTCORE_HOT_LANE_WORKERS   — default 4
+  SMARTCORE_BULK_LANE_WORKERS  — default 4
+  SMARTCORE_TRIAGE_WORKERS     — threads scoring leads to pick a lane (default 2)
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from metrics.registry import register_gauge
+from models.lead_model import LeadData
+from profiling.profiler import active_profile
+from scoring.score_store import get_lead_state
+from scoring.scoring_engine import score_lead
+
+HOT = "hot"
+BULK = "bulk"
+
+# Longest a bulk loop will pause in one yield_to_hot() call
+MAX_YIELD_SECONDS = 0.05
+
+# Leads a bulk loop should process between yield_to_hot() calls
+BATCH_CHUNK = 32
+
+
+class Lane:
+    def __init__(self, name: str, workers: int, samples: int = 4096):
+        self.name = name
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"lane-{name}")
+        self._latencies_ms: deque[float] = deque(maxlen=samples)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        enqueued_at = time.time()
+        with self._lock:
+            self.in_flight += 1
+        # Carry the caller's context (current trace span, active profile) into the pool
+        context = contextvars.copy_context()
+
+        def run():
+            with self.track(enqueued_at, counted=True):
+                return _call_in(context, fn, *args, **kwargs)
+
+        return self._executor.submit(run)
+
+    @contextmanager
+    def track(self, enqueued_at: float, counted: bool = False):
+        """
+        Marks work as in flight on this lane and records its latency from
+        enqueued_at (wall-clock seconds) — used by job workers too.
+        """
+        if not counted:
+            with self._lock:
+                self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.observe((time.time() - enqueued_at) * 1000)
+            with self._lock:
+                self.in_flight -= 1
+
+    def observe(self, latency_ms: float) -> None:
+        with self._lock:
+            self._latencies_ms.append(latency_ms)
+            self.completed += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            samples = sorted(self._latencies_ms)
+            completed, in_flight = self.completed, self.in_flight
+
+        def pct(p: float) -> float | None:
+            if not samples:
+                return None
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))], 3)
+
+        return {
+            "workers":   self.workers,
+            "in_flight": in_flight,
+            "completed": completed,
+            "p50_ms":    pct(0.50),
+            "p95_ms":    pct(0.95),
+            "p99_ms":    pct(0.99),
+            "max_ms":    round(samples[-1], 3) if samples else None,
+        }
+
+
+def _call_in(context: contextvars.Context, fn, *args, **kwargs):
+    session = context.get(active_profile)
+    if session is not None:
+        return context.run(session.run, fn, *args, **kwargs)
+    return context.run(fn, *args, **kwargs)
+
+
+LANES = {
+    HOT:  Lane(HOT, int(os.environ.get("SMARTCORE_HOT_LANE_WORKERS", "4"))),
+    BULK: Lane(BULK, int(os.environ.get("SMARTCORE_BULK_LANE_WORKERS", "4"))),
+}
+
+
+# Scoring plus one score_store read per lead, for score_for_lane()
+_TRIAGE_POOL = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("SMARTCORE_TRIAGE_WORKERS", "2")), thread_name_prefix="lane-triage",
+)
+
+
+register_gauge(
+    "smartcore_lane_in_flight", "Work submitted to or running on each priority lane.",
+    lambda: {(name,): lane.in_flight for name, lane in LANES.items()}, ("lane",),
+)
+
+
+def lane_for(lead: LeadData, scoring_result: dict) -> str:
+    """Picks the lane for a scored lead."""
+    if scoring_result.get("intent_level") == "Hot" or scoring_result.get("call_decision") == "call_now":
+        return HOT
+
+    if lead.whatsapp_replied and lead.lead_id:
+        previous = get_lead_state(lead.lead_id)
+        if previous is not None and not previous["lead"].get("whatsapp_replied"):
+            return HOT
+
+    return BULK
+
+
+def _triage(lead: LeadData) -> tuple[str, dict, float]:
+    started = time.perf_counter()
+    scoring = score_lead(lead)
+    score_ms = round((time.perf_counter() - started) * 1000, 4)
+    return lane_for(lead, scoring), scoring, score_ms
+
+
+async def score_for_lane(lead: LeadData) -> tuple[str, dict, float]:
+    """
+    Scores a lead off the event loop and picks its lane; returns
+    (lane, scoring, score_ms). Runs on the triage pool, so a hot lead is
+    never queued behind bulk work just to be recognised, and unclassified
+    leads never hold up work already on the hot lane.
+    """
+    future = _TRIAGE_POOL.submit(_call_in, contextvars.copy_context(), _triage, lead)
+    return await asyncio.wrap_future(future)
+
+
+async def run_in_lane(lane: str, fn, *args, **kwargs):
+    """Runs a blocking function on the given lane's pool and awaits it."""
+    return await asyncio.wrap_future(LANES[lane].submit(fn, *args, **kwargs))
+
+
+def yield_to_hot() -> None:
+    """
+    Called by bulk loops between chunks: pauses (bounded) while hot-lane
+    work is in flight so it gets the GIL.
+    """
+    # Always drop the GIL once, so a hot thread waiting on it gets in
+    # without waiting out the interpreter switch interval
+    time.sleep(0)
+
+    hot = LANES[HOT]
+    deadline = time.perf_counter() + MAX_YIELD_SECONDS
+    while hot.in_flight and time.perf_counter() < deadline:
+        time.sleep(0.0005)
+
+
+def lane_stats() -> dict:
+    return {name: lane.stats() for name, lane in LANES.items()}
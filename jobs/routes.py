@@ -0,0 +1,120 @@
+"""
+jobs/routes.py
+──────────────
+Accept-and-enqueue mode for /cadence/run, plus job status lookups.
+
+  POST /cadence/run?mode=async  → validates, enqueues, returns 202 + job id
+                                  (429 with Retry-After when the queue is full)
+  GET  /jobs/{job_id}           → job status and, once done, the result
+  GET  /jobs                    → queue depth and worker count per lane
+  GET  /jobs/lanes              → latency percentiles per priority lane
+
+Results are also POSTed to the payload's callback_url when one is given.
+The queue backend is chosen by SMARTCORE_JOB_BACKEND (see jobs/job_queue.py).
+Hot leads are enqueued on the hot lane and served by their own workers.
+"""
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+
+from jobs.job_queue import QueueFull, queue_from_env
+from jobs.lanes import BULK, HOT, lane_stats, score_for_lane
+from jobs.workers import JobWorkerPool
+from metrics.registry import register_gauge
+from models.lead_model import LeadData
+from profiling.profiler import ProfiledRoute
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"], route_class=ProfiledRoute)
+
+# ── Process-wide queue + workers (created on first use) ────────────────────
+_job_queue = None
+_worker_pools: dict[str, JobWorkerPool] = {}
+
+
+def get_job_queue():
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = queue_from_env()
+    return _job_queue
+
+
+def _queue_depths() -> dict:
+    if _job_queue is None:
+        return {}
+    return {(lane,): _job_queue.depth(lane) for lane in (HOT, BULK)}
+
+
+register_gauge("smartcore_job_queue_depth", "Jobs queued or running per lane.", _queue_depths, ("lane",))
+
+
+def start_workers() -> None:
+    for lane in (HOT, BULK):
+        if lane not in _worker_pools:
+            _worker_pools[lane] = JobWorkerPool(get_job_queue(), lane=lane)
+        _worker_pools[lane].start()
+
+
+def stop_workers() -> None:
+    for pool in _worker_pools.values():
+        pool.stop()
+
+
+async def enqueue_cadence_run(payload: dict, callback_url: str | None = None) -> JSONResponse:
+    """
+    Enqueues an already-validated /cadence/run body; returns 202 or 429.
+    The lead is scored here to pick its lane; workers reuse that score.
+    """
+    lead = LeadData.model_validate(payload["lead"])
+    lane, scoring, score_ms = await score_for_lane(lead)
+
+    try:
+        job = get_job_queue().enqueue({**payload, "scoring": scoring, "score_ms": score_ms}, callback_url, lane=lane)
+    except QueueFull as e:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": str(e)},
+            headers={"Retry-After": "1"},
+        )
+
+    return JSONResponse(
+        status_code=202,
+        content={
+            "job_id":     job["id"],
+            "status":     job["status"],
+            "lane":       lane,
+            "status_url": f"/jobs/{job['id']}",
+        },
+    )
+
+
+@router.get("")
+def job_queue_stats():
+    job_queue = get_job_queue()
+    return {
+        lane: {
+            "depth":    job_queue.depth(lane),
+            "capacity": job_queue.maxsize,
+            "workers":  _worker_pools[lane].workers if lane in _worker_pools else 0,
+        }
+        for lane in (HOT, BULK)
+    }
+
+
+@router.get("/lanes")
+def job_lane_stats():
+    return lane_stats()
+
+
+@router.get("/{job_id}")
+def job_status(job_id: str):
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job id: {job_id}")
+    return {
+        "job_id":   job["id"],
+        "lane":     job["lane"],
+        "status":   job["status"],
+        "result":   job["result"],
+        "error":    job["error"],
+        "attempts": job["attempts"],
+    }
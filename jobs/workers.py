@@ -0,0 +1,158 @@
+"""
+jobs/workers.py
+───────────────
+Worker pool that drains a job queue and delivers results.
+
+Each job payload is a /cadence/run body. One pool runs per lane (hot /
+bulk, see jobs/lanes.py) and only claims that lane's jobs. Workers run
+the same chain as the sync endpoint (score → cadence decision → agent
+action) through the decision pipeline, store the result on the job and,
+if the job has a callback_url, POST {"job_id", "status", "result" |
+"error"} to it with a few retries.
+
+Callback URLs must be http(s). With SMARTCORE_CALLBACK_ALLOWED_HOSTS set,
+only those hosts are accepted; without it, any host that resolves to a
+private, loopback, link-local or otherwise non-public address is refused
+(so a caller cannot aim job results at internal services or cloud
+metadata). check_callback_url() runs at enqueue time (422) and again
+before each delivery, in case the name resolves differently by then.
+
+Each pool has as many threads as its lane (SMARTCORE_HOT_LANE_WORKERS /
+SMARTCORE_BULK_LANE_WORKERS, see jobs/lanes.py).
+
+Environment variables:
+  SMARTCORE_JOB_CALLBACK_RETRIES  — callback attempts, default 3
+  SMARTCORE_CALLBACK_ALLOWED_HOSTS — comma-separated callback hosts; unset =
+                                    any public host
+"""
+
+import ipaddress
+import logging
+import os
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+
+from dispatch.dispatcher import get_dispatcher
+from jobs.lanes import BULK, LANES
+from pipeline.decision_pipeline import PipelineItem, resolve_stages, run_pipeline
+
+logger = logging.getLogger(__name__)
+
+_CADENCE_RUN_STAGES = resolve_stages(["cadence", "action"])
+
+
+def run_cadence_job(payload: dict) -> dict:
+    """
+    Runs a /cadence/run payload; returns the same shape as the sync endpoint.
+    The "scoring" (computed at enqueue time to pick the lane) and its
+    "score_ms" are reused;
+    with "dispatch" set, the action is queued for its send window.
+    """
+    item = PipelineItem.model_validate(payload)
+    result = run_pipeline(item, _CADENCE_RUN_STAGES, scoring=payload.get("scoring"), score_ms=payload.get("score_ms"))
+    output = {
+        "scoring":          result["scoring"],
+        "cadence_decision": result["cadence_decision"],
+        "agent_action":     result["agent_action"],
+    }
+    if payload.get("dispatch"):
+        output["dispatch"] = get_dispatcher().enqueue(item.lead, result["agent_action"])
+    return output
+
+
+CALLBACK_ALLOWED_HOSTS = {
+    h.strip().lower() for h in os.environ.get("SMARTCORE_CALLBACK_ALLOWED_HOSTS", "").split(",") if h.strip()
+}
+
+
+def check_callback_url(url: str) -> None:
+    """Raises ValueError unless url is an acceptable job callback target (may resolve DNS)."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError("callback_url must be an http(s) URL")
+    host = parts.hostname.lower()
+    if CALLBACK_ALLOWED_HOSTS:
+        if host not in CALLBACK_ALLOWED_HOSTS:
+            raise ValueError(f"callback host {host} is not in SMARTCORE_CALLBACK_ALLOWED_HOSTS")
+        return
+    try:
+        infos = socket.getaddrinfo(host, parts.port or 443, proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError) as e:
+        raise ValueError(f"callback host {host} does not resolve") from e
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%")[0])
+        if not address.is_global:
+            raise ValueError(f"callback host {host} resolves to a non-public address")
+
+
+def deliver_callback(url: str, body: dict, attempts: int = 3) -> bool:
+    """POSTs a job result to its callback URL, retrying with backoff."""
+    import httpx  # deferred to the first callback; keeps it off the startup path
+
+    try:
+        check_callback_url(url)
+    except ValueError as e:
+        logger.warning("Job callback to %s refused: %s", url, e)
+        return False
+
+    for attempt in range(1, attempts + 1):
+        try:
+            response = httpx.post(url, json=body, timeout=10.0)
+            if response.status_code < 500:
+                return response.is_success
+        except httpx.HTTPError as e:
+            logger.warning("Job callback to %s failed (attempt %d): %s", url, attempt, e)
+        if attempt < attempts:
+            time.sleep(0.5 * 2 ** (attempt - 1))
+    return False
+
+
+class JobWorkerPool:
+    """Fixed pool of daemon threads pulling one lane of a job queue."""
+
+    def __init__(self, job_queue, lane: str = BULK, handler=run_cadence_job, workers: int | None = None):
+        self.queue = job_queue
+        self.lane = lane
+        self.handler = handler
+        self.workers = workers or LANES[lane].workers
+        self.callback_attempts = int(os.environ.get("SMARTCORE_JOB_CALLBACK_RETRIES", "3"))
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        for n in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"smartcore-job-{self.lane}-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            job = self.queue.claim(timeout=0.5, lane=self.lane)
+            if job is not None:
+                with LANES[self.lane].track(job["created_at"]):
+                    self._process(job)
+
+    def _process(self, job: dict) -> None:
+        try:
+            result = self.handler(job["payload"])
+        except Exception as e:
+            logger.exception("Job %s failed", job["id"])
+            self.queue.fail(job["id"], str(e))
+            body = {"job_id": job["id"], "status": "failed", "error": str(e)}
+        else:
+            self.queue.complete(job["id"], result)
+            body = {"job_id": job["id"], "status": "done", "result": result}
+
+        if job.get("callback_url"):
+            deliver_callback(job["callback_url"], body, self.callback_attempts)
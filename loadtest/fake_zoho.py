@@ -0,0 +1,174 @@
+"""
+loadtest/fake_zoho.py
+─────────────────────
+Local stand-in for Zoho OAuth + CRM with configurable latency and faults,
+so load tests never touch the real CRM (or its API credit limits).
+
+  python -m loadtest.fake_zoho --port 8790 --latency-ms 120 --jitter-ms 60 \\
+      --error-rate 0.01 --rate-limit-rate 0.02
+
+Point SmartCore at it with:
+  ZOHO_ACCOUNTS_URL=http://127.0.0.1:8790/oauth/v2/token
+  ZOHO_CRM_BASE=http://127.0.0.1:8790/crm/v7
+  (ZOHO_CLIENT_ID / ZOHO_CLIENT_SECRET / ZOHO_REFRESH_TOKEN: any value)
+
+Implements: POST /oauth/v2/token, GET /crm/v7/Leads (paged, cvid, ids),
+GET /crm/v7/Leads/views, POST /crm/v7/actions/watch.
+Faults apply to CRM and token calls alike: --error-rate answers 500,
+--rate-limit-rate answers 429 with Retry-After.
+
+Control endpoints:
+  GET  /__stats   → calls per endpoint and status since start / last reset
+  POST /__reset   → zero the counters
+"""
+
+import argparse
+import asyncio
+import random
+import uuid
+from collections import Counter
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from bench.synthetic import make_lead_dicts
+
+VIEWS = [
+    {"id": "5000000000001", "display_value": "Sales360_Brokerage_Pilot"},
+    {"id": "5000000000002", "display_value": "All Open Leads"},
+]
+
+
+class FakeZoho:
+    def __init__(self, latency_ms: float, jitter_ms: float, error_rate: float,
+                 rate_limit_rate: float, token_ttl: int, leads: int, seed: int):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.token_ttl = token_ttl
+        self.calls: Counter = Counter()
+        self.rng = random.Random(seed)
+        self.records = [_record(d) for d in make_lead_dicts(leads, seed)]
+        self.by_id = {r["id"]: r for r in self.records}
+
+    async def respond(self, endpoint: str, build) -> Response:
+        delay = max(0.0, self.rng.gauss(self.latency_ms, self.jitter_ms)) / 1000
+        await asyncio.sleep(delay)
+
+        roll = self.rng.random()
+        if roll < self.rate_limit_rate:
+            response = JSONResponse({"code": "TOO_MANY_REQUESTS"}, status_code=429, headers={"Retry-After": "1"})
+        elif roll < self.rate_limit_rate + self.error_rate:
+            response = JSONResponse({"code": "INTERNAL_ERROR"}, status_code=500)
+        else:
+            response = build()
+        self.calls[f"{endpoint} {response.status_code}"] += 1
+        return response
+
+    # ── Zoho endpoints ──────────────────────────────────────────────────────
+    async def token(self, request: Request) -> Response:
+        return await self.respond("token", lambda: JSONResponse({
+            "access_token": f"fake-{uuid.uuid4().hex}",
+            "expires_in":   self.token_ttl,
+            "token_type":   "Bearer",
+        }))
+
+    async def leads(self, request: Request) -> Response:
+        params = request.query_params
+
+        def build() -> Response:
+            if "ids" in params:
+                data = [self.by_id[i] for i in params["ids"].split(",") if i in self.by_id]
+                return JSONResponse({"data": data}) if data else Response(status_code=204)
+            page = int(params.get("page", 1))
+            per_page = min(int(params.get("per_page", 50)), 200)
+            records = self.records[::2] if params.get("cvid") == VIEWS[0]["id"] else self.records
+            chunk = records[(page - 1) * per_page: page * per_page]
+            if not chunk:
+                return Response(status_code=204)
+            if "fields" in params:  # Zoho returns id plus the requested fields only
+                keep = {"id", *params["fields"].split(",")}
+                chunk = [{k: v for k, v in r.items() if k in keep} for r in chunk]
+            return JSONResponse({
+                "data": chunk,
+                "info": {"count": len(chunk), "page": page, "per_page": per_page,
+                         "more_records": page * per_page < len(records)},
+            })
+
+        return await self.respond("leads", build)
+
+    async def views(self, request: Request) -> Response:
+        return await self.respond("views", lambda: JSONResponse({"views": VIEWS}))
+
+    async def watch(self, request: Request) -> Response:
+        return await self.respond("watch", lambda: JSONResponse({"watch": [{"code": "SUCCESS"}]}))
+
+    # ── Control ─────────────────────────────────────────────────────────────
+    async def stats(self, request: Request) -> Response:
+        return JSONResponse(dict(self.calls))
+
+    async def reset(self, request: Request) -> Response:
+        self.calls.clear()
+        return JSONResponse({"reset": True})
+
+    def app(self) -> Starlette:
+        return Starlette(routes=[
+            Route("/oauth/v2/token", self.token, methods=["POST"]),
+            Route("/crm/v7/Leads", self.leads, methods=["GET"]),
+            Route("/crm/v7/Leads/views", self.views, methods=["GET"]),
+            Route("/crm/v7/actions/watch", self.watch, methods=["POST"]),
+            Route("/__stats", self.stats, methods=["GET"]),
+            Route("/__reset", self.reset, methods=["POST"]),
+        ])
+
+
+def _record(lead: dict) -> dict:
+    first, _, last = (lead["full_name"] or "").partition(" ")
+    return {
+        "id":                  lead["lead_id"],
+        "First_Name":          first,
+        "Last_Name":           last,
+        "Full_Name":           lead["full_name"],
+        "Company":             lead["company"],
+        "Email":               lead["email"],
+        "Phone":               lead["phone"],
+        "Designation":         lead["title"],
+        "Country":             lead["country_region"],
+        "Lead_Source":         lead["lead_source"],
+        "Lead_Status":         "New",
+        "Industry_Type":       lead["industry_type"],
+        "Business_Size":       lead["business_size"],
+        "Monthly_Leads_No":    lead["monthly_lead_volume"],
+        "Budget_Readiness":    lead["budget_readiness"],
+        "Decision_Level":      lead["decision_level"],
+        "Current_Challenges":  lead["current_challenges"],
+        "Interested_Services": ",".join(lead["interested_services"]),
+        "Created_Time":        "2026-01-01T09:00:00+00:00",
+        "Modified_Time":       "2026-01-02T09:00:00+00:00",
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Zoho OAuth/CRM stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--latency-ms", type=float, default=120.0)
+    parser.add_argument("--jitter-ms", type=float, default=40.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls answered 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of calls answered 429")
+    parser.add_argument("--token-ttl", type=int, default=3600)
+    parser.add_argument("--leads", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    fake = FakeZoho(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit_rate,
+                    args.token_ttl, args.leads, args.seed)
+    uvicorn.run(fake.app(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
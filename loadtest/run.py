@@ -0,0 +1,278 @@
+"""
+loadtest/run.py
+───────────────
+End-to-end load test: SmartCore under uvicorn (N workers) against the local
+Zoho stand-in, driven with the traffic shapes production actually sees.
+
+  python -m loadtest.run                                   # all scenarios, 30s each
+  python -m loadtest.run --workers 4 --duration 60 --scenarios mixed
+  python -m loadtest.run --zoho-latency-ms 300 --zoho-rate-limit-rate 0.05 --out lt.json
+  python -m loadtest.run --target http://127.0.0.1:8000 --zoho http://127.0.0.1:8790
+                                                           # against servers you started
+
+Scenarios (open loop — requests are sent on schedule whether or not earlier
+ones have answered, so a slow server shows up as latency, not lower load):
+  call_service_burst  bursts of /cadence/run, as the Node call service fires
+                      after a dialling session
+  dashboard_polling   steady GET /zoho/leads, pilot view and all leads, a few pages
+  next_action         steady POST /next_action
+  mixed               all of the above at once
+
+Per scenario and endpoint it reports requests, achieved rps, p50/p95/p99
+latency and error rate, plus the Zoho calls each scenario caused (from the
+stand-in's /__stats), which is what the token / view caches should keep low.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+from bench.synthetic import make_lead_dicts
+
+APP_PORT = 8791
+ZOHO_PORT = 8790
+SCENARIOS = ["call_service_burst", "dashboard_polling", "next_action", "mixed"]
+LAST_AGENTS = [None, "intake_agent", "nurture_agent", "ai_call_agent"]
+OUTCOMES = [None, "no_answer", "booked", "not_interested", "call_completed"]
+VIEWS = [None, "Sales360_Brokerage_Pilot"]
+
+
+# ── Traffic ────────────────────────────────────────────────────────────────
+class Traffic:
+    """Request builders over a fixed pool of synthetic leads."""
+
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        self.leads = make_lead_dicts(2000, seed)
+
+    def cadence_run(self) -> tuple[str, str, str, dict | None]:
+        body = {
+            "lead":               self.rng.choice(self.leads),
+            "last_agent":         self.rng.choice(LAST_AGENTS),
+            "days_inactive":      self.rng.randint(0, 30),
+            "last_outcome":       self.rng.choice(OUTCOMES),
+            "last_touch_channel": self.rng.choice(["whatsapp", "email", "call"]),
+        }
+        return "/cadence/run", "POST", "/cadence/run", body
+
+    def zoho_leads(self) -> tuple[str, str, str, dict | None]:
+        view = self.rng.choice(VIEWS)
+        url = f"/zoho/leads?page={self.rng.randint(1, 3)}&per_page=50"
+        if view:
+            url += f"&view={view}"
+        return "/zoho/leads", "GET", url, None
+
+    def next_action(self) -> tuple[str, str, str, dict | None]:
+        return "/next_action", "POST", "/next_action", self.rng.choice(self.leads)
+
+
+def _schedules(name: str, traffic: Traffic, rate: float, burst_size: int, burst_every: float) -> list:
+    """(builder, interval_s, batch) tuples; each fires `batch` requests every interval."""
+    bursts = (traffic.cadence_run, burst_every, burst_size)
+    polling = (traffic.zoho_leads, 1 / max(rate / 4, 0.1), 1)
+    steady = (traffic.next_action, 1 / rate, 1)
+    return {
+        "call_service_burst": [bursts],
+        "dashboard_polling":  [(traffic.zoho_leads, 1 / rate, 1)],
+        "next_action":        [steady],
+        "mixed":              [bursts, polling, steady],
+    }[name]
+
+
+# ── Driver ─────────────────────────────────────────────────────────────────
+async def _fire(client: httpx.AsyncClient, request: tuple, samples: dict) -> None:
+    endpoint, method, url, body = request
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, url, json=body)
+        ok = response.status_code < 400
+        status = response.status_code
+    except httpx.HTTPError as e:
+        ok, status = False, type(e).__name__
+    samples[endpoint].append(((time.perf_counter() - started) * 1000, ok, status))
+
+
+async def _drive(client: httpx.AsyncClient, builder, interval: float, batch: int,
+                 duration: float, samples: dict, tasks: set) -> None:
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    tick = 0
+    while (due := start + tick * interval) < start + duration:
+        await asyncio.sleep(max(0.0, due - loop.time()))
+        for _ in range(batch):
+            task = asyncio.create_task(_fire(client, builder(), samples))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        tick += 1
+
+
+async def run_scenario(name: str, target: str, zoho: str, args) -> dict:
+    traffic = Traffic(args.seed)
+    samples: dict[str, list] = defaultdict(list)
+    tasks: set = set()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=target, timeout=args.timeout, limits=limits) as client:
+        await client.post(f"{zoho}/__reset")
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            _drive(client, builder, interval, batch, args.duration, samples, tasks)
+            for builder, interval, batch in _schedules(name, traffic, args.rate, args.burst_size, args.burst_every)
+        ))
+        if tasks:
+            await asyncio.wait(set(tasks))
+        elapsed = time.perf_counter() - started
+        upstream = (await client.get(f"{zoho}/__stats")).json()
+
+    return {
+        "scenario":  name,
+        "elapsed_s": round(elapsed, 2),
+        "endpoints": {endpoint: _summarise(rows, elapsed) for endpoint, rows in sorted(samples.items())},
+        "upstream":  dict(sorted(upstream.items())),
+    }
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _summarise(rows: list, elapsed: float) -> dict:
+    latencies = sorted(ms for ms, _, _ in rows)
+    errors = defaultdict(int)
+    for _, ok, status in rows:
+        if not ok:
+            errors[str(status)] += 1
+    return {
+        "requests":   len(rows),
+        "rps":        round(len(rows) / elapsed, 1),
+        "p50_ms":     round(_percentile(latencies, 50), 1),
+        "p95_ms":     round(_percentile(latencies, 95), 1),
+        "p99_ms":     round(_percentile(latencies, 99), 1),
+        "error_rate": round(sum(errors.values()) / len(rows), 4) if rows else 0.0,
+        "errors":     dict(errors),
+    }
+
+
+# ── Servers ────────────────────────────────────────────────────────────────
+def _start_zoho(args) -> subprocess.Popen:
+    return subprocess.Popen([
+        sys.executable, "-m", "loadtest.fake_zoho",
+        "--port", str(args.zoho_port),
+        "--latency-ms", str(args.zoho_latency_ms),
+        "--jitter-ms", str(args.zoho_jitter_ms),
+        "--error-rate", str(args.zoho_error_rate),
+        "--rate-limit-rate", str(args.zoho_rate_limit_rate),
+    ])
+
+
+def _start_app(args, zoho: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "ZOHO_ACCOUNTS_URL":      f"{zoho}/oauth/v2/token",
+        "ZOHO_CRM_BASE":          f"{zoho}/crm/v7",
+        "ZOHO_CLIENT_ID":         "loadtest",
+        "ZOHO_CLIENT_SECRET":     "loadtest",
+        "ZOHO_REFRESH_TOKEN":     "loadtest",
+        # Workers share one token / view cache, as in production
+        "SMARTCORE_STATE_BACKEND": os.environ.get("SMARTCORE_STATE_BACKEND", "sqlite"),
+    }
+    return subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--port", str(args.app_port),
+        "--workers", str(args.workers),
+        "--log-level", "warning",
+        "--no-access-log",
+    ], env=env)
+
+
+def _wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {timeout:.0f}s")
+
+
+# ── Report ─────────────────────────────────────────────────────────────────
+def _print_report(result: dict) -> None:
+    print(f"\n== {result['scenario']}  ({result['elapsed_s']}s)")
+    print(f"  {'endpoint':<16}{'requests':>9}{'rps':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>9}")
+    for endpoint, s in result["endpoints"].items():
+        print(f"  {endpoint:<16}{s['requests']:>9}{s['rps']:>8.1f}{s['p50_ms']:>9.1f}{s['p95_ms']:>9.1f}"
+              f"{s['p99_ms']:>9.1f}{s['error_rate']:>8.1%}")
+        if s["errors"]:
+            print(f"  {'':<16}{s['errors']}")
+    upstream = ", ".join(f"{k}={v}" for k, v in result["upstream"].items()) or "none"
+    print(f"  zoho calls: {upstream}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SmartCore end-to-end load test.")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per scenario")
+    parser.add_argument("--rate", type=float, default=50.0, help="Steady requests/s per stream")
+    parser.add_argument("--burst-size", type=int, default=40, help="/cadence/run calls per burst")
+    parser.add_argument("--burst-every", type=float, default=2.0, help="Seconds between bursts")
+    parser.add_argument("--concurrency", type=int, default=200, help="Max open client connections")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--workers", type=int, default=2, help="uvicorn workers")
+    parser.add_argument("--app-port", type=int, default=APP_PORT)
+    parser.add_argument("--zoho-port", type=int, default=ZOHO_PORT)
+    parser.add_argument("--zoho-latency-ms", type=float, default=120.0)
+    parser.add_argument("--zoho-jitter-ms", type=float, default=40.0)
+    parser.add_argument("--zoho-error-rate", type=float, default=0.0)
+    parser.add_argument("--zoho-rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--target", help="Use an already running SmartCore instead of starting one")
+    parser.add_argument("--zoho", help="Use an already running stand-in instead of starting one")
+    parser.add_argument("--out", help="Write results JSON here")
+    args = parser.parse_args()
+
+    zoho = args.zoho or f"http://127.0.0.1:{args.zoho_port}"
+    target = args.target or f"http://127.0.0.1:{args.app_port}"
+    procs = []
+    try:
+        if not args.zoho:
+            procs.append(_start_zoho(args))
+        _wait_ready(f"{zoho}/__stats")
+        if not args.target:
+            procs.append(_start_app(args, zoho))
+        _wait_ready(f"{target}/")
+
+        results = []
+        for name in args.scenarios:
+            result = asyncio.run(run_scenario(name, target, zoho, args))
+            _print_report(result)
+            results.append(result)
+    finally:
+        for proc in reversed(procs):
+            proc.terminate()
+        for proc in procs:
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+        print(f"\nSaved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
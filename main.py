@@ -1,10 +1,43 @@
-from fastapi import FastAPI
+import asyncio
+import hashlib
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
 from models.lead_model import LeadData
+from models.codec import FastJSONResponse, decode_leads
 from scoring.scoring_engine import score_lead
+from scoring.score_store import record_scoring
 from agents.routing_engine import route_lead
-from zoho.routes import router as zoho_router
+from pipeline.routes import router as pipeline_router
+from jobs.routes import router as jobs_router, enqueue_cadence_run, start_workers, stop_workers
+from jobs.workers import check_callback_url
+from indexes.identity_index import dedup_leads
+from indexes.routes import router as indexes_router
+from compression.middleware import CompressionMiddleware
+from metrics.middleware import MetricsMiddleware
+from metrics.routes import router as metrics_router
+from profiling.profiler import ProfiledRoute
+from profiling.routes import router as profiling_router
+from resilience.admission import AdmissionMiddleware
+from resilience.idempotency import idempotency_key, idempotent
+from tracing.middleware import TracingMiddleware
+from tracing.tracer import flush as flush_spans
+from indexes.segment_aggregates import reconcile_periodically
+from startup.lazy import include_router
+from state import snapshots
+from archive.store import flush_archive, flush_periodically as flush_archive_periodically
+from dispatch.dispatcher import close_dispatcher, release_periodically as release_dispatch_periodically
+from dispatch.routes import dispatch_action, router as dispatch_router
+from security.admin_key import require_admin_key
+from realtime.publisher import start_publisher, stop_publisher
+from realtime.routes import router as realtime_router
+from startup.warmup import warm_up
+from jobs.lanes import BULK, BATCH_CHUNK, run_in_lane, score_for_lane, yield_to_hot
 from agents.agent_behaviors import generate_agent_action
 from agents.agent_behaviors import (
     generate_agent_action,
@@ -12,6 +45,7 @@ from agents.agent_behaviors import (
     post_call_followup_agent_message,
     reengagement_agent_message,
 )
+from agents.objection_agent import generate_objection_response
 from cadence.cadence_engine import decide_next_agent
 from cadence.cadence_runner import run_cadence_action
 
@@ -44,15 +78,59 @@ class CadenceRunPayload(BaseModel):
     days_inactive: int = 0
     last_outcome: str | None = None
     last_touch_channel: str | None = None
-
+    callback_url: str | None = None  # async mode only: where to POST the result (see jobs/workers.py)
+
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm restart: caches and indexes come back from the last snapshot
+    if snapshots.ENABLED:
+        snapshots.restore_snapshot()
+    start_workers()
+    start_publisher()
+    reconciler = asyncio.create_task(reconcile_periodically())
+    warmup = asyncio.create_task(warm_up(app))
+    archiver = asyncio.create_task(flush_archive_periodically())
+    dispatcher = asyncio.create_task(release_dispatch_periodically())
+    snapshotter = None
+    if snapshots.ENABLED and snapshots.SNAPSHOT_INTERVAL_SECONDS > 0:
+        snapshotter = asyncio.create_task(snapshots.snapshot_periodically())
+    yield
+    warmup.cancel()
+    reconciler.cancel()
+    archiver.cancel()
+    dispatcher.cancel()
+    if snapshotter is not None:
+        snapshotter.cancel()
+    stop_workers()
+    stop_publisher()
+    flush_archive()
+    await close_dispatcher()
+    if snapshots.ENABLED:
+        snapshots.save_snapshot()
+    flush_spans()
 
 
 app = FastAPI(
     title="Sales360 Smart Core",
     description="AI scoring and routing engine for Sales360",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=(
+        FastJSONResponse if os.environ.get("SMARTCORE_FAST_JSON") == "1" else JSONResponse
+    ),
 )
 
+# Endpoints below can be profiled per request (see profiling/profiler.py)
+app.router.route_class = ProfiledRoute
+
+# ── Response compression — gzip / br for large JSON (lead lists, archive) ──
+app.add_middleware(CompressionMiddleware)
+
+# ── Admission control — per-route concurrency limits, fast 503 when full ──
+app.add_middleware(AdmissionMiddleware)
+
 # ── CORS — allows the dashboard to call SmartCore from the browser ─────────
 app.add_middleware(
     CORSMiddleware,
@@ -62,8 +140,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# ── Zoho CRM router ───────────────────────────────────────────────────────
-app.include_router(zoho_router)
+# ── Request latency histograms (served on /metrics) ──────────────────────
+app.add_middleware(MetricsMiddleware)
+
+# ── Trace context (traceparent in, spans out — see tracing/tracer.py) ─────
+app.add_middleware(TracingMiddleware)
+
+# ── Zoho CRM router (deferred with SMARTCORE_LAZY_STARTUP=1) ──────────────
+include_router(app, "zoho.routes:router", prefix="/zoho")
+
+# ── Decision pipeline router ─────────────────────────────────────────────
+app.include_router(pipeline_router)
+
+# ── Async job status router ───────────────────────────────────────────────
+app.include_router(jobs_router)
+
+# ── Lead index router (top-N hot leads, segment stats) ──────────────────────
+app.include_router(indexes_router)
+
+# ── Lead archive router (analytics over every archived scoring; numpy,
+#    so deferred with SMARTCORE_LAZY_STARTUP=1) ──────────────────────────────
+include_router(app, "archive.routes:router", prefix="/archive")
+
+# ── Outbound dispatch router (send-window batching) ───────────────────────
+app.include_router(dispatch_router)
+
+# ── Realtime publisher status (pushes to the websocket service) ──────────
+app.include_router(realtime_router)
+
+# ── Prometheus metrics router ─────────────────────────────────────────────
+app.include_router(metrics_router)
+
+# ── Request profiles router ───────────────────────────────────────────────
+app.include_router(profiling_router)
 
 
 @app.get("/")
@@ -71,12 +180,66 @@ def health_check():
     return {"status": "ok", "message": "Sales360 Smart Core is running"}
 
 
+_ENGINE_QUERY = Query(
+    default=None, pattern="^(rules|learned)$",
+    description="Scoring engine: 'rules' (default) or 'learned' (see scoring/learned_engine.py)",
+)
+
+
+def _score_leads(leads: list[LeadData], engine: str | None) -> list[dict]:
+    """Scores with the requested engine; numpy is only imported for 'learned'."""
+    if (engine or os.environ.get("SMARTCORE_SCORING_ENGINE", "rules")) == "rules":
+        return [score_lead(lead) for lead in leads]
+    from scoring.learned_engine import ModelUnavailable, score_leads
+    try:
+        return score_leads(leads, "learned")
+    except ModelUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
 @app.post("/score_lead")
-def score_lead_endpoint(lead: LeadData):
-    result = score_lead(lead)
+def score_lead_endpoint(lead: LeadData, engine: str = _ENGINE_QUERY):
+    result = _score_leads([lead], engine)[0]
+    if lead.lead_id:
+        record_scoring(lead.lead_id, lead, result, source="score_lead")
     return result
 
 
+@app.post("/batch/score_leads", response_class=FastJSONResponse)
+async def batch_score_leads(request: Request, dedup: bool = Query(default=False), engine: str = _ENGINE_QUERY):
+    """
+    Scores a JSON list of leads (or {"leads": [...]}) in one call.
+    Uses the prebuilt list validator and orjson instead of the default
+    per-model body validation and JSON encoder.
+    With ?dedup=true, copies of the same person are merged first and each
+    result lists the input positions it covers.
+    With ?engine=learned, each chunk is scored in one vectorised pass.
+    """
+    body = await request.body()
+    try:
+        leads = decode_leads(body)
+    except (ValidationError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    if not dedup:
+        results = await run_in_lane(BULK, _score_batch, leads, engine)
+        return FastJSONResponse({"count": len(results), "results": results})
+
+    unique, groups, stats = dedup_leads(leads)
+    results = await run_in_lane(BULK, _score_batch, unique, engine)
+    for result, group in zip(results, groups):
+        result["merged_from"] = group
+    return FastJSONResponse({"count": len(results), "results": results, "dedup": stats})
+
+
+def _score_batch(leads: list[LeadData], engine: str | None = None) -> list[dict]:
+    results = []
+    for start in range(0, len(leads), BATCH_CHUNK):
+        yield_to_hot()
+        results.extend(_score_leads(leads[start:start + BATCH_CHUNK], engine))
+    return results
+
+
 @app.post("/route_lead")
 def route_lead_endpoint(lead: LeadData):
     """
@@ -86,6 +249,9 @@ def route_lead_endpoint(lead: LeadData):
     """
     scoring_result = score_lead(lead)
     routing_result = route_lead(lead, scoring_result)
+    if lead.lead_id:
+        record_scoring(lead.lead_id, lead, scoring_result, source="route_lead",
+                       routing_result=routing_result)
 
     # Optionally merge both into one response
     return {
@@ -95,16 +261,32 @@ def route_lead_endpoint(lead: LeadData):
 
 
 @app.post("/next_action")
-def next_action_endpoint(lead: LeadData):
+async def next_action_endpoint(lead: LeadData, request: Request):
     """
     1) Score the lead
     2) Route to the right agent
     3) Generate the next action/message/script
+    Steps 2–3 run on the hot or bulk lane depending on the score.
+    Duplicates (Idempotency-Key, or the same lead body) replay the first
+    response — see resilience/idempotency.py.
     """
-    scoring_result = score_lead(lead)
+    async def compute():
+        lane, scoring_result, _ = await score_for_lane(lead)
+        return await run_in_lane(lane, _route_and_act, lead, scoring_result)
+
+    key = idempotency_key(request, lead.lead_id, hashlib.blake2b(await request.body(), digest_size=8).hexdigest())
+    return await idempotent(request, key, compute)
+
+
+def _route_and_act(lead: LeadData, scoring_result: dict) -> dict:
     routing_result = route_lead(lead, scoring_result)
     agent_action = generate_agent_action(lead, routing_result, scoring_result)
 
+    # Known CRM leads feed the shared views (hot-lead index, segment stats)
+    if lead.lead_id:
+        record_scoring(lead.lead_id, lead, scoring_result, source="next_action",
+                       routing_result=routing_result)
+
     return {
         "scoring": scoring_result,
         "routing": routing_result,
@@ -171,7 +353,12 @@ def reengage_lead(payload: ReengagementPayload):
     return response
 
 @app.post("/cadence/next_step")
-def cadence_next_step(payload: CadencePayload):
+async def cadence_next_step(payload: CadencePayload, request: Request):
+    key = idempotency_key(request, payload.lead.lead_id, payload.last_outcome, payload.last_agent)
+    return await idempotent(request, key, lambda: run_in_threadpool(_cadence_next_step, payload))
+
+
+def _cadence_next_step(payload: CadencePayload) -> dict:
     scoring = score_lead(payload.lead)
 
     decision = decide_next_agent(
@@ -181,6 +368,8 @@ def cadence_next_step(payload: CadencePayload):
         days_inactive=payload.days_inactive,
         last_outcome=payload.last_outcome,
     )
+    if payload.lead.lead_id:
+        record_scoring(payload.lead.lead_id, payload.lead, scoring, source="cadence_next_step")
 
     return {
         "scoring": scoring,
@@ -189,9 +378,51 @@ def cadence_next_step(payload: CadencePayload):
 
 
 @app.post("/cadence/run")
-def cadence_run(payload: CadenceRunPayload):
-    scoring = score_lead(payload.lead)
-
+async def cadence_run(
+    payload: CadenceRunPayload,
+    request: Request,
+    mode: str = Query(default="sync", pattern="^(sync|async)$"),
+    dispatch: bool = Query(default=False, description="Queue the action for its send window (see /dispatch)"),
+    x_smartcore_admin_key: str | None = Header(default=None),
+):
+    """
+    mode=sync (default): run scoring → cadence → agent action and return it,
+    on the hot lane for hot leads.
+    mode=async: enqueue and return 202 + job id; poll /jobs/{id} or pass
+    callback_url to receive the result.
+    With dispatch=true the action is also queued for the lead's regional
+    send window (dispatch/dispatcher.py) instead of being left for the
+    caller to send; "dispatch" in the result says when each channel goes.
+    dispatch=true needs the admin key (X-SmartCore-Admin-Key).
+    A duplicate (same Idempotency-Key, or same lead_id + last_outcome +
+    last_agent within the TTL) replays the first response — including the
+    first job id in async mode — instead of running the chain again.
+    """
+    if dispatch:
+        require_admin_key(x_smartcore_admin_key)
+    if mode == "async" and payload.callback_url:
+        try:
+            await run_in_threadpool(check_callback_url, payload.callback_url)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=f"callback_url rejected: {e}")
+
+    async def compute():
+        if mode == "async":
+            return await enqueue_cadence_run(
+                {**payload.model_dump(exclude={"callback_url"}), "dispatch": dispatch},
+                payload.callback_url,
+            )
+        lane, scoring, _ = await score_for_lane(payload.lead)
+        result = await run_in_lane(lane, _cadence_chain, payload, scoring)
+        if dispatch:
+            result["dispatch"] = dispatch_action(payload.lead, result["agent_action"])
+        return result
+
+    key = idempotency_key(request, payload.lead.lead_id, payload.last_outcome, payload.last_agent, mode, dispatch)
+    return await idempotent(request, key, compute)
+
+
+def _cadence_chain(payload: CadenceRunPayload, scoring: dict) -> dict:
     decision = decide_next_agent(
         lead=payload.lead,
         scoring_result=scoring,
@@ -207,6 +438,8 @@ def cadence_run(payload: CadenceRunPayload):
         days_inactive=payload.days_inactive,
         last_touch_channel=payload.last_touch_channel,
     )
+    if payload.lead.lead_id:
+        record_scoring(payload.lead.lead_id, payload.lead, scoring, source="cadence_run")
 
     return {
         "scoring": scoring,
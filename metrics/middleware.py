@@ -0,0 +1,46 @@
+"""
+metrics/middleware.py
+─────────────────────
+ASGI middleware recording one latency sample per HTTP request, labelled by
+method, route template (e.g. /jobs/{job_id}, not the raw path, so label
+cardinality stays bounded) and status code.
+
+Pure ASGI rather than BaseHTTPMiddleware, so responses are not buffered
+and the per-request cost is a couple of perf_counter() reads.
+"""
+
+import time
+
+from metrics.registry import HTTP_SECONDS
+
+UNMATCHED = "unmatched"
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+        self._children: dict[tuple, object] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            key = (scope["method"], getattr(route, "path", UNMATCHED), status)
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = HTTP_SECONDS.labels(method=key[0], route=key[1], status=key[2])
+            child.observe(time.perf_counter() - started)
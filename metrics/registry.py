@@ -0,0 +1,336 @@
+"""
+metrics/registry.py
+───────────────────
+Minimal Prometheus metrics: counters, histograms and scrape-time gauges,
+rendered in the text exposition format by GET /metrics.
+
+Kept deliberately small (no prometheus_client dependency) and cheap on the
+hot path: label values are resolved once at decoration time and a timed
+call costs two perf_counter() reads plus a deque append; bucketing is
+batched (see _HistogramChild). bench/metrics_bench.py measures it.
+
+  timed(STAGE_SECONDS, stage="score_lead")   decorator for sync/async functions
+  CACHE_REQUESTS.labels(cache="zoho_token", result="hit").inc()
+  register_gauge(name, help, fn)             fn() → value or {label tuple: value}
+"""
+
+import functools
+import inspect
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Callable
+
+from tracing.tracer import current_span
+
+logger = logging.getLogger(__name__)
+
+# Engine stages run in microseconds; HTTP and Zoho calls in milliseconds+
+STAGE_BUCKETS = (0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.01, 0.1)
+HTTP_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_text(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _HistogramChild:
+    """
+    observe() only appends to a deque (atomic under the GIL, no lock);
+    samples are folded into the buckets in batches of FOLD_AT and at
+    scrape time, so the bisect and the lock are amortised.
+    """
+
+    __slots__ = ("bounds", "counts", "sum", "_pending", "_lock")
+
+    FOLD_AT = 1024
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self._pending: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        pending = self._pending
+        pending.append(value)
+        if len(pending) >= self.FOLD_AT:
+            self.fold()
+
+    def fold(self) -> None:
+        with self._lock:
+            pending, bounds, counts = self._pending, self.bounds, self.counts
+            total = 0.0
+            for _ in range(len(pending)):
+                value = pending.popleft()
+                counts[bisect_left(bounds, value)] += 1
+                total += value
+            self.sum += total
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels: str):
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in sorted(self._children.items()):
+            lines.extend(self._render_child(key, child))
+        return lines
+
+    def _render_child(self, key, child) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _render_child(self, key, child) -> list[str]:
+        return [f"{self.name}{_label_text(self.labelnames, key)} {_number(child.value)}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = HTTP_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def _render_child(self, key, child) -> list[str]:
+        child.fold()
+        with child._lock:
+            counts, total = list(child.counts), child.sum
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = 'le="' + _number(bound) + '"'
+            lines.append(f"{self.name}_bucket{_label_text(self.labelnames, key, le)} {cumulative}")
+        labels = _label_text(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_number(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Read at scrape time from a callback, so the hot path pays nothing."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, fn: Callable, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.fn = fn
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        try:
+            value = self.fn()
+        except Exception:
+            logger.exception("Gauge %s callback failed", self.name)
+            return lines
+        items = value.items() if isinstance(value, dict) else [((), value)]
+        for key, v in sorted(items):
+            if v is not None:
+                lines.append(f"{self.name}{_label_text(self.labelnames, key)} {_number(v)}")
+        return lines
+
+
+# ── Registry ───────────────────────────────────────────────────────────────
+_metrics: dict[str, object] = {}
+_registry_lock = threading.Lock()
+
+
+def _register(metric):
+    with _registry_lock:
+        existing = _metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        _metrics[metric.name] = metric
+        return metric
+
+
+def counter(name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+    return _register(Counter(name, help_text, labelnames))
+
+
+def histogram(name: str, help_text: str, labelnames: tuple[str, ...] = (),
+              buckets: tuple[float, ...] = HTTP_BUCKETS) -> Histogram:
+    return _register(Histogram(name, help_text, labelnames, buckets))
+
+
+def register_gauge(name: str, help_text: str, fn: Callable, labelnames: tuple[str, ...] = ()) -> Gauge:
+    """fn() returns a number, or {label-value tuple: number} when labelnames are given."""
+    gauge = Gauge(name, help_text, fn, labelnames)
+    with _registry_lock:
+        _metrics[name] = gauge
+    return gauge
+
+
+def render() -> str:
+    with _registry_lock:
+        metrics = list(_metrics.values())
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ── Shared metrics ─────────────────────────────────────────────────────────
+HTTP_SECONDS = histogram(
+    "smartcore_http_request_duration_seconds", "HTTP request latency by route template.",
+    ("method", "route", "status"),
+)
+STAGE_SECONDS = histogram(
+    "smartcore_stage_duration_seconds", "Engine stage latency (scoring, routing, cadence).",
+    ("stage",), buckets=STAGE_BUCKETS,
+)
+TEMPLATE_SECONDS = histogram(
+    "smartcore_template_render_seconds", "Agent message / script rendering latency.",
+    ("template",), buckets=STAGE_BUCKETS,
+)
+ZOHO_SECONDS = histogram(
+    "smartcore_zoho_call_duration_seconds", "Zoho CRM call latency (including cache hits).",
+    ("call",),
+)
+CACHE_REQUESTS = counter(
+    "smartcore_cache_requests_total", "Cache lookups by cache and result (hit/miss).",
+    ("cache", "result"),
+)
+
+
+
+def _cache_hit_ratios() -> dict:
+    totals: dict[str, list[float]] = {}
+    for (cache, result), child in list(CACHE_REQUESTS._children.items()):
+        hits_total = totals.setdefault(cache, [0.0, 0.0])
+        hits_total[1] += child.value
+        if result == "hit":
+            hits_total[0] += child.value
+    return {(cache,): round(hits / total, 4) for cache, (hits, total) in totals.items() if total}
+
+
+register_gauge(
+    "smartcore_cache_hit_ratio", "Hits / lookups per cache since start.",
+    _cache_hit_ratios, ("cache",),
+)
+
+
+def cache_hit(cache: str) -> None:
+    CACHE_REQUESTS.labels(cache=cache, result="hit").inc()
+
+
+def cache_miss(cache: str) -> None:
+    CACHE_REQUESTS.labels(cache=cache, result="miss").inc()
+
+
+def timed(metric: Histogram, **labels: str):
+    """
+    Records the wall time of every call (also when it raises). When the
+    current request is traced, the call is also recorded as a span named
+    after the label value (e.g. "score_lead"), nested under its caller.
+    """
+    child = metric.labels(**labels)
+    observe = child.observe
+    clock = time.perf_counter
+    span_name = ":".join(str(v) for v in labels.values()) or metric.name
+    get_span = current_span.get
+
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                parent = get_span()
+                span = token = None
+                if parent is not None:
+                    span = parent.child(span_name)
+                    token = current_span.set(span)
+                started = clock()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    observe(clock() - started)
+                    if span is not None:
+                        current_span.reset(token)
+                        span.finish()
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            parent = get_span()
+            if parent is not None:
+                return _traced_call(fn, args, kwargs, parent.child(span_name), observe)
+            started = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(clock() - started)
+        return wrapper
+
+    return decorator
+
+
+def _traced_call(fn, args, kwargs, span, observe):
+    token = current_span.set(span)
+    started = time.perf_counter()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        observe(time.perf_counter() - started)
+        current_span.reset(token)
+        span.finish()
@@ -0,0 +1,20 @@
+"""
+metrics/routes.py
+─────────────────
+FastAPI router exposing SmartCore metrics for Prometheus.
+
+Endpoints:
+  GET /metrics   → text exposition format (version 0.0.4)
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from metrics.registry import render
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4; charset=utf-8")
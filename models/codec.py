@@ -0,0 +1,61 @@
+"""
+models/codec.py
+───────────────
+Fast JSON I/O for batch payloads.
+
+  LEAD_LIST_ADAPTER   — prebuilt pydantic TypeAdapter for list[LeadData];
+                        validate_json parses + validates in one pass in Rust
+  FastJSONResponse    — orjson-backed response class
+  decode_leads()      — JSON body → list[LeadData]
+
+There is deliberately no validation-skipping decode for trusted callers:
+building LeadData in Python (model_construct) measures ~4x slower per lead
+than validate_json on the raw bytes — see python -m bench.codec_bench.
+
+Environment variables:
+  SMARTCORE_FAST_JSON — "1" makes FastJSONResponse the default for every endpoint
+"""
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from models.lead_model import LeadData
+
+LEAD_ADAPTER = TypeAdapter(LeadData)
+LEAD_LIST_ADAPTER = TypeAdapter(list[LeadData])
+
+
+def _default(obj):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(obj) -> bytes:
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def loads(data: bytes | str):
+    return orjson.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (several times faster on large lists)."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def decode_leads(body: bytes) -> list[LeadData]:
+    """
+    Decodes a JSON list of leads (or {"leads": [...]}).
+    Raises pydantic.ValidationError / orjson.JSONDecodeError on bad input.
+    """
+    if body.lstrip()[:1] == b"[":
+        return LEAD_LIST_ADAPTER.validate_json(body)
+
+    raw = loads(body)
+    if isinstance(raw, dict):
+        raw = raw.get("leads", [])
+    return LEAD_LIST_ADAPTER.validate_python(raw)
@@ -3,6 +3,7 @@ from typing import Optional, List
 
 class LeadData(BaseModel):
     # identity/context
+    lead_id: Optional[str] = None  # Zoho record id, when the lead came from CRM
     full_name: Optional[str] = None
     email: Optional[str] = None
     phone: Optional[str] = None
@@ -0,0 +1,201 @@
+"""
+pipeline/decision_pipeline.py
+─────────────────────────────
+Single-pass decision pipeline: score → route / cadence → action / objection.
+
+Callers ask for the stages they need; dependencies are added automatically
+and every stage runs at most once per lead, reusing earlier results:
+
+  score      score_lead
+  route      route_lead                      (needs score)
+  cadence    decide_next_agent               (needs score)
+  action     run_cadence_action if cadence was requested, otherwise
+             generate_agent_action from routing   (needs cadence or route)
+  objection  generate_objection_response     (needs score + objection_text)
+
+The output keys match the existing endpoints (scoring, routing,
+cadence_decision, agent_action, objection_handling) plus timings_ms.
+
+Batches can be deduplicated first (indexes/identity_index.py): copies of
+the same person are merged, behaviour flags OR-ed, and only the merged
+lead goes through the stages.
+"""
+
+import time
+
+from pydantic import BaseModel
+
+from agents.agent_behaviors import generate_agent_action
+from agents.objection_agent import generate_objection_response
+from agents.routing_engine import route_lead
+from cadence.cadence_engine import decide_next_agent
+from cadence.cadence_runner import run_cadence_action
+from indexes.identity_index import dedup_leads
+from jobs.lanes import BATCH_CHUNK, yield_to_hot
+from models.lead_model import LeadData
+from scoring.score_store import record_scoring
+from scoring.scoring_engine import score_lead
+
+STAGES = ("score", "route", "cadence", "action", "objection")
+
+_DEPENDENCIES = {
+    "score":     (),
+    "route":     ("score",),
+    "cadence":   ("score",),
+    "objection": ("score",),
+}
+
+
+class PipelineItem(BaseModel):
+    lead: LeadData
+    last_agent: str | None = None
+    days_inactive: int = 0
+    last_outcome: str | None = None
+    last_touch_channel: str | None = None
+    objection_text: str | None = None
+
+
+def resolve_stages(requested: list[str]) -> list[str]:
+    """
+    Returns the requested stages plus their dependencies, in run order.
+    Raises ValueError for unknown stage names.
+    """
+    unknown = [s for s in requested if s not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown pipeline stage(s): {', '.join(unknown)}")
+
+    needed = set(requested)
+    if "action" in needed:
+        needed.add("cadence" if "cadence" in needed else "route")
+    for stage in list(needed):
+        needed.update(_DEPENDENCIES.get(stage, ()))
+
+    return [s for s in STAGES if s in needed]
+
+
+def run_pipeline(item: PipelineItem, stages: list[str], scoring: dict | None = None,
+                 score_ms: float | None = None) -> dict:
+    """
+    Runs the already-resolved stages for one lead.
+    Pass `scoring` when the lead was already scored (e.g. to pick a lane),
+    and `score_ms`, how long that took, so the score timing stays real.
+    Returns the stage outputs plus per-stage timings in milliseconds.
+    """
+    lead = item.lead
+    result: dict = {}
+    timings: dict[str, float] = {}
+
+    for stage in stages:
+        started = time.perf_counter()
+
+        if stage == "score":
+            result["scoring"] = scoring if scoring is not None else score_lead(lead)
+
+        elif stage == "route":
+            result["routing"] = route_lead(lead, result["scoring"])
+
+        elif stage == "cadence":
+            result["cadence_decision"] = decide_next_agent(
+                lead=lead,
+                scoring_result=result["scoring"],
+                last_agent=item.last_agent,
+                days_inactive=item.days_inactive,
+                last_outcome=item.last_outcome,
+            )
+
+        elif stage == "action":
+            if "cadence_decision" in result:
+                result["agent_action"] = run_cadence_action(
+                    lead=lead,
+                    scoring_result=result["scoring"],
+                    cadence_decision=result["cadence_decision"],
+                    days_inactive=item.days_inactive,
+                    last_touch_channel=item.last_touch_channel,
+                )
+            else:
+                result["agent_action"] = generate_agent_action(lead, result["routing"], result["scoring"])
+
+        elif stage == "objection":
+            result["objection_handling"] = (
+                generate_objection_response(lead, result["scoring"], item.objection_text)
+                if item.objection_text
+                else None
+            )
+
+        timings[stage] = round((time.perf_counter() - started) * 1000, 4)
+
+    if scoring is not None and score_ms is not None and "score" in timings:
+        timings["score"] = score_ms
+
+    if lead.lead_id and "scoring" in result:
+        record_scoring(lead.lead_id, lead, result["scoring"], source="pipeline",
+                       routing_result=result.get("routing"))
+
+    result["timings_ms"] = timings
+    return result
+
+
+def run_pipeline_batch(
+    items: list[PipelineItem],
+    requested: list[str],
+    scorings: list[dict] | None = None,
+    dedup: bool = False,
+    score_ms: list[float] | None = None,
+) -> dict:
+    """
+    Runs the pipeline for every item. Stage resolution happens once;
+    stage timings are reported per lead and summed across the batch.
+    `scorings`, when given, are precomputed score_lead results per item
+    (and `score_ms` how long each took).
+    With `dedup`, duplicate leads are merged first; each result then lists
+    the input positions it covers in "merged_from".
+    Yields to the hot lane between chunks, so bulk callers never starve it.
+    """
+    stages = resolve_stages(requested)
+
+    started = time.perf_counter()
+    groups, dedup_stats = None, None
+    if dedup:
+        dedup_started = time.perf_counter()
+        unique, groups, dedup_stats = dedup_leads([item.lead for item in items])
+        if len(unique) < len(items):
+            # Stage inputs other than the lead come from the first copy
+            items = [
+                items[g[0]].model_copy(update={"lead": lead})
+                for g, lead in zip(groups, unique)
+            ]
+            scorings = score_ms = None  # precomputed for the unmerged leads
+        dedup_stats["elapsed_ms"] = round((time.perf_counter() - dedup_started) * 1000, 4)
+
+    results = []
+    for start in range(0, len(items), BATCH_CHUNK):
+        yield_to_hot()
+        for i in range(start, min(start + BATCH_CHUNK, len(items))):
+            results.append(run_pipeline(
+                items[i], stages,
+                scoring=scorings[i] if scorings else None,
+                score_ms=score_ms[i] if score_ms else None,
+            ))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if groups is not None:
+        for r, g in zip(results, groups):
+            r["merged_from"] = g
+
+    totals = {stage: 0.0 for stage in stages}
+    for r in results:
+        for stage, ms in r["timings_ms"].items():
+            totals[stage] += ms
+
+    response = {
+        "stages":     stages,
+        "count":      len(results),
+        "results":    results,
+        "timings_ms": {
+            "stages": {stage: round(ms, 4) for stage, ms in totals.items()},
+            "total":  round(elapsed_ms, 4),
+        },
+    }
+    if dedup_stats is not None:
+        response["dedup"] = dedup_stats
+    return response
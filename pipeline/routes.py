@@ -0,0 +1,59 @@
+"""
+pipeline/routes.py
+──────────────────
+FastAPI router for the single-pass decision pipeline.
+
+Endpoints:
+  POST /pipeline/run   → runs only the requested stages for one or many leads
+
+Example body:
+  {
+    "stages": ["route", "cadence", "action"],
+    "items": [
+      {"lead": {...}, "last_agent": "appointment_agent", "days_inactive": 3}
+    ],
+    "dedup": true       ← optional: merge copies of the same person first
+  }
+"""
+
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel
+
+from jobs.lanes import BULK, run_in_lane, score_for_lane
+from models.codec import FastJSONResponse
+from pipeline.decision_pipeline import PipelineItem, run_pipeline_batch
+from profiling.profiler import ProfiledRoute
+from resilience.idempotency import idempotency_key, idempotent
+
+router = APIRouter(prefix="/pipeline", tags=["Decision pipeline"], route_class=ProfiledRoute)
+
+
+class PipelineRequest(BaseModel):
+    stages: list[str] = ["score", "route", "action"]
+    items: list[PipelineItem]
+    dedup: bool = False
+
+
+@router.post("/run", response_class=FastJSONResponse)
+async def pipeline_run(payload: PipelineRequest, request: Request):
+    """
+    Scores each lead once and feeds that result to every requested stage.
+    Per-stage timings are returned per lead and summed for the batch.
+    Batches run on the bulk lane; a single hot lead runs on the hot lane.
+    With an Idempotency-Key header, a retried batch replays the first response.
+    """
+    async def compute():
+        lane, scorings, score_ms = BULK, None, None
+        if len(payload.items) == 1:
+            lane, scoring, ms = await score_for_lane(payload.items[0].lead)
+            scorings, score_ms = [scoring], [ms]
+
+        try:
+            return await run_in_lane(
+                lane, run_pipeline_batch, payload.items, payload.stages, scorings, payload.dedup, score_ms,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+    # Batches have no single lead id, so only a caller key applies
+    return await idempotent(request, idempotency_key(request, None), compute)
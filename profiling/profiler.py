@@ -0,0 +1,289 @@
+"""
+profiling/profiler.py
+─────────────────────
+Opt-in profiling of single requests in production.
+
+A request is profiled when it carries `X-SmartCore-Profile: <key>` matching
+SMARTCORE_PROFILE_KEY, or when it is picked by SMARTCORE_PROFILE_SAMPLE_RATE.
+Only that request's work is profiled — the endpoint itself, and whatever it
+hands to the priority lanes (scoring, routing, cadence, rendering) — and
+each profile is saved as:
+
+  <id>.pstats     cProfile stats     (python -m pstats, snakeviz, ...)
+  <id>.collapsed  sampled stacks     (flamegraph.pl, speedscope)
+  <id>.json       route, method, status, duration, mode
+
+Modes (X-SmartCore-Profile-Mode): "cprofile", "sampler" or "both" (default).
+The sampler reads the profiled threads' stacks every SAMPLE_INTERVAL_S.
+
+With neither variable set, ProfiledRoute leaves endpoints unwrapped, so the
+disabled cost is zero. At most one request is profiled at a time; others
+that ask while one is running are served normally.
+
+Environment variables:
+  SMARTCORE_PROFILE_KEY          — enables header-triggered profiling
+  SMARTCORE_PROFILE_SAMPLE_RATE  — fraction of requests to profile (default 0)
+  SMARTCORE_PROFILE_DIR          — where profiles are written (default "profiles")
+  SMARTCORE_PROFILE_KEEP         — profiles kept on disk (default 50)
+"""
+
+import cProfile
+import functools
+import hmac
+import inspect
+import json
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+
+PROFILE_KEY = os.environ.get("SMARTCORE_PROFILE_KEY")
+SAMPLE_RATE = float(os.environ.get("SMARTCORE_PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = os.environ.get("SMARTCORE_PROFILE_DIR", "profiles")
+KEEP = int(os.environ.get("SMARTCORE_PROFILE_KEEP", "50"))
+
+SAMPLE_INTERVAL_S = 0.001
+MODES = ("cprofile", "sampler", "both")
+
+ENABLED = bool(PROFILE_KEY) or SAMPLE_RATE > 0
+
+
+class ProfileSession:
+    def __init__(self, mode: str):
+        self.id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.mode = mode
+        self.profiles: list[cProfile.Profile] = []
+        self.stacks: Counter = Counter()
+        self._threads: set[int] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+
+    @property
+    def uses_cprofile(self) -> bool:
+        return self.mode in ("cprofile", "both")
+
+    @property
+    def uses_sampler(self) -> bool:
+        return self.mode in ("sampler", "both")
+
+    def run(self, fn, *args, **kwargs):
+        """Runs fn in the current thread, profiled as part of this session."""
+        thread_id = threading.get_ident()
+        with self._lock:
+            self._threads.add(thread_id)
+        profile = cProfile.Profile() if self.uses_cprofile else None
+        try:
+            if profile is None:
+                return fn(*args, **kwargs)
+            return profile.runcall(fn, *args, **kwargs)
+        finally:
+            with self._lock:
+                self._threads.discard(thread_id)
+                if profile is not None:
+                    self.profiles.append(profile)
+
+    async def run_async(self, fn, *args, **kwargs):
+        """
+        Awaits fn with the event-loop thread profiled. Other requests'
+        callbacks interleaved on the loop show up too; lane work does not.
+        """
+        thread_id = threading.get_ident()
+        with self._lock:
+            self._threads.add(thread_id)
+        profile = cProfile.Profile() if self.uses_cprofile else None
+        if profile is not None:
+            profile.enable()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            if profile is not None:
+                profile.disable()
+            with self._lock:
+                self._threads.discard(thread_id)
+                if profile is not None:
+                    self.profiles.append(profile)
+
+    def start_sampler(self) -> None:
+        if self.uses_sampler:
+            self._sampler = threading.Thread(target=self._sample, name="profile-sampler", daemon=True)
+            self._sampler.start()
+
+    def stop_sampler(self) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join(timeout=1.0)
+
+    def _sample(self) -> None:
+        while not self._stop.wait(SAMPLE_INTERVAL_S):
+            with self._lock:
+                threads = set(self._threads)
+            if not threads:
+                continue
+            frames = sys._current_frames()
+            for thread_id in threads:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.stacks[_collapse(frame)] += 1
+
+    def save(self, meta: dict) -> dict:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        files = []
+        base = os.path.join(PROFILE_DIR, self.id)
+
+        if self.profiles:
+            stats = pstats.Stats(self.profiles[0])
+            for profile in self.profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(base + ".pstats")
+            files.append("pstats")
+
+        if self.stacks:
+            with open(base + ".collapsed", "w", encoding="utf-8") as f:
+                for stack, count in self.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            files.append("collapsed")
+
+        meta = {"id": self.id, "mode": self.mode, "files": files, "samples": sum(self.stacks.values()), **meta}
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        _prune()
+        return meta
+
+
+def _collapse(frame) -> str:
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+def _prune() -> None:
+    for meta in list_profiles()[KEEP:]:
+        for ext in meta["files"] + ["json"]:
+            try:
+                os.remove(os.path.join(PROFILE_DIR, f"{meta['id']}.{ext}"))
+            except OSError:
+                pass
+
+
+def list_profiles() -> list[dict]:
+    """Saved profiles, newest first."""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    metas = []
+    for name in os.listdir(PROFILE_DIR):
+        if name.endswith(".json"):
+            try:
+                with open(os.path.join(PROFILE_DIR, name), encoding="utf-8") as f:
+                    metas.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+    return sorted(metas, key=lambda m: m.get("created_at", 0), reverse=True)
+
+
+def profile_path(profile_id: str, kind: str) -> str | None:
+    if kind not in ("pstats", "collapsed", "json") or not profile_id.replace("-", "").isalnum():
+        return None
+    path = os.path.join(PROFILE_DIR, f"{profile_id}.{kind}")
+    return path if os.path.isfile(path) else None
+
+
+def key_matches(value: str | None) -> bool:
+    return bool(PROFILE_KEY) and value is not None and hmac.compare_digest(value, PROFILE_KEY)
+
+
+# ── Request wiring ─────────────────────────────────────────────────────────
+# The session of the request being profiled; None for every other request
+active_profile: ContextVar[ProfileSession | None] = ContextVar("smartcore_active_profile", default=None)
+
+# One profiled request at a time (the event-loop thread has one profiler slot)
+_profiling = threading.Lock()
+
+
+def _wants_profile(request: Request) -> str | None:
+    """The mode to profile this request in, or None."""
+    requested = request.headers.get("x-smartcore-profile")
+    if requested is not None:
+        if not key_matches(requested):
+            return None
+    elif not (SAMPLE_RATE > 0 and random.random() < SAMPLE_RATE):
+        return None
+    mode = request.headers.get("x-smartcore-profile-mode", "both")
+    return mode if mode in MODES else "both"
+
+
+def _wrap_endpoint(endpoint):
+    """Profiles the endpoint body when its request is being profiled."""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_endpoint(*args, **kwargs):
+            session = active_profile.get()
+            if session is None:
+                return await endpoint(*args, **kwargs)
+            return await session.run_async(endpoint, *args, **kwargs)
+        return async_endpoint
+
+    @functools.wraps(endpoint)
+    def sync_endpoint(*args, **kwargs):
+        session = active_profile.get()
+        if session is None:
+            return endpoint(*args, **kwargs)
+        return session.run(endpoint, *args, **kwargs)
+    return sync_endpoint
+
+
+class ProfiledRoute(APIRoute):
+    """
+    Route class for routers whose endpoints may be profiled. When profiling
+    is not configured it behaves exactly like APIRoute.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if ENABLED:
+            endpoint = _wrap_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        if not ENABLED:
+            return handler
+
+        async def profiled_handler(request: Request):
+            mode = _wants_profile(request)
+            if mode is None or not _profiling.acquire(blocking=False):
+                return await handler(request)
+
+            session = ProfileSession(mode)
+            token = active_profile.set(session)
+            session.start_sampler()
+            started = time.perf_counter()
+            status = 500
+            try:
+                response = await handler(request)
+                status = response.status_code
+                response.headers["X-SmartCore-Profile-Id"] = session.id
+                return response
+            finally:
+                active_profile.reset(token)
+                session.stop_sampler()
+                _profiling.release()
+                session.save({
+                    "method":      request.method,
+                    "route":       self.path,
+                    "status":      status,
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                    "created_at":  time.time(),
+                })
+
+        return profiled_handler
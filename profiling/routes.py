@@ -0,0 +1,44 @@
+"""
+profiling/routes.py
+───────────────────
+FastAPI router for listing and downloading saved request profiles.
+Both endpoints require the profiling key in X-SmartCore-Profile-Key.
+
+Endpoints:
+  GET /profiles                    → recent profiles, newest first
+  GET /profiles/{profile_id}/{kind}  → download; kind is pstats, collapsed or json
+
+Profile a request:
+  curl -H "X-SmartCore-Profile: $SMARTCORE_PROFILE_KEY" \\
+       -H "X-SmartCore-Profile-Mode: both" -X POST .../cadence/run -d '...'
+  → response header X-SmartCore-Profile-Id: <id>
+"""
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse
+
+from profiling.profiler import key_matches, list_profiles, profile_path
+
+router = APIRouter(prefix="/profiles", tags=["Profiling"])
+
+
+def _require_key(key: str | None) -> None:
+    if not key_matches(key):
+        raise HTTPException(status_code=403, detail="Profiling key required")
+
+
+@router.get("")
+def profiles(limit: int = 50, x_smartcore_profile_key: str | None = Header(default=None)):
+    _require_key(x_smartcore_profile_key)
+    items = list_profiles()[:limit]
+    return {"success": True, "count": len(items), "profiles": items}
+
+
+@router.get("/{profile_id}/{kind}")
+def download_profile(profile_id: str, kind: str, x_smartcore_profile_key: str | None = Header(default=None)):
+    _require_key(x_smartcore_profile_key)
+    path = profile_path(profile_id, kind)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    media_type = "application/json" if kind == "json" else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=f"{profile_id}.{kind}")
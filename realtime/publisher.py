@@ -0,0 +1,394 @@
+"""
+realtime/publisher.py
+─────────────────────
+Pushes score, intent and next-agent changes to the Node websocket
+service (websocket/server.js), so dashboards hear about hot leads and
+IntentScore updates as they happen instead of polling /zoho/leads.
+
+Every score_store change (Zoho notifications, /next_action, the decision
+pipeline) is turned into events:
+
+  intentScore  score or intent_level changed (or a new lead)
+  nextAgent    the routed agent changed
+  hotLead      the score crossed SMARTCORE_REALTIME_HOT_SCORE (default 75)
+               from below — an alert, not a repeat on every rescore
+
+Changes are coalesced per lead for SMARTCORE_REALTIME_COALESCE_MS: a
+lead rescored five times in that window is compared once, first state
+against last, so 70 → 82 → 71 → 70 publishes nothing at all. What is left
+goes out in batches of up to SMARTCORE_REALTIME_BATCH events, from one
+background thread:
+
+  ws:// or wss://    one persistent connection, authenticated like any
+                     client ({"type": "auth", "apiKey"}); each batch is one
+                     {"type": "batch", "events": [...]} message (the
+                     service does not acknowledge, so a batch written just
+                     before the connection drops can be lost)
+  http:// or https:// POST {"events": [...]} to <url> (…/events on the
+                     websocket service), one call per batch
+
+If the service is down or slow, the sender reconnects with exponential
+backoff (capped at 30 s) while changes keep coalescing — the backlog is
+bounded by leads, not updates. Past SMARTCORE_REALTIME_MAX_PENDING leads,
+changes for further leads are dropped (and counted) rather than growing
+memory; a failed batch is retried ahead of newer events, up to the same
+number of events.
+
+Environment variables:
+  SMARTCORE_REALTIME_URL          — websocket service URL; unset = off
+  SMARTCORE_REALTIME_API_KEY      — the service's WS_API_KEY
+  SMARTCORE_REALTIME_COALESCE_MS  — per-lead coalescing window (default 250)
+  SMARTCORE_REALTIME_BATCH        — events per message / POST (default 500)
+  SMARTCORE_REALTIME_MAX_PENDING  — leads waiting to publish (default 50000)
+  SMARTCORE_REALTIME_HOT_SCORE    — hotLead threshold (default 75)
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+
+from metrics.registry import counter, register_gauge
+from realtime.ws_client import WebSocket, WebSocketError
+from scoring.score_store import add_listener
+
+logger = logging.getLogger(__name__)
+
+URL = os.environ.get("SMARTCORE_REALTIME_URL", "")
+API_KEY = os.environ.get("SMARTCORE_REALTIME_API_KEY", "")
+COALESCE_SECONDS = int(os.environ.get("SMARTCORE_REALTIME_COALESCE_MS", "250")) / 1000
+BATCH_SIZE = int(os.environ.get("SMARTCORE_REALTIME_BATCH", "500"))
+MAX_PENDING = int(os.environ.get("SMARTCORE_REALTIME_MAX_PENDING", "50000"))
+HOT_SCORE = int(os.environ.get("SMARTCORE_REALTIME_HOT_SCORE", "75"))
+
+MAX_BACKOFF_SECONDS = 30.0
+
+EVENTS = counter(
+    "smartcore_realtime_events_total",
+    "Realtime events by type and outcome (published, failed, dropped).",
+    ("event", "outcome"),
+)
+UPDATES = counter(
+    "smartcore_realtime_updates_total",
+    "Lead changes seen by the realtime publisher: queued, coalesced into a "
+    "pending one, or dropped because the backlog was full.",
+    ("outcome",),
+)
+
+
+def _view(entry: dict | None) -> dict | None:
+    """The fields events are built from."""
+    if entry is None:
+        return None
+    scoring = entry.get("scoring") or {}
+    lead = entry.get("lead") or {}
+    return {
+        "score":          scoring.get("score"),
+        "intent_level":   scoring.get("intent_level"),
+        "call_decision":  scoring.get("call_decision"),
+        "next_agent":     (entry.get("routing") or {}).get("assigned_agent"),
+        "full_name":      lead.get("full_name"),
+        "company":        lead.get("company"),
+        "country_region": lead.get("country_region"),
+        "source":         entry.get("source"),
+        "scored_at":      entry.get("scored_at"),
+    }
+
+
+def changes_to_events(lead_id: str, before: dict | None, after: dict | None) -> list[dict]:
+    """Events for one lead going from `before` to `after` (both _view() dicts)."""
+    if after is None:
+        return []
+    before = before or {}
+    events = []
+    common = {
+        "leadId":    lead_id,
+        "name":      after["full_name"],
+        "company":   after["company"],
+        "region":    after["country_region"],
+        "source":    after["source"],
+        "updatedAt": after["scored_at"],
+    }
+    score = after["score"]
+    if score != before.get("score") or after["intent_level"] != before.get("intent_level"):
+        events.append({"event": "intentScore", "payload": {
+            **common,
+            "score":         score,
+            "previousScore": before.get("score"),
+            "intentLevel":   after["intent_level"],
+            "callDecision":  after["call_decision"],
+        }})
+    if after["next_agent"] and after["next_agent"] != before.get("next_agent"):
+        events.append({"event": "nextAgent", "payload": {
+            **common,
+            "nextAgent":     after["next_agent"],
+            "previousAgent": before.get("next_agent"),
+        }})
+    if score is not None and score >= HOT_SCORE and (before.get("score") or 0) < HOT_SCORE:
+        events.append({"event": "hotLead", "payload": {
+            **common,
+            "score":        score,
+            "intentLevel":  after["intent_level"],
+            "callDecision": after["call_decision"],
+        }})
+    return events
+
+
+# ── Transports ──────────────────────────────────────────────────────────────
+class WsTransport:
+    def __init__(self, url: str, api_key: str, timeout: float = 10.0):
+        self.url = url
+        self.api_key = api_key
+        self.timeout = timeout
+        self._ws: WebSocket | None = None
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None
+
+    def _connect(self) -> WebSocket:
+        ws = WebSocket.connect(self.url, timeout=self.timeout)
+        try:
+            ws.send_text(json.dumps({"type": "auth", "apiKey": self.api_key, "clientType": "smartcore"}))
+            while True:
+                _, data = ws.recv()
+                message = json.loads(data)
+                if message.get("type") == "authSuccess":
+                    return ws
+        except BaseException:
+            ws.sock.close()
+            raise
+
+    def send(self, events: list[dict]) -> None:
+        if self._ws is None:
+            self._ws = self._connect()
+            logger.info("Realtime publisher connected to %s", self.url)
+        try:
+            self._ws.drain()  # broadcasts from other clients; we only publish
+            self._ws.send_text(json.dumps({"type": "batch", "events": events}))
+        except BaseException:
+            self.close()
+            raise
+
+    def idle(self) -> None:
+        if self._ws is not None:
+            try:
+                self._ws.drain()
+            except (OSError, WebSocketError) as e:
+                logger.warning("Realtime connection lost: %s", e)
+                self.close()
+
+    def close(self) -> None:
+        if self._ws is not None:
+            ws, self._ws = self._ws, None
+            ws.close()
+
+
+class HttpTransport:
+    def __init__(self, url: str, api_key: str, timeout: float = 10.0):
+        import httpx  # deferred: only the http transport needs it
+
+        self._client = httpx.Client(timeout=timeout, headers={"x-api-key": api_key} if api_key else {})
+        self.url = url
+        self.connected = True
+
+    def send(self, events: list[dict]) -> None:
+        response = self._client.post(self.url, json={"events": events})
+        response.raise_for_status()
+
+    def idle(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self._client.close()
+
+
+def make_transport(url: str, api_key: str):
+    if url.startswith(("ws://", "wss://")):
+        return WsTransport(url, api_key)
+    if url.startswith(("http://", "https://")):
+        return HttpTransport(url, api_key)
+    raise ValueError(f"SMARTCORE_REALTIME_URL must be ws(s):// or http(s)://, got {url!r}")
+
+
+# ── Publisher ───────────────────────────────────────────────────────────────
+class RealtimePublisher:
+    def __init__(self, transport, coalesce_seconds: float = COALESCE_SECONDS,
+                 batch_size: int = BATCH_SIZE, max_pending: int = MAX_PENDING):
+        self.transport = transport
+        self.coalesce_seconds = coalesce_seconds
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        # lead_id → [state before the window, latest state, first change time]
+        self._pending: dict[str, list] = {}
+        self._retry: list[dict] = []
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread: threading.Thread | None = None
+        self.last_error: str | None = None
+        self.last_published_at: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._pending) + len(self._retry)
+
+    def on_change(self, entry: dict | None, previous: dict | None) -> None:
+        """score_store listener; never blocks on the network."""
+        lead_id = (entry or previous or {}).get("lead_id")
+        if not lead_id:
+            return
+        after = _view(entry)
+        with self._cond:
+            pending = self._pending.get(lead_id)
+            if pending is not None:
+                pending[1] = after
+                UPDATES.labels(outcome="coalesced").inc()
+                return
+            if len(self._pending) >= self.max_pending:
+                UPDATES.labels(outcome="dropped").inc()
+                return
+            self._pending[lead_id] = [_view(previous), after, time.monotonic()]
+            UPDATES.labels(outcome="queued").inc()
+            if len(self._pending) == 1:
+                self._cond.notify()
+
+    def _take(self, flush: bool) -> list[dict]:
+        """Events for every lead whose coalescing window has passed (all with flush)."""
+        cutoff = time.monotonic() - self.coalesce_seconds
+        events, self._retry = self._retry, []
+        for lead_id in [k for k, v in self._pending.items() if flush or v[2] <= cutoff]:
+            before, after, _ = self._pending.pop(lead_id)
+            events.extend(changes_to_events(lead_id, before, after))
+        return events
+
+    def _next_due(self) -> float | None:
+        if self._retry:
+            return 0.0
+        if not self._pending:
+            return None
+        oldest = min(v[2] for v in self._pending.values())
+        return max(0.0, oldest + self.coalesce_seconds - time.monotonic())
+
+    def publish_due(self, flush: bool = False) -> int:
+        """Sends what is due now; returns events published. Raises on transport errors."""
+        with self._cond:
+            events = self._take(flush)
+        published = 0
+        for start in range(0, len(events), self.batch_size):
+            batch = events[start:start + self.batch_size]
+            try:
+                self.transport.send(batch)
+            except Exception:
+                with self._cond:
+                    self._retry = events[start:] + self._retry
+                raise
+            for event in batch:
+                EVENTS.labels(event=event["event"], outcome="published").inc()
+            published += len(batch)
+            self.last_published_at = time.time()
+        return published
+
+    def _run(self) -> None:
+        backoff = 0.5
+        while True:
+            with self._cond:
+                wait = self._next_due()
+                if wait != 0.0 and not self._stop:
+                    # idle ticks still read the connection (pings, closes)
+                    self._cond.wait(timeout=5.0 if wait is None else wait)
+                if self._stop:
+                    return
+                due = self._next_due() == 0.0
+            try:
+                if due:
+                    self.publish_due()
+                else:
+                    self.transport.idle()
+                backoff = 0.5
+                self.last_error = None
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.warning("Realtime publish failed (%d events waiting), retrying in %.1fs: %s",
+                               len(self._retry), backoff, e)
+                self._drop_overflow()
+                time.sleep(backoff * random.uniform(0.8, 1.2))
+                backoff = min(backoff * 2, MAX_BACKOFF_SECONDS)
+
+    def _drop_overflow(self) -> None:
+        """Keeps the retry backlog within max_pending events while the service is down."""
+        with self._cond:
+            overflow = len(self._retry) - self.max_pending
+            if overflow > 0:
+                for event in self._retry[:overflow]:
+                    EVENTS.labels(event=event["event"], outcome="dropped").inc()
+                del self._retry[:overflow]
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop = False
+            self._thread = threading.Thread(target=self._run, name="realtime-publisher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stops the sender, then makes one last attempt to publish everything pending."""
+        if self._thread is not None:
+            with self._cond:
+                self._stop = True
+                self._cond.notify()
+            self._thread.join(timeout)
+            self._thread = None
+        try:
+            self.publish_due(flush=True)
+        except Exception as e:
+            for event in self._retry:
+                EVENTS.labels(event=event["event"], outcome="failed").inc()
+            logger.warning("Realtime publish on shutdown failed (%d events lost): %s", len(self._retry), e)
+        self.transport.close()
+
+    def status(self) -> dict:
+        return {
+            "enabled":           True,
+            "connected":         self.transport.connected,
+            "pending_leads":     len(self._pending),
+            "retry_events":      len(self._retry),
+            "last_error":        self.last_error,
+            "last_published_at": (datetime.fromtimestamp(self.last_published_at, timezone.utc).isoformat()
+                                  if self.last_published_at else None),
+        }
+
+
+# ── Process-wide publisher ─────────────────────────────────────────────────
+_publisher: RealtimePublisher | None = None
+
+
+def start_publisher() -> RealtimePublisher | None:
+    """Starts publishing score_store changes when SMARTCORE_REALTIME_URL is set."""
+    global _publisher
+    if not URL:
+        return None
+    if _publisher is None:
+        _publisher = RealtimePublisher(make_transport(URL, API_KEY))
+        add_listener(_publisher.on_change)
+    _publisher.start()
+    return _publisher
+
+
+def stop_publisher() -> None:
+    if _publisher is not None:
+        _publisher.stop()
+
+
+def publisher_status() -> dict:
+    return _publisher.status() if _publisher is not None else {"enabled": False}
+
+
+register_gauge(
+    "smartcore_realtime_pending", "Leads with unpublished changes plus events waiting for a retry.",
+    lambda: len(_publisher) if _publisher is not None else 0,
+)
+register_gauge(
+    "smartcore_realtime_connected", "1 while the realtime publisher holds a connection to the websocket service.",
+    lambda: int(_publisher is not None and _publisher.transport.connected),
+)
@@ -0,0 +1,20 @@
+"""
+realtime/routes.py
+──────────────────
+FastAPI router for the realtime publisher (realtime/publisher.py).
+
+Endpoints:
+  GET /realtime/status   → connected?, leads / events waiting, last error,
+                           last successful publish
+"""
+
+from fastapi import APIRouter
+
+from realtime.publisher import publisher_status
+
+router = APIRouter(prefix="/realtime", tags=["Realtime"])
+
+
+@router.get("/status")
+def realtime_status():
+    return {"success": True, **publisher_status()}
@@ -0,0 +1,167 @@
+"""
+realtime/ws_client.py
+─────────────────────
+Minimal blocking WebSocket client (RFC 6455) on the standard library —
+just what the realtime publisher needs to hold one connection to the
+Node websocket service: ws:// and wss://, text frames out (masked, as
+clients must), and reading frames in so pings are answered, closes are
+noticed and the service's broadcasts do not pile up in our socket.
+"""
+
+import base64
+import hashlib
+import os
+import select
+import socket
+import ssl
+import struct
+from urllib.parse import urlsplit
+
+_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OP_TEXT, OP_CLOSE, OP_PING, OP_PONG = 0x1, 0x8, 0x9, 0xA
+
+
+class WebSocketError(Exception):
+    pass
+
+
+class WebSocket:
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self._buffer = b""
+
+    @classmethod
+    def connect(cls, url: str, timeout: float = 10.0) -> "WebSocket":
+        parts = urlsplit(url)
+        if parts.scheme not in ("ws", "wss"):
+            raise WebSocketError(f"not a websocket URL: {url}")
+        port = parts.port or (443 if parts.scheme == "wss" else 80)
+        sock = socket.create_connection((parts.hostname, port), timeout=timeout)
+        try:
+            if parts.scheme == "wss":
+                sock = ssl.create_default_context().wrap_socket(sock, server_hostname=parts.hostname)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            key = base64.b64encode(os.urandom(16)).decode()
+            path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+            sock.sendall((
+                f"GET {path} HTTP/1.1\r\n"
+                f"Host: {parts.netloc}\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Key: {key}\r\n"
+                "Sec-WebSocket-Version: 13\r\n\r\n"
+            ).encode())
+
+            ws = cls(sock)
+            head = ws._read_until(b"\r\n\r\n").decode("latin-1")
+            status, *header_lines = head.split("\r\n")
+            headers = {k.strip().lower(): v.strip() for k, _, v in (h.partition(":") for h in header_lines if h)}
+            expected = base64.b64encode(hashlib.sha1(key.encode() + _GUID).digest()).decode()
+            if " 101 " not in f"{status} " or headers.get("sec-websocket-accept") != expected:
+                raise WebSocketError(f"handshake rejected: {status}")
+            return ws
+        except BaseException:
+            sock.close()
+            raise
+
+    def _read_until(self, marker: bytes) -> bytes:
+        while marker not in self._buffer:
+            self._recv_more()
+        head, _, self._buffer = self._buffer.partition(marker)
+        return head
+
+    def _read_exact(self, n: int) -> bytes:
+        while len(self._buffer) < n:
+            self._recv_more()
+        data, self._buffer = self._buffer[:n], self._buffer[n:]
+        return data
+
+    def _recv_more(self) -> None:
+        chunk = self.sock.recv(65536)
+        if not chunk:
+            raise WebSocketError("connection closed by peer")
+        self._buffer += chunk
+
+    def _send_frame(self, opcode: int, payload: bytes) -> None:
+        header = bytes((0x80 | opcode,))
+        n = len(payload)
+        if n < 126:
+            header += bytes((0x80 | n,))
+        elif n < 1 << 16:
+            header += bytes((0x80 | 126,)) + struct.pack("!H", n)
+        else:
+            header += bytes((0x80 | 127,)) + struct.pack("!Q", n)
+        mask = os.urandom(4)
+        key = (mask * (n // 4 + 1))[:n]
+        masked = (int.from_bytes(payload, "big") ^ int.from_bytes(key, "big")).to_bytes(n, "big")
+        self.sock.sendall(header + mask + masked)
+
+    def send_text(self, text: str) -> None:
+        self._send_frame(OP_TEXT, text.encode())
+
+    def recv(self) -> tuple[int, bytes]:
+        """Reads one frame (answering pings); returns (opcode, payload)."""
+        while True:
+            first, second = self._read_exact(2)
+            n = second & 0x7F
+            if n == 126:
+                n = struct.unpack("!H", self._read_exact(2))[0]
+            elif n == 127:
+                n = struct.unpack("!Q", self._read_exact(8))[0]
+            mask = self._read_exact(4) if second & 0x80 else b""
+            payload = self._read_exact(n)
+            if mask:
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+            opcode = first & 0x0F
+            if opcode == OP_PING:
+                self._send_frame(OP_PONG, payload)
+                continue
+            if opcode == OP_CLOSE:
+                code = struct.unpack("!H", payload[:2])[0] if len(payload) >= 2 else 1005
+                raise WebSocketError(f"closed by peer ({code} {payload[2:].decode(errors='replace')})")
+            return opcode, payload
+
+    def drain(self) -> int:
+        """Reads and discards whatever frames have already arrived; returns how many."""
+        frames = 0
+        while True:
+            if _complete(self._buffer):
+                self.recv()
+                frames += 1
+            elif self._readable():
+                self._recv_more()
+            else:
+                return frames
+
+    def _readable(self) -> bool:
+        if isinstance(self.sock, ssl.SSLSocket) and self.sock.pending():
+            return True
+        return bool(select.select([self.sock], [], [], 0)[0])
+
+    def close(self) -> None:
+        try:
+            self._send_frame(OP_CLOSE, struct.pack("!H", 1000))
+        except OSError:
+            pass
+        finally:
+            self.sock.close()
+
+
+def _complete(buffer: bytes) -> bool:
+    """True when buffer holds at least one whole frame."""
+    if len(buffer) < 2:
+        return False
+    n, offset = buffer[1] & 0x7F, 2
+    if n == 126:
+        if len(buffer) < 4:
+            return False
+        n, offset = struct.unpack("!H", buffer[2:4])[0], 4
+    elif n == 127:
+        if len(buffer) < 10:
+            return False
+        n, offset = struct.unpack("!Q", buffer[2:10])[0], 10
+    if buffer[1] & 0x80:
+        offset += 4
+    return len(buffer) >= offset + n
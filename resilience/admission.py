@@ -0,0 +1,200 @@
+"""
+resilience/admission.py
+───────────────────────
+Admission control: per-route concurrency limits with bounded, deadline-
+aware waiting queues, so a burst is shed quickly instead of piling up in
+the threadpool and finishing after the caller has given up.
+
+For each limited route (exact path, any method but OPTIONS):
+  - up to `concurrency` requests run at once
+  - up to `queue` more wait, first come first served, for at most
+    SMARTCORE_ADMISSION_QUEUE_TIMEOUT_MS or the caller's deadline
+  - anything beyond that gets an immediate 503 with Retry-After
+
+Callers pass their deadline in either header:
+  X-SmartCore-Deadline:   unix epoch milliseconds
+  X-SmartCore-Timeout-Ms: milliseconds from now (immune to clock skew)
+A request whose deadline has already passed — on arrival or while it
+waited — is answered 504 before any work is done.
+
+Shed requests are counted in smartcore_admission_shed_total{route,reason}
+(reason: queue_full, queue_timeout, deadline); in-flight and queued
+counts are exported as gauges.
+
+Environment variables:
+  SMARTCORE_ADMISSION                  — "0" disables admission control
+  SMARTCORE_ADMISSION_LIMITS           — per-route overrides, e.g.
+                                         "/cadence/run=32:64,/next_action=16:32"
+                                         (concurrency:queue)
+  SMARTCORE_ADMISSION_QUEUE_TIMEOUT_MS — max queue wait (default 2000)
+  SMARTCORE_ADMISSION_RETRY_AFTER_S    — Retry-After on 503 (default 1)
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+
+from metrics.registry import counter, register_gauge
+
+ENABLED = os.environ.get("SMARTCORE_ADMISSION", "1") != "0"
+QUEUE_TIMEOUT_SECONDS = int(os.environ.get("SMARTCORE_ADMISSION_QUEUE_TIMEOUT_MS", "2000")) / 1000
+RETRY_AFTER_SECONDS = os.environ.get("SMARTCORE_ADMISSION_RETRY_AFTER_S", "1")
+
+# route → (concurrency, queue); the decision endpoints the call service hits
+DEFAULT_LIMITS = {
+    "/cadence/run":        (32, 64),
+    "/cadence/next_step":  (32, 64),
+    "/next_action":        (32, 64),
+    "/score_lead":         (32, 64),
+    "/route_lead":         (32, 64),
+    "/handle_objection":   (16, 32),
+    "/pipeline/run":       (8, 16),
+    "/batch/score_leads":  (4, 8),
+}
+
+SHED = counter(
+    "smartcore_admission_shed_total",
+    "Requests rejected by admission control, by route and reason.",
+    ("route", "reason"),
+)
+
+
+def _parse_limits(spec: str | None) -> dict[str, tuple[int, int]]:
+    limits = dict(DEFAULT_LIMITS)
+    for item in (spec or "").split(","):
+        path, _, value = item.strip().partition("=")
+        if not path or not value:
+            continue
+        concurrency, _, queue = value.partition(":")
+        limits[path] = (int(concurrency), int(queue or 0))
+    return limits
+
+
+class RouteLimiter:
+    """Concurrency slots plus a FIFO of waiters for one route."""
+
+    def __init__(self, route: str, concurrency: int, queue: int):
+        self.route = route
+        self.concurrency = concurrency
+        self.queue = queue
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, deadline: float | None) -> str | None:
+        """None once admitted, else the shed reason."""
+        if self.in_flight < self.concurrency and not self._waiters:
+            self.in_flight += 1
+            return None
+        if len(self._waiters) >= self.queue:
+            return "queue_full"
+
+        timeout = QUEUE_TIMEOUT_SECONDS
+        if deadline is not None:
+            timeout = min(timeout, deadline - time.time())
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+            return None  # release() handed its slot over
+        except asyncio.TimeoutError:
+            if waiter.done():  # admitted just as the timeout fired
+                return None
+            waiter.cancel()
+            return "deadline" if deadline is not None and time.time() >= deadline else "queue_timeout"
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # a slot was handed over but will never be used
+            else:
+                waiter.cancel()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        # Hand the slot straight to the oldest live waiter, if any
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                return
+        self.in_flight -= 1
+
+
+def _deadline(scope) -> float | None:
+    """The caller's deadline as a unix timestamp, if it sent one."""
+    for name, value in scope.get("headers", ()):
+        try:
+            if name == b"x-smartcore-deadline":
+                return int(value) / 1000
+            if name == b"x-smartcore-timeout-ms":
+                return time.time() + int(value) / 1000
+        except ValueError:
+            return None
+    return None
+
+
+async def _reject(send, status: int, reason: str, retry_after: bool) -> None:
+    headers = [(b"content-type", b"application/json"), (b"x-smartcore-shed", reason.encode())]
+    if retry_after:
+        headers.append((b"retry-after", RETRY_AFTER_SECONDS.encode()))
+    body = b'{"detail":"%s"}' % (
+        b"Caller deadline already passed" if reason == "deadline" else b"Over capacity, retry later"
+    )
+    headers.append((b"content-length", str(len(body)).encode()))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionMiddleware:
+    def __init__(self, app, limits: dict[str, tuple[int, int]] | None = None):
+        self.app = app
+        if limits is None:
+            limits = _parse_limits(os.environ.get("SMARTCORE_ADMISSION_LIMITS")) if ENABLED else {}
+        self.limiters = {path: RouteLimiter(path, c, q) for path, (c, q) in limits.items()}
+        _limiters.update(self.limiters)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+        limiter = self.limiters.get(scope["path"])
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        deadline = _deadline(scope)
+        if deadline is not None and time.time() >= deadline:
+            reason = "deadline"
+        else:
+            reason = await limiter.acquire(deadline)
+        if reason is not None:
+            SHED.labels(route=limiter.route, reason=reason).inc()
+            if reason == "deadline":
+                await _reject(send, 504, reason, retry_after=False)
+            else:
+                await _reject(send, 503, reason, retry_after=True)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+# Every limiter in the process, for the gauges below
+_limiters: dict[str, RouteLimiter] = {}
+
+register_gauge(
+    "smartcore_admission_in_flight", "Requests running per admission-limited route.",
+    lambda: {(route,): limiter.in_flight for route, limiter in _limiters.items()}, ("route",),
+)
+register_gauge(
+    "smartcore_admission_queued", "Requests waiting for a slot per admission-limited route.",
+    lambda: {(route,): limiter.queued for route, limiter in _limiters.items()}, ("route",),
+)
@@ -0,0 +1,146 @@
+"""
+resilience/circuit_breaker.py
+─────────────────────────────
+Circuit breakers for calls to slow or failing dependencies (Zoho CRM),
+so requests fail fast — or are served from cache by the caller — instead
+of each one waiting out a 10–15 s timeout behind the others.
+
+  closed     calls go through; outcomes are tracked
+  open       calls are refused at once with CircuitOpen (retry_after says
+             for how long) — entered after `failures` consecutive failures,
+             or when at least half of the last `window` calls were slow
+             (over `slow_seconds`) or failed
+  half_open  after `open_seconds`, one probe call at a time is let through;
+             `probes` successes in a row close the breaker, any failure
+             (or slow probe) opens it again
+
+Callers decide what a failure is (timeouts, connection errors, 5xx and
+429 for Zoho — not 4xx answers, which mean the dependency is up):
+
+  breaker.before_call()          # raises CircuitOpen
+  ... make the call ...
+  breaker.record(ok, elapsed)
+
+Breaker states are exported as smartcore_circuit_state{breaker}
+(0 closed, 1 half_open, 2 open) with transitions and refused calls
+counted.
+"""
+
+import threading
+import time
+from collections import deque
+
+from metrics.registry import counter, register_gauge
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+TRANSITIONS = counter(
+    "smartcore_circuit_transitions_total",
+    "Circuit breaker state changes, by breaker and new state.",
+    ("breaker", "state"),
+)
+REFUSED = counter(
+    "smartcore_circuit_refused_total",
+    "Calls refused without being attempted because the breaker was open.",
+    ("breaker",),
+)
+
+
+class CircuitOpen(Exception):
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} circuit open; retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failures: int = 5, window: int = 20, slow_seconds: float = 5.0,
+                 open_seconds: float = 30.0, probes: int = 2):
+        self.name = name
+        self.failures = failures
+        self.slow_seconds = slow_seconds
+        self.open_seconds = open_seconds
+        self.probes = probes
+        self.state = CLOSED
+        self._recent: deque[bool] = deque(maxlen=window)   # True = bad (failed or slow)
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started = 0.0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+        _breakers[name] = self
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        TRANSITIONS.labels(breaker=self.name, state=state).inc()
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        self._recent.clear()
+        self._consecutive_failures = 0
+        self._probe_in_flight = False
+        self._probe_successes = 0
+
+    def retry_after(self) -> float:
+        return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def before_call(self) -> None:
+        """Raises CircuitOpen unless a call may go through now."""
+        with self._lock:
+            if self.state == OPEN and self.retry_after() <= 0:
+                self._set_state(HALF_OPEN)
+            if self.state == CLOSED:
+                return
+            # a probe that never reported back (cancelled) stops blocking after open_seconds
+            now = time.monotonic()
+            if self.state == HALF_OPEN and (not self._probe_in_flight
+                                            or now - self._probe_started > self.open_seconds):
+                self._probe_in_flight = True
+                self._probe_started = now
+                return
+            REFUSED.labels(breaker=self.name).inc()
+            raise CircuitOpen(self.name, self.retry_after() if self.state == OPEN else 1.0)
+
+    def record(self, ok: bool, elapsed: float | None = None) -> None:
+        slow = elapsed is not None and elapsed > self.slow_seconds
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probe_in_flight = False
+                if not ok or slow:
+                    self._set_state(OPEN)
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.probes:
+                        self._set_state(CLOSED)
+                return
+            if self.state == OPEN:
+                return  # a call that started before the breaker opened
+
+            self._consecutive_failures = 0 if ok else self._consecutive_failures + 1
+            self._recent.append(not ok or slow)
+            window_full = len(self._recent) == self._recent.maxlen
+            if (self._consecutive_failures >= self.failures
+                    or (window_full and sum(self._recent) * 2 >= len(self._recent))):
+                self._set_state(OPEN)
+
+    def status(self) -> dict:
+        return {
+            "state":       self.state,
+            "retry_after": round(self.retry_after(), 1) if self.state == OPEN else 0,
+            "recent_bad":  sum(self._recent),
+            "recent":      len(self._recent),
+        }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def breaker_status() -> dict[str, dict]:
+    return {name: breaker.status() for name, breaker in _breakers.items()}
+
+
+register_gauge(
+    "smartcore_circuit_state", "Circuit breaker state: 0 closed, 1 half_open, 2 open.",
+    lambda: {(name,): _STATE_VALUES[breaker.state] for name, breaker in _breakers.items()}, ("breaker",),
+)
@@ -0,0 +1,103 @@
+"""
+resilience/hedging.py
+─────────────────────
+Hedged requests for idempotent reads: if the first attempt has not
+answered after roughly the call's p95 latency, a second identical
+request is sent and whichever answers first wins (the other is
+cancelled). With the delay at p95, about one call in twenty costs an
+extra request, and the slowest tail is cut to about p95 plus one typical
+call.
+
+  latency = LatencyWindow()
+  response = await hedged(lambda: client.get(url), latency.hedge_delay(), call="lead_fetch")
+  latency.add(elapsed)
+
+Until a window has `min_samples` latencies, hedge_delay() returns the
+fallback delay. Hedges are counted in smartcore_hedge_requests_total
+{call, outcome}: fired, won (the hedge answered first) and lost; the
+win rate per call is exported as smartcore_hedge_win_ratio.
+"""
+
+import asyncio
+import threading
+from collections import deque
+from typing import Awaitable, Callable
+
+from metrics.registry import counter, register_gauge
+
+HEDGES = counter(
+    "smartcore_hedge_requests_total",
+    "Hedged second attempts by call and outcome (fired, won, lost).",
+    ("call", "outcome"),
+)
+
+
+class LatencyWindow:
+    """Recent successful latencies (seconds) of one call."""
+
+    def __init__(self, size: int = 200, min_samples: int = 20, fallback: float = 1.0, floor: float = 0.05):
+        self._samples: deque[float] = deque(maxlen=size)
+        self.min_samples = min_samples
+        self.fallback = fallback
+        self.floor = floor
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float) -> float | None:
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def hedge_delay(self) -> float:
+        p95 = self.quantile(0.95)
+        return self.fallback if p95 is None else max(self.floor, p95)
+
+
+async def hedged(send: Callable[[], Awaitable], delay: float, call: str):
+    """
+    Awaits send(); if it is still pending after `delay` seconds, also
+    awaits a second send() and returns the first result to arrive. An
+    attempt that raises only loses if the other one succeeds.
+    """
+    tasks = [asyncio.ensure_future(send())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done:
+            return tasks[0].result()
+
+        HEDGES.labels(call=call, outcome="fired").inc()
+        tasks.append(asyncio.ensure_future(send()))
+        pending, error = set(tasks), None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    HEDGES.labels(call=call, outcome="won" if task is tasks[1] else "lost").inc()
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+def _win_ratios() -> dict[tuple[str], float]:
+    counts: dict[str, dict[str, float]] = {}
+    for (call, outcome), child in list(HEDGES._children.items()):
+        counts.setdefault(call, {})[outcome] = child.value
+    return {
+        (call,): round(c.get("won", 0) / c["fired"], 4)
+        for call, c in counts.items() if c.get("fired")
+    }
+
+
+register_gauge(
+    "smartcore_hedge_win_ratio", "Share of fired hedges that answered before the first attempt, per call.",
+    _win_ratios, ("call",),
+)
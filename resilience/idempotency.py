@@ -0,0 +1,246 @@
+"""
+resilience/idempotency.py
+─────────────────────────
+Idempotent decision endpoints: a duplicate request replays the first
+response instead of recomputing it (and re-triggering outreach).
+
+The Node call service can fire triggerSmartCore several times for one call
+outcome (retries, webhook replays, overlapping status callbacks). Each
+request gets a key:
+
+  Idempotency-Key: <caller key>     → used as-is (scoped to the route)
+  otherwise                         → hash of route + lead_id + last_outcome
+                                      + last_agent (see idempotency_key);
+                                      requests without a lead_id get no key
+
+and then, per key:
+  - a stored 2xx response within the TTL is replayed byte for byte, with
+    `Idempotent-Replayed: true`
+  - a duplicate arriving while the first is still computing waits for it
+    (up to SMARTCORE_IDEMPOTENCY_WAIT_S) and gets the same response
+  - a caller key reused with a different body is rejected with 422
+  - errors are not stored, so a retry after a failure computes afresh
+
+Completed responses live in a bounded in-process LRU. With a shared state
+backend (SMARTCORE_STATE_BACKEND=sqlite|redis) they are also written
+there, and a short lock makes duplicates landing on other workers wait
+for the first one instead of computing in parallel.
+
+Environment variables:
+  SMARTCORE_IDEMPOTENCY_TTL_S        — how long responses replay (default 300)
+  SMARTCORE_IDEMPOTENCY_MAX_ENTRIES  — in-process LRU size (default 10000)
+  SMARTCORE_IDEMPOTENCY_WAIT_S       — max wait on an in-flight twin (default 10)
+"""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from fastapi import HTTPException, Request
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+
+from metrics.registry import counter
+from state.backends import get_backend
+
+TTL_SECONDS = float(os.environ.get("SMARTCORE_IDEMPOTENCY_TTL_S", "300"))
+MAX_ENTRIES = int(os.environ.get("SMARTCORE_IDEMPOTENCY_MAX_ENTRIES", "10000"))
+WAIT_SECONDS = float(os.environ.get("SMARTCORE_IDEMPOTENCY_WAIT_S", "10"))
+
+HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+# Headers recomputed by Starlette when a stored response is rebuilt
+_DROP_HEADERS = {"content-length", "date", "server"}
+_SHARED_POLL_SECONDS = 0.02
+
+IDEMPOTENCY_REQUESTS = counter(
+    "smartcore_idempotency_requests_total",
+    "Keyed decision requests by route and outcome (computed/replayed/waited/conflict).",
+    ("route", "outcome"),
+)
+
+
+def idempotency_key(request: Request, lead_id: str | None, *parts) -> str | None:
+    """
+    The request's idempotency key: the caller's header if given, else a
+    hash of the route, lead_id and the other identifying parts.
+    """
+    route = request.url.path
+    caller_key = request.headers.get(HEADER)
+    if caller_key:
+        return f"caller:{route}:{caller_key.strip()[:200]}"
+    if not lead_id:
+        return None
+    raw = "\x1f".join(str(p) for p in (route, lead_id, *parts))
+    return "derived:" + hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+class _Record:
+    __slots__ = ("status", "headers", "body", "fingerprint", "expires")
+
+    def __init__(self, status: int, headers: list[tuple[str, str]], body: bytes, fingerprint: str, expires: float):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.fingerprint = fingerprint
+        self.expires = expires
+
+    def to_shared(self) -> dict:
+        return {"status": self.status, "headers": self.headers, "body": self.body.decode("utf-8"),
+                "fingerprint": self.fingerprint, "expires": self.expires}
+
+    @classmethod
+    def from_shared(cls, value: dict) -> "_Record":
+        return cls(value["status"], [tuple(h) for h in value["headers"]], value["body"].encode("utf-8"),
+                   value["fingerprint"], value["expires"])
+
+    def replay(self) -> Response:
+        response = Response(content=self.body, status_code=self.status)
+        response.headers.update({k: v for k, v in self.headers if k not in _DROP_HEADERS})
+        response.headers[REPLAYED_HEADER] = "true"
+        return response
+
+
+class IdempotencyStore:
+    def __init__(self, ttl: float = TTL_SECONDS, max_entries: int = MAX_ENTRIES, shared=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._done: OrderedDict[str, _Record] = OrderedDict()
+        self._inflight: dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self._shared = shared
+
+    def _lookup(self, key: str) -> _Record | None:
+        with self._lock:
+            record = self._done.get(key)
+            if record is not None:
+                if record.expires > time.time():
+                    self._done.move_to_end(key)
+                    return record
+                del self._done[key]
+        if self._shared is not None:
+            value = self._shared.get(f"done:{key}")
+            if value is not None:
+                return _Record.from_shared(value)
+        return None
+
+    def _store(self, key: str, record: _Record) -> None:
+        with self._lock:
+            self._done[key] = record
+            self._done.move_to_end(key)
+            while len(self._done) > self.max_entries:
+                self._done.popitem(last=False)
+        if self._shared is not None:
+            self._shared.set(f"done:{key}", record.to_shared(), ttl=self.ttl)
+
+    async def _wait_shared(self, key: str) -> _Record | None:
+        """Waits for another worker holding the lock on `key` to finish."""
+        deadline = time.monotonic() + WAIT_SECONDS
+        while time.monotonic() < deadline:
+            await asyncio.sleep(_SHARED_POLL_SECONDS)
+            record = self._lookup(key)
+            if record is not None:
+                return record
+            if self._shared.get(f"lock:{key}") is None:
+                return None  # the other worker failed; compute here
+        return None
+
+    async def run(self, request: Request, key: str, compute) -> Response:
+        route = request.url.path
+        fingerprint = hashlib.blake2b(await request.body(), digest_size=16).hexdigest()
+
+        record = self._lookup(key)
+        if record is None:
+            with self._lock:
+                future = self._inflight.get(key)
+                owner = future is None
+                if owner:
+                    future = self._inflight[key] = concurrent.futures.Future()
+            if not owner:
+                try:
+                    # shield: a waiter giving up must not cancel the owner's future
+                    record = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), WAIT_SECONDS)
+                except asyncio.TimeoutError:
+                    record = None
+                if record is None:  # first attempt failed / timed out: compute ourselves
+                    return await self._compute(request, key, fingerprint, compute, concurrent.futures.Future())
+                self._check(record, key, fingerprint, route)
+                IDEMPOTENCY_REQUESTS.labels(route=route, outcome="waited").inc()
+                return record.replay()
+            return await self._compute(request, key, fingerprint, compute, future)
+
+        self._check(record, key, fingerprint, route)
+        IDEMPOTENCY_REQUESTS.labels(route=route, outcome="replayed").inc()
+        return record.replay()
+
+    def _check(self, record: _Record, key: str, fingerprint: str, route: str) -> None:
+        if key.startswith("caller:") and record.fingerprint != fingerprint:
+            IDEMPOTENCY_REQUESTS.labels(route=route, outcome="conflict").inc()
+            raise HTTPException(status_code=422, detail=f"{HEADER} was already used with a different request body")
+
+    async def _compute(self, request: Request, key: str, fingerprint: str, compute, future) -> Response:
+        route = request.url.path
+        record = None
+        locked = False
+        lock_token = f"{os.getpid()}:{uuid.uuid4().hex}"
+        try:
+            if self._shared is not None:
+                locked = self._shared.compare_and_swap(f"lock:{key}", None, lock_token, ttl=WAIT_SECONDS)
+                if not locked:
+                    record = await self._wait_shared(key)
+                    if record is not None:
+                        self._check(record, key, fingerprint, route)
+                        IDEMPOTENCY_REQUESTS.labels(route=route, outcome="waited").inc()
+                        return record.replay()
+
+            result = await compute()
+            response = result if isinstance(result, Response) else _render(request, result)
+            if 200 <= response.status_code < 300:
+                record = _Record(response.status_code, list(response.headers.items()), response.body,
+                                 fingerprint, time.time() + self.ttl)
+                self._store(key, record)
+            IDEMPOTENCY_REQUESTS.labels(route=route, outcome="computed").inc()
+            return response
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+            if not future.done():
+                future.set_result(record)
+            if locked:
+                self._shared.compare_and_delete(f"lock:{key}", lock_token)
+
+
+def _render(request: Request, result) -> Response:
+    """Renders a plain endpoint result the way the app would."""
+    response_class = request.app.router.default_response_class
+    if isinstance(response_class, DefaultPlaceholder):  # FastAPI's Default(...) wrapper
+        response_class = response_class.value
+    response_class = response_class or JSONResponse
+    return response_class(jsonable_encoder(result))
+
+
+def _shared_backend():
+    if os.environ.get("SMARTCORE_STATE_BACKEND", "memory") == "memory":
+        return None  # the in-process LRU already covers a single worker
+    return get_backend("idempotency")
+
+
+idempotency_store = IdempotencyStore(shared=_shared_backend())
+
+
+async def idempotent(request: Request, key: str | None, compute) -> Response:
+    """
+    Runs `compute` (an async, zero-argument callable returning the
+    endpoint's result) at most once per key within the TTL.
+    """
+    if key is None:
+        return await compute()
+    return await idempotency_store.run(request, key, compute)
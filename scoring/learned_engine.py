@@ -0,0 +1,204 @@
+"""
+scoring/learned_engine.py
+─────────────────────────
+Learned scoring engine: a logistic model over the same signals the rule
+engine (scoring_engine.score_lead) awards points for, trained offline on
+closed-won / lost history with `python -m scoring.train`.
+
+  score = round(100 · sigmoid(features · weights + bias))
+
+and the same bands as the rules turn the score into intent_level,
+signal_strength, recommended_action and call_decision, so callers get
+the rule engine's result shape whichever engine produced it.
+
+Inference is batched: leads are turned into a 0/1 feature matrix (one
+byte per feature) and scored with one matrix-vector product in NumPy, so
+past a few dozen leads the per-lead cost is the feature extraction and
+the result dicts, not the model.
+
+Weights live in an .npz file (weights, bias, feature names, training
+metadata). The file is loaded on first use and reloaded when it changes
+on disk; a file trained on a different feature list is refused rather
+than silently misread.
+
+Environment variables:
+  SMARTCORE_SCORING_MODEL   — weights file (default "scoring_model.npz")
+  SMARTCORE_SCORING_ENGINE  — engine when a request does not choose one:
+                              "rules" (default) or "learned"
+"""
+
+import os
+import threading
+
+import numpy as np
+
+from metrics.registry import STAGE_SECONDS, timed
+from models.lead_model import LeadData
+from scoring.scoring_engine import (
+    BROKER_DOMAIN_KEYS,
+    BROKER_KEYWORDS,
+    DECISION_MAKERS,
+    SCORE_BANDS,
+    SENIOR_TITLE_KEYWORDS,
+    _norm,
+    _region_from_country,
+    score_lead,
+)
+
+MODEL_PATH = os.environ.get("SMARTCORE_SCORING_MODEL", "scoring_model.npz")
+DEFAULT_ENGINE = os.environ.get("SMARTCORE_SCORING_ENGINE", "rules")
+
+ENGINES = ("rules", "learned")
+
+# One 0/1 feature per rule-engine signal, in lead_features() order
+FEATURES = (
+    "region_uk", "region_dubai", "region_nigeria", "region_other",
+    "industry_fx", "industry_sme", "industry_b2b", "industry_other",
+    "broker_company", "broker_email_domain", "senior_title", "decision_maker",
+    "email_opened", "link_clicked", "whatsapp_replied",
+    "volume_over_100", "volume_30_to_100", "business_size_6_plus",
+    "budget_ready", "stated_challenges", "warm_lead_source", "warm_entry_channel",
+)
+
+_FX_INDUSTRIES = {"fx/crypto", "fx", "cfd", "brokerage"}
+_WARM_SOURCES = {"partner", "inbound demo", "website", "referral"}
+_WARM_CHANNELS = {"dm", "website", "referral"}
+_SIZES_6_PLUS = {"6-20", "21-50", "51+"}
+
+# Band lower bounds ascending, for np.searchsorted
+_FLOORS = np.array([band[0] for band in reversed(SCORE_BANDS)][1:])
+_BANDS = tuple(reversed(SCORE_BANDS))
+
+
+class ModelUnavailable(Exception):
+    pass
+
+
+def lead_features(lead: LeadData) -> bytes:
+    """The lead's FEATURES as one byte each (0/1)."""
+    country_region = _norm(lead.country_region)
+    if not country_region:
+        country_region = _region_from_country(_norm(lead.country))
+    industry = _norm(lead.industry_type)
+    company = _norm(lead.company)
+    email = _norm(lead.email)
+    title = _norm(lead.title)
+    volume = lead.monthly_lead_volume or 0
+
+    domain_broker = False
+    if "@" in email:
+        domain = email.split("@", 1)[1].replace(".", "").replace("-", "")
+        domain_broker = any(k in domain for k in BROKER_DOMAIN_KEYS)
+
+    return bytes((
+        country_region == "uk",
+        country_region == "dubai",
+        country_region == "nigeria",
+        bool(country_region) and country_region not in ("uk", "dubai", "nigeria"),
+        industry in _FX_INDUSTRIES,
+        industry == "sme",
+        industry == "b2b",
+        bool(industry) and industry not in _FX_INDUSTRIES and industry not in ("sme", "b2b"),
+        any(k in company for k in BROKER_KEYWORDS),
+        domain_broker,
+        any(k in title for k in SENIOR_TITLE_KEYWORDS),
+        _norm(lead.decision_level) in DECISION_MAKERS,
+        bool(lead.email_opened),
+        bool(lead.link_clicked),
+        bool(lead.whatsapp_replied),
+        volume > 100,
+        30 <= volume <= 100,
+        lead.business_size in _SIZES_6_PLUS,
+        _norm(lead.budget_readiness) == "yes",
+        bool(_norm(lead.current_challenges)),
+        _norm(lead.lead_source) in _WARM_SOURCES,
+        _norm(lead.entry_channel) in _WARM_CHANNELS,
+    ))
+
+
+def featurize(leads: list[LeadData]) -> np.ndarray:
+    """(n, len(FEATURES)) uint8 matrix."""
+    raw = b"".join(lead_features(lead) for lead in leads)
+    return np.frombuffer(raw, dtype=np.uint8).reshape(len(leads), len(FEATURES))
+
+
+class LearnedModel:
+    def __init__(self, weights: np.ndarray, bias: float, meta: dict | None = None):
+        if weights.shape != (len(FEATURES),):
+            raise ModelUnavailable(f"expected {len(FEATURES)} weights, got {weights.shape}")
+        self.weights = weights.astype(np.float64)
+        self.bias = float(bias)
+        self.meta = meta or {}
+
+    @classmethod
+    def load(cls, path: str) -> "LearnedModel":
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                names = tuple(str(n) for n in data["feature_names"])
+                if names != FEATURES:
+                    raise ModelUnavailable(f"{path} was trained on a different feature list; retrain it")
+                meta = {k[len("meta_"):]: data[k].item() for k in data.files if k.startswith("meta_")}
+                return cls(data["weights"], data["bias"].item(), meta)
+        except FileNotFoundError:
+            raise ModelUnavailable(f"no learned scoring model at {path}; train one with python -m scoring.train")
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, weights=self.weights, bias=np.float64(self.bias), feature_names=np.array(FEATURES),
+                 **{f"meta_{k}": np.array(v) for k, v in self.meta.items()})
+        os.replace(tmp, path)
+
+    def probabilities(self, features: np.ndarray) -> np.ndarray:
+        return 1.0 / (1.0 + np.exp(-(features @ self.weights + self.bias)))
+
+    def scores(self, features: np.ndarray) -> np.ndarray:
+        return np.rint(self.probabilities(features) * 100).astype(np.int64)
+
+    @timed(STAGE_SECONDS, stage="score_leads_learned")
+    def score_batch(self, leads: list[LeadData]) -> list[dict]:
+        if not leads:
+            return []
+        scores = self.scores(featurize(leads))
+        bands = np.searchsorted(_FLOORS, scores, side="right")
+        results = []
+        for score, band in zip(scores.tolist(), bands.tolist()):
+            _, intent, action, decision, strength = _BANDS[band]
+            results.append({
+                "score": score,
+                "intent_level": intent,
+                "signal_strength": strength,
+                "recommended_action": action,
+                "call_decision": decision,
+            })
+        return results
+
+
+# ── Process-wide model, reloaded when the file changes ─────────────────────
+_loaded: dict = {"mtime": None, "model": None}
+_load_lock = threading.Lock()
+
+
+def get_model(path: str = MODEL_PATH) -> LearnedModel:
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        raise ModelUnavailable(f"no learned scoring model at {path}; train one with python -m scoring.train")
+    if _loaded["mtime"] != mtime:
+        with _load_lock:
+            if _loaded["mtime"] != mtime:
+                _loaded["model"] = LearnedModel.load(path)
+                _loaded["mtime"] = mtime
+    return _loaded["model"]
+
+
+def score_leads(leads: list[LeadData], engine: str | None = None) -> list[dict]:
+    """Scores a batch with the chosen engine (DEFAULT_ENGINE when None)."""
+    engine = engine or DEFAULT_ENGINE
+    if engine == "learned":
+        return get_model().score_batch(leads)
+    if engine == "rules":
+        return [score_lead(lead) for lead in leads]
+    raise ValueError(f"unknown scoring engine {engine!r}; choose from {', '.join(ENGINES)}")
@@ -0,0 +1,93 @@
+"""
+scoring/score_store.py
+──────────────────────
+Latest known scoring result per lead, keyed by Zoho lead id.
+
+Anything that rescores a lead with a known id (Zoho notifications, the
+decision endpoints) records the result here. Other subsystems subscribe
+with add_listener() to keep their own views (indexes, stats, pushes) in
+step without re-reading Zoho.
+
+Entries live in the shared state backend (state/backends.py, namespace
+"lead_state"), so with a sqlite/redis backend every worker sees the same
+latest scores. Listeners still run only in the process that recorded.
+
+Listeners are called as fn(entry, previous):
+  entry    — the new state dict, or None when the lead was removed
+  previous — the state dict it replaced, or None for a new lead
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Callable
+
+from models.lead_model import LeadData
+from state.backends import get_backend
+from state.snapshots import register_namespace
+
+logger = logging.getLogger(__name__)
+
+# ── Lead state (lead_id → latest entry) ─────────────────────────────────────
+_lead_state = get_backend("lead_state")
+register_namespace(_lead_state)
+
+_listeners: list[Callable[[dict | None, dict | None], None]] = []
+
+
+def add_listener(fn: Callable[[dict | None, dict | None], None]) -> None:
+    """Registers a callback fired after every record/forget."""
+    if fn not in _listeners:
+        _listeners.append(fn)
+
+
+def record_scoring(
+    lead_id: str,
+    lead: LeadData,
+    scoring_result: dict,
+    source: str,
+    routing_result: dict | None = None,
+) -> dict:
+    """
+    Stores the latest scoring (and optionally routing) result for a lead
+    and notifies listeners.
+    """
+    previous = _lead_state.get(lead_id)
+
+    entry = {
+        "lead_id":   lead_id,
+        "lead":      lead.model_dump(),
+        "scoring":   scoring_result,
+        "routing":   routing_result if routing_result is not None else (previous or {}).get("routing"),
+        "source":    source,
+        "scored_at": datetime.now(timezone.utc).isoformat(),
+    }
+    _lead_state.set(lead_id, entry)
+
+    _notify(entry, previous)
+    return entry
+
+
+def forget_lead(lead_id: str) -> None:
+    """Drops a lead (e.g. deleted in Zoho) and notifies listeners."""
+    previous = _lead_state.get(lead_id)
+    if previous is not None:
+        _lead_state.delete(lead_id)
+        _notify(None, previous)
+
+
+def get_lead_state(lead_id: str) -> dict | None:
+    return _lead_state.get(lead_id)
+
+
+def all_lead_states() -> list[dict]:
+    states = (_lead_state.get(lead_id) for lead_id in _lead_state.keys())
+    return [state for state in states if state is not None]
+
+
+def _notify(entry: dict | None, previous: dict | None) -> None:
+    # A broken listener must not stop the lead being scored
+    for fn in _listeners:
+        try:
+            fn(entry, previous)
+        except Exception:
+            logger.exception("score_store listener %r failed", fn)
@@ -1,4 +1,6 @@
 from models.lead_model import LeadData
+from metrics.registry import STAGE_SECONDS, timed
+from startup.tables import load_table
 
 
 BROKER_KEYWORDS = {
@@ -13,10 +15,22 @@ SENIOR_TITLE_KEYWORDS = {
 DECISION_MAKERS = {"owner", "founder", "ceo", "decision maker", "decisionmaker"}
 
 
+def _rule_tables() -> dict:
+    """Lookup tables derived from the keyword sets (cached by startup/tables.py)."""
+    return {
+        # Broker keywords as they appear in an email domain with "." and "-" removed
+        "broker_domain_keys": sorted({k.replace(" ", "") for k in BROKER_KEYWORDS}),
+    }
+
+
+BROKER_DOMAIN_KEYS = tuple(load_table("scoring_rules", _rule_tables)["broker_domain_keys"])
+
+
 def _norm(s: str | None) -> str:
     return (s or "").strip().lower()
 
 
+@timed(STAGE_SECONDS, stage="score_lead")
 def score_lead(lead: LeadData) -> dict:
     score = 0
 
@@ -36,12 +50,7 @@ def score_lead(lead: LeadData) -> dict:
     # 0) Normalise region if missing
     # -------------------------
     if not country_region and country:
-        if "united kingdom" in country or country == "uk" or "england" in country:
-            country_region = "uk"
-        elif "dubai" in country or "uae" in country or "united arab emirates" in country:
-            country_region = "dubai"
-        elif "nigeria" in country:
-            country_region = "nigeria"
+        country_region = _region_from_country(country)
 
     # -------------------------
     # 1) Region score
@@ -76,8 +85,8 @@ def score_lead(lead: LeadData) -> dict:
 
     # Email domain keyword match
     if "@" in email:
-        domain = email.split("@", 1)[1]
-        if any(k.replace(" ", "") in domain.replace(".", "").replace("-", "") for k in BROKER_KEYWORDS):
+        domain = email.split("@", 1)[1].replace(".", "").replace("-", "")
+        if any(k in domain for k in BROKER_DOMAIN_KEYS):
             score += 10
 
     # Seniority/title match
@@ -136,32 +145,7 @@ def score_lead(lead: LeadData) -> dict:
     # Cap at 100
     score = min(score, 100)
 
-    # Intent classification
-    if score >= 80:
-        intent = "Hot"
-        recommended_action = "Call Now"
-        call_decision = "call_now"
-    elif score >= 50:
-        intent = "Warm"
-        recommended_action = "Nurture + Call Later"
-        call_decision = "call_after_intake"
-    elif score >= 30:
-        intent = "Cold"
-        recommended_action = "Long Nurture"
-        call_decision = "no_call_for_now"
-    else:
-        intent = "Cold"
-        recommended_action = "Low Priority / Disqualify"
-        call_decision = "no_call"
-
-    # Signal strength
-    if score >= 80:
-        signal_strength = "High"
-    elif score >= 50:
-        signal_strength = "Medium"
-    else:
-        signal_strength = "Low"
-
+    intent, recommended_action, call_decision, signal_strength = classify_score(score)
     return {
         "score": score,
         "intent_level": intent,
@@ -169,3 +153,43 @@ def score_lead(lead: LeadData) -> dict:
         "recommended_action": recommended_action,
         "call_decision": call_decision,
     }
+
+
+# Score bands: (min score, intent, recommended action, call decision, signal strength)
+SCORE_BANDS = (
+    (80, "Hot",  "Call Now",                  "call_now",          "High"),
+    (50, "Warm", "Nurture + Call Later",      "call_after_intake", "Medium"),
+    (30, "Cold", "Long Nurture",              "no_call_for_now",   "Low"),
+    (0,  "Cold", "Low Priority / Disqualify", "no_call",           "Low"),
+)
+
+
+def classify_score(score: int) -> tuple[str, str, str, str]:
+    """(intent_level, recommended_action, call_decision, signal_strength) for a 0–100 score."""
+    for floor, intent, action, decision, strength in SCORE_BANDS:
+        if score >= floor:
+            return intent, action, decision, strength
+    return SCORE_BANDS[-1][1:]
+
+
+def lead_region(country_region: str | None, country: str | None = None) -> str:
+    """
+    Canonical region for indexes, segment stats and the archive: the
+    normalised country_region, or — like score_lead — the region derived
+    from country when it is empty. Known spellings ("UK", "United Kingdom")
+    collapse to one value; "" when nothing is known.
+    """
+    region = _norm(country_region)
+    if region:
+        return _region_from_country(region) or region
+    return _region_from_country(_norm(country))
+
+
+def _region_from_country(country: str) -> str:
+    if "united kingdom" in country or country == "uk" or "england" in country:
+        return "uk"
+    if "dubai" in country or "uae" in country or "united arab emirates" in country:
+        return "dubai"
+    if "nigeria" in country:
+        return "nigeria"
+    return ""
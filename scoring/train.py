@@ -0,0 +1,183 @@
+"""
+scoring/train.py
+────────────────
+Fits the learned scoring engine (scoring/learned_engine.py) on closed-won
+/ lost history and writes its weights file.
+
+  python -m scoring.train --data history.jsonl                   # → scoring_model.npz
+  python -m scoring.train --data zoho_export.csv --zoho --label Lead_Status --positive Converted
+  python -m scoring.train --synthetic 50000 --out /tmp/demo.npz  # try the pipeline end to end
+
+--data is JSON lines or CSV, one lead per row, in LeadData shape (or the
+raw Zoho record shape with --zoho) plus a label column. A row counts as
+won when its label is one of --positive (case-insensitive).
+
+--synthetic labels bench/synthetic.py leads by sampling from the rule
+score — it exercises training and serving, it does not learn anything
+the rules do not already know.
+
+The model is L2-regularised logistic regression fitted by Newton's
+method (a couple of dozen weights, so each step is a tiny linear solve).
+A random --holdout share of rows is kept out of the fit and used to
+report AUC and log loss for the model and, as the baseline to beat, the
+rule engine's score.
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+
+import numpy as np
+
+from models.lead_model import LeadData
+from scoring.learned_engine import FEATURES, MODEL_PATH, LearnedModel, featurize
+from scoring.scoring_engine import score_lead
+
+DEFAULT_POSITIVE = "1,true,yes,won,closed won,closed-won,converted"
+
+
+def fit_logistic(x: np.ndarray, y: np.ndarray, l2: float = 1.0, max_iter: int = 50) -> tuple[np.ndarray, float]:
+    """Newton / IRLS; the bias is not regularised."""
+    design = np.hstack([x.astype(np.float64), np.ones((len(x), 1))])
+    beta = np.zeros(design.shape[1])
+    penalty = np.full(design.shape[1], l2)
+    penalty[-1] = 0.0
+    for _ in range(max_iter):
+        p = 1.0 / (1.0 + np.exp(-(design @ beta)))
+        gradient = design.T @ (p - y) + penalty * beta
+        hessian = (design * (p * (1 - p))[:, None]).T @ design + np.diag(penalty) + 1e-9 * np.eye(len(beta))
+        step = np.linalg.solve(hessian, gradient)
+        beta -= step
+        if np.max(np.abs(step)) < 1e-8:
+            break
+    return beta[:-1], float(beta[-1])
+
+
+def auc(scores: np.ndarray, y: np.ndarray) -> float | None:
+    """Rank-based ROC AUC (ties count half)."""
+    positives = int(y.sum())
+    negatives = len(y) - positives
+    if not positives or not negatives:
+        return None
+    order = np.argsort(scores, kind="mergesort")
+    ranks = np.empty(len(scores))
+    sorted_scores = scores[order]
+    # average ranks over ties
+    _, starts, counts = np.unique(sorted_scores, return_index=True, return_counts=True)
+    for start, count in zip(starts, counts):
+        ranks[order[start:start + count]] = start + (count + 1) / 2
+    return float((ranks[y == 1].sum() - positives * (positives + 1) / 2) / (positives * negatives))
+
+
+def log_loss(p: np.ndarray, y: np.ndarray) -> float:
+    p = np.clip(p, 1e-12, 1 - 1e-12)
+    return float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p)))
+
+
+def _read_rows(path: str) -> list[dict]:
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def load_history(path: str, label: str, positive: set[str], zoho: bool) -> tuple[list[LeadData], np.ndarray]:
+    if zoho:
+        from zoho.zoho_client import lead_data_from_record
+        to_lead = lead_data_from_record
+    else:
+        fields = set(LeadData.model_fields)
+        to_lead = lambda row: LeadData.model_validate(  # noqa: E731
+            {k: v for k, v in row.items() if k in fields and v not in ("", None)})
+
+    leads, labels, skipped = [], [], 0
+    for row in _read_rows(path):
+        if row.get(label) in (None, ""):
+            skipped += 1
+            continue
+        try:
+            leads.append(to_lead(row))
+        except ValueError:
+            skipped += 1
+            continue
+        labels.append(str(row[label]).strip().lower() in positive)
+    if skipped:
+        print(f"skipped {skipped} rows without a label or with invalid fields", file=sys.stderr)
+    return leads, np.array(labels, dtype=np.float64)
+
+
+def synthetic_history(n: int, seed: int) -> tuple[list[LeadData], np.ndarray]:
+    from bench.synthetic import make_lead_dicts
+    leads = [LeadData.model_validate(d) for d in make_lead_dicts(n, seed)]
+    rule_scores = np.array([score_lead(lead)["score"] for lead in leads], dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    won = rng.random(n) < 1.0 / (1.0 + np.exp(-(rule_scores - 75) / 8))
+    return leads, won.astype(np.float64)
+
+
+def train(leads: list[LeadData], y: np.ndarray, l2: float, holdout: float, seed: int) -> tuple[LearnedModel, dict]:
+    x = featurize(leads)
+    rng = np.random.default_rng(seed)
+    test = rng.random(len(leads)) < holdout
+    if not test.any() or test.all():
+        test = np.zeros(len(leads), dtype=bool)  # too few rows to hold any out
+
+    weights, bias = fit_logistic(x[~test], y[~test], l2=l2)
+    model = LearnedModel(weights, bias)
+
+    report = {"rows": len(leads), "train_rows": int((~test).sum()), "won_rate": round(float(y.mean()), 4)}
+    if test.any():
+        p = model.probabilities(x[test])
+        rules = np.array([score_lead(lead)["score"] for lead, t in zip(leads, test) if t], dtype=np.float64)
+        report.update({
+            "holdout_rows":     int(test.sum()),
+            "holdout_auc":      auc(p, y[test]),
+            "holdout_log_loss": round(log_loss(p, y[test]), 4),
+            "rules_auc":        auc(rules, y[test]),
+        })
+    model.meta = {
+        "trained_at": time.time(),
+        "l2":         l2,
+        **{k: v for k, v in report.items() if v is not None},
+    }
+    return model, report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Train the SmartCore learned scoring engine.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--data", help="History as .jsonl or .csv")
+    source.add_argument("--synthetic", type=int, metavar="N", help="Train on N synthetic leads instead")
+    parser.add_argument("--zoho", action="store_true", help="Rows are raw Zoho lead records")
+    parser.add_argument("--label", default="won", help="Outcome column (default 'won')")
+    parser.add_argument("--positive", default=DEFAULT_POSITIVE, help="Comma-separated label values meaning won")
+    parser.add_argument("--l2", type=float, default=1.0, help="L2 penalty on the weights")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Share of rows held out for evaluation")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default=MODEL_PATH)
+    args = parser.parse_args()
+
+    if args.data:
+        positive = {v.strip().lower() for v in args.positive.split(",")}
+        leads, y = load_history(args.data, args.label, positive, args.zoho)
+    else:
+        leads, y = synthetic_history(args.synthetic, args.seed)
+    if not len(leads) or y.min() == y.max():
+        parser.error("need both won and lost rows to train")
+
+    model, report = train(leads, y, args.l2, args.holdout, args.seed)
+    model.save(args.out)
+
+    print(json.dumps(report, indent=2))
+    print("\nweights")
+    for name, weight in sorted(zip(FEATURES, model.weights), key=lambda fw: -abs(fw[1])):
+        print(f"  {name:<24}{weight:>8.3f}")
+    print(f"  {'(bias)':<24}{model.bias:>8.3f}")
+    print(f"\nSaved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+security/admin_key.py
+─────────────────────
+Shared-secret check for operator endpoints — the ones that make
+SmartCore act on the outside world (send outbound messages, flush the
+dispatch queue, re-point CRM webhooks). Same scheme as the profiling
+key: the caller sends the key in X-SmartCore-Admin-Key, compared in
+constant time; a wrong or missing key is a 403.
+
+With SMARTCORE_ADMIN_KEY unset these endpoints are closed to everyone.
+
+  @router.post("/release", dependencies=[Depends(require_admin_key)])
+
+Environment variables:
+  SMARTCORE_ADMIN_KEY  — key expected in X-SmartCore-Admin-Key
+"""
+
+import hmac
+import os
+
+from fastapi import Header, HTTPException
+
+ADMIN_KEY = os.environ.get("SMARTCORE_ADMIN_KEY")
+
+
+def admin_key_matches(value: str | None) -> bool:
+    return bool(ADMIN_KEY) and value is not None and hmac.compare_digest(value, ADMIN_KEY)
+
+
+def require_admin_key(x_smartcore_admin_key: str | None = Header(default=None)) -> None:
+    """FastAPI dependency: 403 unless X-SmartCore-Admin-Key matches SMARTCORE_ADMIN_KEY."""
+    if not admin_key_matches(x_smartcore_admin_key):
+        raise HTTPException(status_code=403, detail="Admin key required")
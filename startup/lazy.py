@@ -0,0 +1,130 @@
+"""
+startup/lazy.py
+───────────────
+Deferred routers for fast cold starts.
+
+With SMARTCORE_LAZY_STARTUP=1, routers registered through include_router()
+are not imported at startup. A LazyRouter placeholder holds their prefix;
+the first request under that prefix imports the module and is served by
+the real routes, and startup/warmup.py imports every deferred router in
+the background shortly after the port opens, then swaps the placeholders
+for the real routes so /docs and /openapi.json are complete again.
+
+Without the variable, include_router() imports and includes eagerly,
+exactly like app.include_router().
+
+Environment variables:
+  SMARTCORE_LAZY_STARTUP  — "1" to defer routers until first use / warm-up
+"""
+
+import importlib
+import logging
+import os
+import threading
+import time
+
+from fastapi import APIRouter, FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound, get_route_path
+
+logger = logging.getLogger(__name__)
+
+LAZY_STARTUP = os.environ.get("SMARTCORE_LAZY_STARTUP") == "1"
+
+
+class LazyRouter(BaseRoute):
+    """Placeholder route for a router imported on first use."""
+
+    def __init__(self, target: str, prefix: str):
+        self.target = target  # "package.module:attribute"
+        self.prefix = prefix
+        self.load_ms: float | None = None
+        self._router: APIRouter | None = None
+        self._routes: list[BaseRoute] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._routes is not None
+
+    def load(self) -> APIRouter:
+        """Imports the router (once; safe to call from a warm-up thread)."""
+        if self._router is None:
+            with self._lock:
+                if self._router is None:
+                    started = time.perf_counter()
+                    module, _, attribute = self.target.partition(":")
+                    router = getattr(importlib.import_module(module), attribute)
+                    # Included the way app.include_router() would, so route
+                    # classes, tags and effective route context carry over
+                    holder = APIRouter()
+                    holder.include_router(router)
+                    self._routes = holder.routes
+                    self._router = router
+                    self.load_ms = (time.perf_counter() - started) * 1000
+                    logger.info("Loaded %s in %.1f ms", self.target, self.load_ms)
+        return self._router
+
+    def matches(self, scope) -> tuple[Match, dict]:
+        if scope["type"] not in ("http", "websocket"):
+            return Match.NONE, {}
+        path = get_route_path(scope)
+        if path != self.prefix and not path.startswith(self.prefix + "/"):
+            return Match.NONE, {}
+
+        self.load()
+        partial = None
+        for route in self._routes:
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                return match, {"route": route, **child_scope}
+            if match == Match.PARTIAL and partial is None:
+                partial = {"route": route, **child_scope}
+        if partial is not None:
+            return Match.PARTIAL, partial
+        return Match.NONE, {}
+
+    async def handle(self, scope, receive, send) -> None:
+        # matches() put the real route in the child scope
+        await scope["route"].handle(scope, receive, send)
+
+    def url_path_for(self, name: str, /, **path_params):
+        self.load()
+        for route in self._routes:
+            try:
+                return route.url_path_for(name, **path_params)
+            except NoMatchFound:
+                continue
+        raise NoMatchFound(name, path_params)
+
+
+def include_router(app: FastAPI, target: str, prefix: str) -> None:
+    """
+    app.include_router() for "module:attribute", deferred when
+    SMARTCORE_LAZY_STARTUP=1. `prefix` is the router's own prefix.
+    """
+    if not LAZY_STARTUP:
+        module, _, attribute = target.partition(":")
+        app.include_router(getattr(importlib.import_module(module), attribute))
+        return
+    app.router.routes.append(LazyRouter(target, prefix))
+
+
+def lazy_routers(app: FastAPI) -> list[LazyRouter]:
+    return [route for route in app.router.routes if isinstance(route, LazyRouter)]
+
+
+def materialise(app: FastAPI) -> int:
+    """
+    Replaces loaded placeholders with the real routes, in place. Must run
+    on the event loop thread (the router list is iterated there).
+    """
+    replaced = 0
+    for placeholder in lazy_routers(app):
+        if not placeholder.loaded:
+            continue
+        index = app.router.routes.index(placeholder)
+        app.router.routes[index:index + 1] = placeholder._routes
+        replaced += 1
+    if replaced:
+        app.openapi_schema = None  # regenerate with the real routes
+    return replaced
@@ -0,0 +1,155 @@
+"""
+startup/report.py
+─────────────────
+Where SmartCore's cold start goes, and a budget gate for it.
+
+  python -m startup.report                          # eager vs lazy, 5 runs each
+  python -m startup.report --mode lazy --top 25
+  python -m startup.report --mode lazy --budget-ms 400   # exit 1 if over budget
+  python -m startup.report --out startup.json
+
+Every run is a fresh interpreter (`python -X importtime`), so module caches
+in this process never flatter the numbers. For each mode it reports:
+
+  phases     imports before main (site, .pth files), `import main`,
+             lifespan startup, background warm-up
+             (median over --runs)
+  packages   self import time under `import main`, per top-level package
+  modules    heaviest modules under `import main` by cumulative time, first run
+
+--budget-ms gates the median `import main` time of the checked mode(s),
+so CI catches a new eager import before a deploy pays for it.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+# Runs in the child: times the phases after import main
+_PHASES = """
+import asyncio, json, time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+
+async def lifespan():
+    from startup.warmup import warmup_report
+    async with main.app.router.lifespan_context(main.app):
+        t2 = time.perf_counter()
+        while warmup_report()["state"] != "done":
+            await asyncio.sleep(0.005)
+        t3 = time.perf_counter()
+    return t2, t3
+
+t2, t3 = asyncio.run(lifespan())
+print("PHASES " + json.dumps({
+    "import_main_ms": (t1 - t0) * 1000,
+    "lifespan_ms":    (t2 - t1) * 1000,
+    "warmup_ms":      (t3 - t2) * 1000,
+}))
+"""
+
+
+def _run_once(lazy: bool) -> tuple[dict, list[tuple[str, int, int, int]]]:
+    env = {**os.environ, "SMARTCORE_LAZY_STARTUP": "1" if lazy else "0"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PHASES],
+        capture_output=True, text=True, env=env, cwd=os.getcwd(), check=True,
+    )
+    phases = {}
+    for line in proc.stdout.splitlines():
+        if line.startswith("PHASES "):
+            phases = json.loads(line[len("PHASES "):])
+
+    # stderr lines: "import time: <self us> | <cumulative us> | <indent><module>"
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+
+    # importtime lists a module after everything it imported, so the lines
+    # up to "main" are site startup + main's tree; later ones are warm-up
+    names = [m[0] for m in modules]
+    end = names.index("main") + 1 if "main" in names else len(modules)
+    start = next((i for i in range(end - 2, -1, -1) if modules[i][3] == 0), -1) + 1
+    phases["pre_main_imports_ms"] = sum(m[1] for m in modules[:start]) / 1000
+    return phases, modules[start:end]
+
+
+def _package_totals(modules: list) -> dict[str, float]:
+    totals: dict[str, float] = defaultdict(float)
+    for name, self_us, _, _ in modules:
+        totals[name.split(".")[0]] += self_us / 1000
+    return dict(sorted(totals.items(), key=lambda kv: kv[1], reverse=True))
+
+
+def profile_mode(lazy: bool, runs: int) -> dict:
+    samples, modules = [], []
+    for i in range(runs):
+        phases, mods = _run_once(lazy)
+        samples.append(phases)
+        if i == 0:
+            modules = mods
+    phases = {key: round(statistics.median(s[key] for s in samples if s.get(key) is not None), 1)
+              for key in samples[0]}
+    return {
+        "mode":     "lazy" if lazy else "eager",
+        "runs":     runs,
+        "phases":   phases,
+        "packages": {k: round(v, 1) for k, v in _package_totals(modules).items()},
+        "modules":  [
+            {"module": name, "self_ms": round(s / 1000, 2), "cumulative_ms": round(c / 1000, 2)}
+            for name, s, c, _ in sorted(modules, key=lambda m: m[2], reverse=True)
+        ],
+    }
+
+
+def _print(report: dict, top: int) -> None:
+    print(f"\n== {report['mode']} startup (median of {report['runs']} runs)")
+    for key, value in report["phases"].items():
+        print(f"  {key:<22}{value:>9.1f} ms")
+    print("\n  import time by package (self)")
+    for name, ms in list(report["packages"].items())[:top]:
+        print(f"    {name:<28}{ms:>8.1f} ms")
+    print("\n  heaviest modules (cumulative, first run)")
+    for row in report["modules"][:top]:
+        print(f"    {row['module']:<40}{row['cumulative_ms']:>8.1f} ms  (self {row['self_ms']:.1f})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SmartCore startup time report and budget gate.")
+    parser.add_argument("--mode", choices=["eager", "lazy", "both"], default="both")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, help="Fail if median `import main` exceeds this")
+    parser.add_argument("--out", help="Write the report JSON here")
+    args = parser.parse_args()
+
+    modes = {"eager": [False], "lazy": [True], "both": [False, True]}[args.mode]
+    reports = [profile_mode(lazy, args.runs) for lazy in modes]
+    for report in reports:
+        _print(report, args.top)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+        print(f"\nSaved {args.out}")
+
+    if args.budget_ms is not None:
+        over = [r for r in reports if r["phases"]["import_main_ms"] > args.budget_ms]
+        for r in reports:
+            verdict = "OVER" if r in over else "ok"
+            print(f"\nbudget {args.budget_ms:g} ms, {r['mode']} import main "
+                  f"{r['phases']['import_main_ms']:.1f} ms: {verdict}")
+        sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
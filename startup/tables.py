@@ -0,0 +1,163 @@
+"""
+startup/tables.py
+─────────────────
+Precompiled rule / lookup tables, cached in one memory-mapped artifact.
+
+Engines declare their tables with load_table(name, build): the builder
+returns plain data (dicts, lists, tuples, str, numbers — anything marshal
+can write). On a warm start the table is read straight out of the
+artifact through an mmap, so startup never re-runs the builder; on a cold
+or stale one the builder runs in-process and the artifact is rewritten by
+the background warm-up (startup/warmup.py) or at build time:
+
+  python -m startup.tables            # (re)build the artifact
+  python -m startup.tables --check    # exit 1 if missing or stale
+
+Each table is fingerprinted by its builder's source file (size + mtime)
+and the artifact by Python's marshal version, so editing a rule module or
+upgrading Python invalidates exactly what it should.
+
+Environment variables:
+  SMARTCORE_TABLE_CACHE  — artifact path (default ".cache/smartcore_tables.bin")
+"""
+
+import inspect
+import logging
+import marshal
+import mmap
+import os
+import struct
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_PATH = os.environ.get("SMARTCORE_TABLE_CACHE", os.path.join(".cache", "smartcore_tables.bin"))
+
+_MAGIC = b"SCTB"
+_HEADER = struct.Struct("<4sII")  # magic, marshal/python version tag, index length
+_VERSION = marshal.version << 16 | sys.version_info.major << 8 | sys.version_info.minor
+
+# name → builder, for every table declared in this process
+_builders: dict[str, object] = {}
+# names whose artifact entry was missing or stale when loaded
+_stale: set[str] = set()
+
+_lock = threading.Lock()
+_artifact: "_Artifact | None" = None
+
+
+class _Artifact:
+    """Read-only view of the artifact file: index + mmapped payloads."""
+
+    def __init__(self, path: str):
+        self.index: dict[str, tuple[str, int, int]] = {}
+        self._base = 0
+        self._map: mmap.mmap | None = None
+        try:
+            with open(path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return  # missing or empty: every table is stale
+        try:
+            magic, version, index_len = _HEADER.unpack_from(self._map, 0)
+            if magic == _MAGIC and version == _VERSION:
+                self.index = marshal.loads(self._map[_HEADER.size:_HEADER.size + index_len])
+                self._base = _HEADER.size + index_len
+        except (struct.error, EOFError, ValueError, TypeError):
+            logger.warning("Ignoring unreadable table artifact %s", path)
+
+    def get(self, name: str, fingerprint: str):
+        entry = self.index.get(name)
+        if entry is None or entry[0] != fingerprint:
+            return None, False
+        start = self._base + entry[1]
+        return marshal.loads(self._map[start:start + entry[2]]), True
+
+
+def _fingerprint(build) -> str:
+    try:
+        stat = os.stat(inspect.getsourcefile(build))
+        return f"{build.__module__}.{build.__qualname__}:{stat.st_size}:{stat.st_mtime_ns}"
+    except (OSError, TypeError):
+        return f"{build.__module__}.{build.__qualname__}:nosource"
+
+
+def _open() -> _Artifact:
+    global _artifact
+    if _artifact is None:
+        with _lock:
+            if _artifact is None:
+                _artifact = _Artifact(ARTIFACT_PATH)
+    return _artifact
+
+
+def load_table(name: str, build):
+    """The table `name`: from the artifact if current, else build()."""
+    _builders[name] = build
+    value, hit = _open().get(name, _fingerprint(build))
+    if hit:
+        return value
+    _stale.add(name)
+    return build()
+
+
+def is_stale() -> bool:
+    return bool(_stale) or not os.path.exists(ARTIFACT_PATH)
+
+
+def write_artifact() -> int:
+    """
+    Rebuilds the artifact from every table declared in this process.
+    Returns the bytes written.
+    """
+    global _artifact
+    payloads = {name: (_fingerprint(build), marshal.dumps(build())) for name, build in _builders.items()}
+
+    # Offsets are relative to the payload area, which follows the index
+    index, offset = {}, 0
+    for name, (fingerprint, blob) in payloads.items():
+        index[name] = (fingerprint, offset, len(blob))
+        offset += len(blob)
+    index_blob = marshal.dumps(index)
+
+    directory = os.path.dirname(ARTIFACT_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{ARTIFACT_PATH}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(index_blob)))
+        f.write(index_blob)
+        for _, blob in payloads.values():
+            f.write(blob)
+    os.replace(tmp, ARTIFACT_PATH)  # atomic: readers see the old or the new file
+
+    with _lock:
+        _artifact = None
+        _stale.clear()
+    return _HEADER.size + len(index_blob) + offset
+
+
+def _import_engines() -> None:
+    """Imports the modules that declare tables (for the CLI)."""
+    import main  # noqa: F401  — registers every eagerly imported engine's tables
+
+
+def main() -> None:
+    import argparse  # CLI only; this module is on the startup path
+
+    parser = argparse.ArgumentParser(description="Build the precompiled rule / lookup table artifact.")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if the artifact is missing or stale")
+    args = parser.parse_args()
+
+    _import_engines()
+    if args.check:
+        stale = is_stale()
+        print(f"{ARTIFACT_PATH}: {'stale ' + str(sorted(_stale)) if stale else 'current'}")
+        sys.exit(1 if stale else 0)
+    size = write_artifact()
+    print(f"Wrote {ARTIFACT_PATH} ({len(_builders)} tables, {size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
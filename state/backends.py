@@ -0,0 +1,402 @@
+"""
+state/backends.py
+─────────────────
+Pluggable key/value state so caches can be shared across uvicorn workers
+and replicas.
+
+Backends (all with the same API):
+  MemoryBackend  — in-process dict; the default, same behaviour as before
+  SqliteBackend  — one SQLite file (WAL + mmap) shared by every worker on a host
+  RedisBackend   — any Redis-protocol server; python -m state.resp_standin
+                   runs a local stand-in for development
+
+API (all keys are namespaced by get_backend):
+  get(key)                               → value or None
+  set(key, value, ttl=None)              → None
+  compare_and_swap(key, expected, new, ttl=None) → bool
+      expected=None means "only if absent" (set-if-not-exists / lock)
+  compare_and_delete(key, expected)      → bool: deletes only if the value
+                                           is still `expected` (lock release)
+  delete(key)                            → None
+  keys()                                 → list of keys in the namespace
+  dump() / load(items)                   → memory backend only: (key, value,
+                                           expires_at) items for state/snapshots.py
+
+Values must be JSON-serialisable for the shared backends; the memory
+backend stores them as-is. ttl is in seconds.
+
+Environment variables:
+  SMARTCORE_STATE_BACKEND — "memory" (default), "sqlite" or "redis"
+  SMARTCORE_STATE_PATH    — SQLite file, default smartcore_state.db
+  SMARTCORE_STATE_URL     — Redis URL, default redis://127.0.0.1:6379/0
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class MemoryBackend:
+    def __init__(self):
+        self._data: dict[str, tuple[object, float | None]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            return self._get(key)
+
+    def set(self, key: str, value, ttl: float | None = None) -> None:
+        with self._lock:
+            self._data[key] = (value, time.time() + ttl if ttl else None)
+
+    def compare_and_swap(self, key: str, expected, new, ttl: float | None = None) -> bool:
+        with self._lock:
+            if self._get(key) != expected:
+                return False
+            self._data[key] = (new, time.time() + ttl if ttl else None)
+            return True
+
+    def compare_and_delete(self, key: str, expected) -> bool:
+        with self._lock:
+            if self._get(key) != expected:
+                return False
+            self._data.pop(key, None)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def keys(self, prefix: str = "") -> list[str]:
+        with self._lock:
+            now = time.time()
+            return [
+                k for k, (_, expires_at) in self._data.items()
+                if k.startswith(prefix) and (expires_at is None or expires_at > now)
+            ]
+
+    def dump(self, prefix: str = "") -> list[tuple[str, object, float | None]]:
+        """Live (key, value, expires_at) items under prefix, for snapshots."""
+        with self._lock:
+            now = time.time()
+            return [
+                (k, value, expires_at) for k, (value, expires_at) in self._data.items()
+                if k.startswith(prefix) and (expires_at is None or expires_at > now)
+            ]
+
+    def load(self, items: list[tuple[str, object, float | None]]) -> int:
+        """Restores dumped items (already expired ones are skipped)."""
+        now = time.time()
+        with self._lock:
+            loaded = 0
+            for key, value, expires_at in items:
+                if expires_at is None or expires_at > now:
+                    self._data[key] = (value, expires_at)
+                    loaded += 1
+            return loaded
+
+    def _get(self, key: str):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.time():
+            del self._data[key]
+            return None
+        return value
+
+
+class SqliteBackend:
+    """
+    Shared by every process on the host that opens the same file. Reads go
+    through SQLite's memory-mapped I/O; CAS runs inside BEGIN IMMEDIATE.
+    """
+
+    MMAP_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, path: str = "smartcore_state.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA mmap_size={self.MMAP_BYTES}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+
+    def get(self, key: str):
+        with self._lock:
+            return self._get(key)
+
+    def set(self, key: str, value, ttl: float | None = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time() + ttl if ttl else None),
+            )
+
+    def compare_and_swap(self, key: str, expected, new, ttl: float | None = None) -> bool:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._get(key) != expected:
+                    self._conn.execute("COMMIT")
+                    return False
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(new), time.time() + ttl if ttl else None),
+                )
+                self._conn.execute("COMMIT")
+                return True
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def compare_and_delete(self, key: str, expected) -> bool:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._get(key) != expected:
+                    self._conn.execute("COMMIT")
+                    return False
+                self._conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+                self._conn.execute("COMMIT")
+                return True
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+
+    def keys(self, prefix: str = "") -> list[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM kv WHERE substr(key, 1, ?) = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (len(prefix), prefix, time.time()),
+            ).fetchall()
+        return [key for (key,) in rows]
+
+    def _get(self, key: str):
+        row = self._conn.execute("SELECT value, expires_at FROM kv WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self._conn.execute("DELETE FROM kv WHERE key = ? AND expires_at <= ?", (key, time.time()))
+            return None
+        return json.loads(value)
+
+
+class RedisError(Exception):
+    """Error reply from a Redis-protocol server."""
+
+
+class _RespConnection:
+    """Minimal blocking RESP2 client connection."""
+
+    def __init__(self, host: str, port: int, db: int, password: str | None, timeout: float):
+        self._sock = socket.create_connection((host, port), timeout=timeout)
+        self._file = self._sock.makefile("rb")
+        if password:
+            self.call("AUTH", password)
+        if db:
+            self.call("SELECT", str(db))
+
+    def call(self, *args: str):
+        out = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg.encode() if isinstance(arg, str) else arg
+            out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._sock.sendall(b"".join(out))
+        return self._read()
+
+    def close(self) -> None:
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+    def _read(self):
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RedisError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length == -1:
+                return None
+            data = self._file.read(length + 2)
+            return data[:-2].decode()
+        if kind == b"*":
+            length = int(rest)
+            if length == -1:
+                return None
+            return [self._read() for _ in range(length)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+
+class RedisBackend:
+    """
+    Redis-protocol backend using GET / SET PX / DEL / SCAN and
+    WATCH-MULTI-EXEC for compare-and-swap. One connection per thread,
+    because WATCH state lives on the connection.
+    """
+
+    def __init__(self, url: str = "redis://127.0.0.1:6379/0", timeout: float = 2.0):
+        parsed = urlparse(url)
+        self._host = parsed.hostname or "127.0.0.1"
+        self._port = parsed.port or 6379
+        self._db = int((parsed.path or "/0").lstrip("/") or 0)
+        self._password = parsed.password
+        self._timeout = timeout
+        self._local = threading.local()
+
+    def get(self, key: str):
+        raw = self._call("GET", key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value, ttl: float | None = None) -> None:
+        args = ["SET", key, json.dumps(value)]
+        if ttl:
+            args += ["PX", str(int(ttl * 1000))]
+        self._call(*args)
+
+    def compare_and_swap(self, key: str, expected, new, ttl: float | None = None) -> bool:
+        args = ["SET", key, json.dumps(new)]
+        if ttl:
+            args += ["PX", str(int(ttl * 1000))]
+        return self._if_unchanged(key, expected, args)
+
+    def compare_and_delete(self, key: str, expected) -> bool:
+        return self._if_unchanged(key, expected, ["DEL", key])
+
+    def _if_unchanged(self, key: str, expected, command: list[str]) -> bool:
+        """Runs `command` in WATCH-MULTI-EXEC if key still holds `expected`."""
+        conn = self._conn()
+        try:
+            conn.call("WATCH", key)
+            raw = conn.call("GET", key)
+            current = json.loads(raw) if raw is not None else None
+            if current != expected:
+                conn.call("UNWATCH")
+                return False
+            conn.call("MULTI")
+            conn.call(*command)
+            return conn.call("EXEC") is not None
+        except BaseException:
+            # Whatever failed (socket, error reply, bad JSON), the connection
+            # may still be inside WATCH / MULTI — never hand it out again
+            self._drop()
+            raise
+
+    def delete(self, key: str) -> None:
+        self._call("DEL", key)
+
+    def keys(self, prefix: str = "") -> list[str]:
+        found, cursor = [], "0"
+        while True:
+            cursor, batch = self._call("SCAN", cursor, "MATCH", _glob_escape(prefix) + "*", "COUNT", "1000")
+            found.extend(batch)
+            if cursor == "0":
+                return found
+
+    def _call(self, *args: str):
+        # One reconnect attempt — covers a server restart or idle timeout
+        for attempt in (1, 2):
+            try:
+                return self._conn().call(*args)
+            except (OSError, ConnectionError):
+                self._drop()
+                if attempt == 2:
+                    raise
+
+    def _conn(self) -> _RespConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = _RespConnection(self._host, self._port, self._db, self._password, self._timeout)
+            self._local.conn = conn
+        return conn
+
+    def _drop(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+        self._local.conn = None
+
+
+def _glob_escape(text: str) -> str:
+    return "".join("\\" + c if c in "*?[]\\" else c for c in text)
+
+
+class NamespacedState:
+    """A view of a backend with every key prefixed by `namespace:`."""
+
+    def __init__(self, backend, namespace: str):
+        self.backend = backend
+        self.namespace = namespace
+        self._prefix = f"{namespace}:"
+
+    def get(self, key: str):
+        return self.backend.get(self._prefix + key)
+
+    def set(self, key: str, value, ttl: float | None = None) -> None:
+        self.backend.set(self._prefix + key, value, ttl)
+
+    def compare_and_swap(self, key: str, expected, new, ttl: float | None = None) -> bool:
+        return self.backend.compare_and_swap(self._prefix + key, expected, new, ttl)
+
+    def compare_and_delete(self, key: str, expected) -> bool:
+        return self.backend.compare_and_delete(self._prefix + key, expected)
+
+    def delete(self, key: str) -> None:
+        self.backend.delete(self._prefix + key)
+
+    def keys(self) -> list[str]:
+        return [k[len(self._prefix):] for k in self.backend.keys(self._prefix)]
+
+    @property
+    def in_process(self) -> bool:
+        """True when the data lives only in this process (memory backend)."""
+        return isinstance(self.backend, MemoryBackend)
+
+    def dump(self) -> list[tuple[str, object, float | None]]:
+        return [(k[len(self._prefix):], v, e) for k, v, e in self.backend.dump(self._prefix)]
+
+    def load(self, items: list[tuple[str, object, float | None]]) -> int:
+        return self.backend.load([(self._prefix + k, v, e) for k, v, e in items])
+
+
+# ── Process-wide backend (selected once from the environment) ──────────────
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def backend_from_env():
+    kind = os.environ.get("SMARTCORE_STATE_BACKEND", "memory")
+    if kind == "sqlite":
+        return SqliteBackend(os.environ.get("SMARTCORE_STATE_PATH", "smartcore_state.db"))
+    if kind == "redis":
+        return RedisBackend(os.environ.get("SMARTCORE_STATE_URL", "redis://127.0.0.1:6379/0"))
+    return MemoryBackend()
+
+
+def get_backend(namespace: str) -> NamespacedState:
+    """Returns the shared state backend, scoped to a namespace."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = backend_from_env()
+    return NamespacedState(_backend, namespace)
@@ -0,0 +1,201 @@
+"""
+state/resp_standin.py
+─────────────────────
+Tiny Redis-protocol stand-in for local development and load tests, so
+SMARTCORE_STATE_BACKEND=redis works without installing Redis.
+
+  python -m state.resp_standin --port 6379
+
+Supports exactly what RedisBackend uses: PING, AUTH, SELECT, GET,
+SET [EX|PX] [NX|XX], DEL, SCAN ... MATCH, WATCH, UNWATCH, MULTI, EXEC,
+DISCARD, FLUSHALL. Single process, in memory, not for production.
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import time
+
+
+class StandinStore:
+    def __init__(self):
+        self.data: dict[str, tuple[str, float | None]] = {}
+        self.versions: dict[str, int] = {}
+
+    def get(self, key: str) -> str | None:
+        item = self.data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.time():
+            self._remove(key)
+            return None
+        return value
+
+    def set(self, key: str, value: str, ttl: float | None) -> None:
+        self.data[key] = (value, time.time() + ttl if ttl else None)
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    def delete(self, key: str) -> int:
+        existed = self.get(key) is not None
+        self._remove(key)
+        return int(existed)
+
+    def version(self, key: str) -> int:
+        self.get(key)  # expire first, so expiry counts as a change
+        return self.versions.get(key, 0)
+
+    def _remove(self, key: str) -> None:
+        if self.data.pop(key, None) is not None:
+            self.versions[key] = self.versions.get(key, 0) + 1
+
+
+class RespError(Exception):
+    pass
+
+
+def _encode(value) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, RespError):
+        return f"-{value}\r\n".encode()
+    if isinstance(value, bool):
+        return b":%d\r\n" % int(value)
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(_encode(v) for v in value)
+    if isinstance(value, _Simple):
+        return f"+{value}\r\n".encode()
+    data = str(value).encode()
+    return b"$%d\r\n%s\r\n" % (len(data), data)
+
+
+class _Simple(str):
+    pass
+
+
+OK = _Simple("OK")
+QUEUED = _Simple("QUEUED")
+
+
+class Session:
+    def __init__(self, store: StandinStore):
+        self.store = store
+        self.watched: dict[str, int] = {}
+        self.queued: list[list[str]] | None = None
+
+    def handle(self, args: list[str]):
+        cmd = args[0].upper()
+
+        if self.queued is not None and cmd not in ("EXEC", "DISCARD", "MULTI", "WATCH"):
+            self.queued.append(args)
+            return QUEUED
+
+        if cmd == "MULTI":
+            self.queued = []
+            return OK
+        if cmd == "EXEC":
+            if self.queued is None:
+                return RespError("ERR EXEC without MULTI")
+            queued, self.queued = self.queued, None
+            dirty = any(self.store.version(k) != v for k, v in self.watched.items())
+            self.watched = {}
+            if dirty:
+                return None
+            return [self.execute(c) for c in queued]
+        if cmd == "DISCARD":
+            self.queued, self.watched = None, {}
+            return OK
+        if cmd == "WATCH":
+            for key in args[1:]:
+                self.watched[key] = self.store.version(key)
+            return OK
+        if cmd == "UNWATCH":
+            self.watched = {}
+            return OK
+        return self.execute(args)
+
+    def execute(self, args: list[str]):
+        cmd, rest = args[0].upper(), args[1:]
+        store = self.store
+
+        if cmd == "PING":
+            return _Simple("PONG")
+        if cmd in ("AUTH", "SELECT"):
+            return OK
+        if cmd == "GET":
+            return store.get(rest[0])
+        if cmd == "SET":
+            key, value, opts = rest[0], rest[1], [o.upper() for o in rest[2:]]
+            ttl = None
+            if "EX" in opts:
+                ttl = float(rest[2 + opts.index("EX") + 1])
+            if "PX" in opts:
+                ttl = float(rest[2 + opts.index("PX") + 1]) / 1000
+            exists = store.get(key) is not None
+            if ("NX" in opts and exists) or ("XX" in opts and not exists):
+                return None
+            store.set(key, value, ttl)
+            return OK
+        if cmd == "DEL":
+            return sum(store.delete(k) for k in rest)
+        if cmd == "SCAN":
+            pattern = "*"
+            upper = [r.upper() for r in rest]
+            if "MATCH" in upper:
+                pattern = rest[upper.index("MATCH") + 1]
+            keys = [k for k in list(store.data) if store.get(k) is not None and fnmatch.fnmatchcase(k, pattern)]
+            return ["0", keys]
+        if cmd == "FLUSHALL":
+            for key in list(store.data):
+                store.delete(key)
+            return OK
+        return RespError(f"ERR unknown command '{args[0]}'")
+
+
+async def _read_command(reader: asyncio.StreamReader) -> list[str] | None:
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        return line.decode().split()  # inline command (e.g. from telnet)
+    args = []
+    for _ in range(int(line[1:-2])):
+        length = int((await reader.readline())[1:-2])
+        args.append((await reader.readexactly(length + 2))[:-2].decode())
+    return args
+
+
+async def serve(host: str, port: int) -> None:
+    store = StandinStore()
+
+    async def client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        session = Session(store)
+        try:
+            while (args := await _read_command(reader)) is not None:
+                if not args:
+                    continue
+                writer.write(_encode(session.handle(args)))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(client, host, port)
+    print(f"RESP stand-in listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Redis-protocol stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
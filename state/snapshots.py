@@ -0,0 +1,277 @@
+"""
+state/snapshots.py
+──────────────────
+Warm-restart snapshots of in-process state: the Zoho token and view-id
+caches, the lead score store (when they live in the memory backend) and
+the in-memory indexes (hot leads, identity, segment aggregates).
+
+Owners register what they hold with register_section() /
+register_namespace(); the app lifespan restores the snapshot on startup,
+rewrites it every SMARTCORE_SNAPSHOT_INTERVAL_S and once more on graceful
+shutdown.
+
+File layout (one file, written to a temp name and renamed into place):
+
+  header    magic "SCSN", format version, marshal + Python version,
+            created_at, section count
+  table     per section: name, section version, offset, length, crc32
+  payloads  marshal-encoded section data
+
+On startup the file is memory-mapped and each section is decoded straight
+from the mapping. Compatibility is checked at two levels: a different
+format / marshal / Python version discards the whole snapshot; a section
+whose version (bumped by its owner when its data shape changes), length
+or checksum does not match is skipped on its own. Either way the process
+just starts cold for that data — a snapshot is never trusted blindly.
+
+Sections in the snapshot that nobody has registered yet (owners imported
+later, e.g. the Zoho client behind SMARTCORE_LAZY_STARTUP=1) are held
+back: they are restored when their owner registers, and written through
+unchanged until then, so a snapshot taken before the import keeps them.
+
+Shared backends (sqlite / redis) persist themselves, so their namespaces
+are not snapshotted.
+
+Environment variables:
+  SMARTCORE_SNAPSHOTS            — "0" disables snapshots
+  SMARTCORE_SNAPSHOT_PATH        — file (default "snapshots/smartcore.snap");
+                                   on Railway point it at a volume
+  SMARTCORE_SNAPSHOT_INTERVAL_S  — periodic write interval (default 300, 0 = off)
+"""
+
+import asyncio
+import logging
+import marshal
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.environ.get("SMARTCORE_SNAPSHOTS", "1") != "0"
+SNAPSHOT_PATH = os.environ.get("SMARTCORE_SNAPSHOT_PATH", os.path.join("snapshots", "smartcore.snap"))
+SNAPSHOT_INTERVAL_SECONDS = float(os.environ.get("SMARTCORE_SNAPSHOT_INTERVAL_S", "300"))
+
+FORMAT_VERSION = 1
+_MAGIC = b"SCSN"
+_HEADER = struct.Struct("<4sHHHdI")    # magic, format, marshal, python, created_at, sections
+_ENTRY = struct.Struct("<48sHQQI")     # name, version, offset, length, crc32
+_PYTHON = sys.version_info.major << 8 | sys.version_info.minor
+
+
+class _Section:
+    __slots__ = ("name", "version", "dump", "load", "rebuild")
+
+    def __init__(self, name: str, version: int, dump: Callable[[], object], load: Callable[[object], object],
+                 rebuild: Callable[[], object] | None):
+        self.name = name
+        self.version = version
+        self.dump = dump
+        self.load = load
+        self.rebuild = rebuild
+
+
+# Restored in registration order, so state registered before indexes
+_sections: dict[str, _Section] = {}
+
+_last: dict = {"restored": None, "written": None}
+
+# Verified sections from the restored snapshot whose owner has not registered yet
+_pending: dict[str, tuple[int, bytes]] = {}
+
+
+def register_section(name: str, version: int, dump: Callable[[], object], load: Callable[[object], object],
+                     rebuild: Callable[[], object] | None = None) -> None:
+    """
+    Adds a snapshot section. dump() returns marshal-able data (dicts,
+    lists, tuples, str, numbers, None); load(data) swaps it in. Bump
+    version whenever the shape of dump()'s data changes.
+
+    rebuild(), if given, runs when a snapshot was restored but this
+    section could not be — derived views (indexes) use it to catch up with
+    state that did come back, instead of staying empty.
+    """
+    if len(name.encode()) > 48:
+        raise ValueError(f"snapshot section name too long: {name}")
+    _sections[name] = section = _Section(name, version, dump, load, rebuild)
+    if name in _pending:
+        _restore_late(section, *_pending.pop(name))
+
+
+def register_namespace(state, version: int = 1, keys: tuple[str, ...] | None = None) -> None:
+    """
+    Snapshots a get_backend() namespace when it lives in this process;
+    `keys` limits it to those keys (e.g. to leave out short-lived locks).
+    """
+    if not state.in_process:
+        return
+    dump = state.dump if keys is None else lambda: [item for item in state.dump() if item[0] in keys]
+    register_section(f"state:{state.namespace}", version, dump, state.load)
+
+
+# ── Write ──────────────────────────────────────────────────────────────────
+def write_snapshot(path: str = SNAPSHOT_PATH) -> dict:
+    started = time.perf_counter()
+    payloads = []
+    for section in list(_sections.values()):
+        try:
+            payloads.append((section, marshal.dumps(section.dump())))
+        except Exception:
+            logger.exception("Snapshot section %s could not be dumped; skipped", section.name)
+
+    blobs = [(section.name, section.version, blob) for section, blob in payloads]
+    blobs += [(name, version, blob) for name, (version, blob) in list(_pending.items())]
+
+    table_size = _HEADER.size + _ENTRY.size * len(blobs)
+    offset = table_size
+    entries = []
+    for name, version, blob in blobs:
+        entries.append(_ENTRY.pack(name.encode(), version, offset, len(blob), zlib.crc32(blob)))
+        offset += len(blob)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, FORMAT_VERSION, marshal.version, _PYTHON, time.time(), len(blobs)))
+        f.writelines(entries)
+        f.writelines(blob for _, _, blob in blobs)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)  # readers see the old or the new snapshot, never half of one
+
+    _last["written"] = {
+        "at":          time.time(),
+        "bytes":       offset,
+        "sections":    {name: len(blob) for name, _, blob in blobs},
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+    return _last["written"]
+
+
+# ── Restore ────────────────────────────────────────────────────────────────
+def restore_snapshot(path: str = SNAPSHOT_PATH) -> dict:
+    """
+    Loads every compatible section of the snapshot at `path` into its
+    registered owner. Returns what was restored / skipped and why.
+    """
+    started = time.perf_counter()
+    report = {"path": path, "restored": [], "skipped": {}, "discarded": None}
+    _last["restored"] = report
+    try:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        report["discarded"] = "no snapshot"
+        return report
+
+    with mapped:
+        try:
+            magic, fmt, marshal_version, python, created_at, count = _HEADER.unpack_from(mapped, 0)
+        except struct.error:
+            magic = None
+        if magic != _MAGIC:
+            report["discarded"] = "not a snapshot file"
+        elif (fmt, marshal_version, python) != (FORMAT_VERSION, marshal.version, _PYTHON):
+            report["discarded"] = (
+                f"incompatible snapshot (format {fmt}, marshal {marshal_version}, python {python >> 8}.{python & 0xFF})"
+            )
+        if report["discarded"]:
+            logger.warning("Discarding snapshot %s: %s", path, report["discarded"])
+            return report
+
+        found = {}
+        try:
+            if _HEADER.size + count * _ENTRY.size > len(mapped):
+                raise ValueError("section table runs past the end of the file")
+            for i in range(count):
+                raw_name, version, offset, length, crc = _ENTRY.unpack_from(mapped, _HEADER.size + i * _ENTRY.size)
+                found[raw_name.rstrip(b"\0").decode()] = (version, offset, length, crc)
+        except (struct.error, UnicodeDecodeError, ValueError) as e:
+            report["discarded"] = f"truncated or corrupt section table ({e})"
+            logger.warning("Discarding snapshot %s: %s", path, report["discarded"])
+            return report
+        report["created_at"] = created_at
+
+        for name, section in _sections.items():
+            if name not in found:
+                report["skipped"][name] = "not in snapshot"
+                continue
+            version, offset, length, crc = found[name]
+            if version != section.version:
+                report["skipped"][name] = f"version {version} != {section.version}"
+                continue
+            blob = mapped[offset:offset + length]
+            if len(blob) != length or zlib.crc32(blob) != crc:
+                report["skipped"][name] = "truncated or corrupt"
+                continue
+            try:
+                section.load(marshal.loads(blob))
+                report["restored"].append(name)
+            except Exception as e:
+                logger.exception("Snapshot section %s failed to load", name)
+                report["skipped"][name] = f"load failed: {e}"
+
+        _pending.clear()
+        for name, (version, offset, length, crc) in found.items():
+            if name not in _sections:
+                blob = mapped[offset:offset + length]
+                if len(blob) == length and zlib.crc32(blob) == crc:
+                    _pending[name] = (version, blob)
+        if _pending:
+            report["pending"] = sorted(_pending)
+
+    if report["skipped"]:
+        logger.warning("Snapshot sections skipped: %s", report["skipped"])
+        if report["restored"]:
+            for name in report["skipped"]:
+                rebuild = _sections[name].rebuild
+                if rebuild is not None:
+                    try:
+                        rebuild()
+                    except Exception:
+                        logger.exception("Rebuilding %s after a partial restore failed", name)
+    report["age_s"] = round(time.time() - created_at, 1)
+    report["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    logger.info("Restored %d snapshot sections in %.1f ms", len(report["restored"]), report["duration_ms"])
+    return report
+
+
+def _restore_late(section: _Section, version: int, blob: bytes) -> None:
+    """Loads a held-back section when its owner registers after restore_snapshot()."""
+    report = _last["restored"]
+    if version != section.version:
+        report["skipped"][section.name] = f"version {version} != {section.version}"
+        return
+    try:
+        section.load(marshal.loads(blob))
+        report["restored"].append(section.name)
+        logger.info("Restored late-registered snapshot section %s", section.name)
+    except Exception as e:
+        logger.exception("Snapshot section %s failed to load", section.name)
+        report["skipped"][section.name] = f"load failed: {e}"
+
+
+def save_snapshot() -> None:
+    """write_snapshot() for the lifespan: a failed snapshot is logged, never raised."""
+    try:
+        written = write_snapshot()
+        logger.info("Snapshot written: %d bytes in %.1f ms", written["bytes"], written["duration_ms"])
+    except Exception:
+        logger.exception("Snapshot write failed")
+
+
+async def snapshot_periodically(interval: float = SNAPSHOT_INTERVAL_SECONDS) -> None:
+    """Background task started from the app lifespan."""
+    while True:
+        await asyncio.sleep(interval)
+        await asyncio.to_thread(save_snapshot)
+
+
+def snapshot_status() -> dict:
+    return {"enabled": ENABLED, "path": SNAPSHOT_PATH, "sections": list(_sections), **_last}
@@ -0,0 +1,74 @@
+"""
+tracing/collector_standin.py
+────────────────────────────
+Local span collector for development and load tests: accepts the batches
+SmartCore exports to SMARTCORE_TRACE_COLLECTOR_URL and appends them to a
+JSONL file that python -m tracing.waterfall reads.
+
+  python -m tracing.collector_standin --port 4319 --out spans.jsonl
+  SMARTCORE_TRACE_COLLECTOR_URL=http://127.0.0.1:4319/v1/spans uvicorn main:app
+
+POST /v1/spans   body {"spans": [...]} → 202
+GET  /health     → {"spans": <count received>}
+"""
+
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_handler(out_path: str):
+    lock = threading.Lock()
+    received = {"spans": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != "/v1/spans":
+                self.send_error(404)
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                spans = json.loads(self.rfile.read(length)).get("spans", [])
+            except (ValueError, AttributeError):
+                self.send_error(400, "Expected {\"spans\": [...]}")
+                return
+            with lock, open(out_path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(s) + "\n" for s in spans))
+                received["spans"] += len(spans)
+            self._reply(202, {"accepted": len(spans)})
+
+        def do_GET(self):
+            if self.path != "/health":
+                self.send_error(404)
+                return
+            self._reply(200, received)
+
+        def _reply(self, status: int, body: dict):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local span collector stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4319)
+    parser.add_argument("--out", default="spans.jsonl")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.out))
+    print(f"Span collector stand-in on http://{args.host}:{args.port}/v1/spans → {args.out}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
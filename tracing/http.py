@@ -0,0 +1,46 @@
+"""
+tracing/http.py
+───────────────
+httpx clients that record a span per outbound request and forward the
+trace context (traceparent header) when the calling request is traced.
+Span duration covers the request up to the response headers.
+
+  async with traced_client(timeout=15.0) as client:   # drop-in for httpx.AsyncClient
+      ...
+"""
+
+import httpx
+
+from tracing.tracer import current_span
+
+
+class TracingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None):
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        parent = current_span.get()
+        if parent is None:
+            return await self._transport.handle_async_request(request)
+
+        span = parent.child(
+            f"HTTP {request.method} {request.url.host}",
+            {"http.method": request.method, "http.url": str(request.url.copy_with(query=None))},
+        )
+        request.headers["traceparent"] = span.traceparent()
+        try:
+            response = await self._transport.handle_async_request(request)
+            span.attrs["http.status"] = response.status_code
+            return response
+        except Exception as e:
+            span.attrs["error"] = type(e).__name__
+            raise
+        finally:
+            span.finish()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def traced_client(**kwargs) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=TracingTransport(), **kwargs)
@@ -0,0 +1,53 @@
+"""
+tracing/middleware.py
+─────────────────────
+ASGI middleware that opens the request span (continuing an incoming
+traceparent) and makes it current for everything the request runs,
+including work handed to the priority lanes. Sampled responses carry
+`traceparent` and `X-Trace-Id` headers so callers can log the trace id.
+"""
+
+from tracing.tracer import current_span, start_request_span, tracing_enabled
+
+
+class TracingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracing_enabled():
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for name, value in scope.get("headers", ()):
+            if name == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+
+        span = start_request_span(
+            f"{scope['method']} {scope['path']}", traceparent,
+            {"http.method": scope["method"], "http.path": scope["path"]},
+        )
+        if span is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                span.attrs["http.status"] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"traceparent", span.traceparent().encode()))
+                headers.append((b"x-trace-id", span.trace_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = current_span.set(span)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_span.reset(token)
+            route = scope.get("route")
+            if route is not None:
+                span.name = f"{scope['method']} {route.path}"
+            span.finish()
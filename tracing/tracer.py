@@ -0,0 +1,198 @@
+"""
+tracing/tracer.py
+─────────────────
+Lightweight distributed tracing (W3C trace context) for SmartCore.
+
+An incoming `traceparent` header (sent by the Node call service's
+triggerSmartCore) continues the caller's trace; otherwise a new trace is
+started when sampled. Inside a traced request, spans are recorded for:
+
+  - the request itself          (tracing/middleware.py)
+  - every engine stage / template / Zoho call wrapped by metrics.timed()
+  - every outbound httpx request (tracing/http.py, which also forwards
+    traceparent so the trace continues downstream)
+
+Spans are exported in batches from a background thread as JSON lines to a
+file, or POSTed to a collector (python -m tracing.collector_standin runs a
+local one). python -m tracing.waterfall prints per-trace waterfalls.
+
+Environment variables:
+  SMARTCORE_TRACE_FILE          — append spans to this JSONL file
+  SMARTCORE_TRACE_COLLECTOR_URL — or POST span batches here
+  SMARTCORE_TRACE_SAMPLE_RATE   — fraction of new traces recorded (default 0.01)
+  SMARTCORE_TRACE_HONOR_PARENT  — "1" (default): always record when the
+                                  caller's traceparent says sampled
+With neither exporter set, tracing is off and costs one context lookup.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+EXPORT_BATCH = 256
+EXPORT_INTERVAL_SECONDS = 1.0
+MAX_QUEUED_SPANS = 50_000
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start", "_started", "duration_ms", "attrs")
+
+    def __init__(self, trace_id: str, parent_id: str | None, name: str, attrs: dict | None = None):
+        self.trace_id = trace_id
+        self.span_id = new_span_id()
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self.duration_ms: float | None = None
+        self.attrs = attrs or {}
+
+    def child(self, name: str, attrs: dict | None = None) -> "Span":
+        return Span(self.trace_id, self.span_id, name, attrs)
+
+    def finish(self) -> None:
+        self.duration_ms = (time.perf_counter() - self._started) * 1000
+        _exporter.submit(self)
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id":    self.trace_id,
+            "span_id":     self.span_id,
+            "parent_id":   self.parent_id,
+            "name":        self.name,
+            "start":       self.start,
+            "duration_ms": round(self.duration_ms or 0.0, 4),
+            "attrs":       self.attrs,
+        }
+
+
+# The span new work should hang off; None when the request is not traced
+current_span: ContextVar[Span | None] = ContextVar("smartcore_current_span", default=None)
+
+
+def new_trace_id() -> str:
+    return f"{random.getrandbits(128):032x}"
+
+
+def new_span_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+def parse_traceparent(header: str | None) -> tuple[str, str, bool] | None:
+    """(trace_id, parent_span_id, sampled) from a W3C traceparent, or None."""
+    if not header:
+        return None
+    match = _TRACEPARENT.match(header.strip().lower())
+    if not match:
+        return None
+    trace_id, parent_id, flags = match.groups()
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return trace_id, parent_id, bool(int(flags, 16) & 1)
+
+
+def start_request_span(name: str, traceparent: str | None, attrs: dict | None = None) -> Span | None:
+    """
+    Root span for an incoming request, or None when this request is not
+    sampled (or tracing is off).
+    """
+    if not _exporter.enabled:
+        return None
+    parent = parse_traceparent(traceparent)
+    if parent is not None:
+        trace_id, parent_id, sampled = parent
+        if not (sampled and _exporter.honor_parent) and random.random() >= _exporter.sample_rate:
+            return None
+        return Span(trace_id, parent_id, name, attrs)
+    if random.random() >= _exporter.sample_rate:
+        return None
+    return Span(new_trace_id(), None, name, attrs)
+
+
+class _Exporter:
+    def __init__(self):
+        self.file = os.environ.get("SMARTCORE_TRACE_FILE")
+        self.collector_url = os.environ.get("SMARTCORE_TRACE_COLLECTOR_URL")
+        self.sample_rate = float(os.environ.get("SMARTCORE_TRACE_SAMPLE_RATE", "0.01"))
+        self.honor_parent = os.environ.get("SMARTCORE_TRACE_HONOR_PARENT", "1") == "1"
+        self.enabled = bool(self.file or self.collector_url)
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=MAX_QUEUED_SPANS)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, span: Span) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1  # never block a request on tracing
+
+    def flush(self) -> None:
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait().to_dict())
+            except queue.Empty:
+                break
+        if batch:
+            self._write(batch)
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            batch = []
+            try:
+                batch.append(self._queue.get(timeout=EXPORT_INTERVAL_SECONDS).to_dict())
+                while len(batch) < EXPORT_BATCH:
+                    batch.append(self._queue.get_nowait().to_dict())
+            except queue.Empty:
+                pass
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: list[dict]) -> None:
+        try:
+            if self.file:
+                with open(self.file, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(s) + "\n" for s in batch))
+            if self.collector_url:
+                import httpx  # deferred: only exporters that POST need it at all
+
+                httpx.post(self.collector_url, json={"spans": batch}, timeout=5.0)
+        except Exception as e:
+            self.dropped += len(batch)
+            logger.warning("Span export failed (%d spans dropped): %s", len(batch), e)
+
+
+_exporter = _Exporter()
+
+
+def tracing_enabled() -> bool:
+    return _exporter.enabled
+
+
+def flush() -> None:
+    """Writes out queued spans now (e.g. on shutdown)."""
+    _exporter.flush()
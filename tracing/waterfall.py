@@ -0,0 +1,94 @@
+"""
+tracing/waterfall.py
+────────────────────
+Prints per-trace waterfalls from an exported span file.
+
+  python -m tracing.waterfall spans.jsonl                   # 10 slowest traces
+  python -m tracing.waterfall spans.jsonl --trace <id>      # one trace
+  python -m tracing.waterfall spans.jsonl --slowest 3 --min-ms 500
+
+Each line is one span, indented under its parent, with its offset from
+the start of the trace, its duration and a bar on a shared time axis.
+Spans whose parent is not in the file (e.g. the Node caller's span) are
+shown as roots.
+"""
+
+import argparse
+import json
+from collections import defaultdict
+
+BAR_WIDTH = 40
+
+
+def load_traces(path: str) -> dict[str, list[dict]]:
+    traces: dict[str, list[dict]] = defaultdict(list)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                span = json.loads(line)
+                traces[span["trace_id"]].append(span)
+    return traces
+
+
+def trace_duration_ms(spans: list[dict]) -> float:
+    start = min(s["start"] for s in spans)
+    end = max(s["start"] + s["duration_ms"] / 1000 for s in spans)
+    return (end - start) * 1000
+
+
+def render(spans: list[dict]) -> list[str]:
+    start = min(s["start"] for s in spans)
+    total_ms = max(trace_duration_ms(spans), 1e-6)
+    ids = {s["span_id"] for s in spans}
+    children: dict[str | None, list[dict]] = defaultdict(list)
+    for s in spans:
+        children[s["parent_id"] if s["parent_id"] in ids else None].append(s)
+    for group in children.values():
+        group.sort(key=lambda s: s["start"])
+
+    lines = [f"trace {spans[0]['trace_id']}  {total_ms:.2f} ms  {len(spans)} spans"]
+    name_width = 48
+
+    def walk(span: dict, depth: int) -> None:
+        offset_ms = (span["start"] - start) * 1000
+        left = int(offset_ms / total_ms * BAR_WIDTH)
+        width = max(1, int(span["duration_ms"] / total_ms * BAR_WIDTH))
+        bar = " " * left + "█" * min(width, BAR_WIDTH - left)
+        status = span.get("attrs", {}).get("http.status")
+        label = ("  " * depth + span["name"] + (f" [{status}]" if status else ""))[:name_width]
+        lines.append(f"  {label:<{name_width}} {offset_ms:>9.2f} {span['duration_ms']:>9.2f}  |{bar:<{BAR_WIDTH}}|")
+        for child in children.get(span["span_id"], ()):
+            walk(child, depth + 1)
+
+    lines.append(f"  {'span':<{name_width}} {'start ms':>9} {'dur ms':>9}")
+    for root in children[None]:
+        walk(root, 0)
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-trace waterfall from exported spans.")
+    parser.add_argument("path", help="JSONL span file (SMARTCORE_TRACE_FILE or collector output)")
+    parser.add_argument("--trace", help="Only this trace id")
+    parser.add_argument("--slowest", type=int, default=10, help="Show the N slowest traces")
+    parser.add_argument("--min-ms", type=float, default=0.0, help="Skip traces faster than this")
+    args = parser.parse_args()
+
+    traces = load_traces(args.path)
+    if args.trace:
+        selected = [traces[args.trace]] if args.trace in traces else []
+    else:
+        selected = sorted(traces.values(), key=trace_duration_ms, reverse=True)
+        selected = [t for t in selected if trace_duration_ms(t) >= args.min_ms][:args.slowest]
+
+    if not selected:
+        print("No matching traces.")
+        return
+    for spans in selected:
+        print("\n".join(render(spans)))
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@
 // Phase 3C: Mandatory Pre-Call Enrichment + Real-Time Updates
 // ═══════════════════════════════════════════════════════════════
 
+const crypto = require('crypto');
+
 class ZohoService {
   constructor() {
     this.clientId = process.env.ZOHO_CLIENT_ID;
@@ -521,9 +523,18 @@ class ZohoService {
       if (process.env.SMARTCORE_API_KEY) {
         smartcoreHeaders['X-SMARTCORE-KEY'] = process.env.SMARTCORE_API_KEY;
       }
+
+      // W3C trace context so SmartCore's spans join this call's trace
+      const traceId = crypto.randomBytes(16).toString('hex');
+      smartcoreHeaders['traceparent'] = `00-${traceId}-${crypto.randomBytes(8).toString('hex')}-01`;
+      console.log(`[Zoho Service] Trace ID: ${traceId}`);
+
+      // Our abort deadline, so SmartCore drops the request if it can't start in time
+      const SMARTCORE_TIMEOUT_MS = 8000;
+      smartcoreHeaders['X-SmartCore-Timeout-Ms'] = String(SMARTCORE_TIMEOUT_MS);
       
       const controller = new AbortController();
-      const timeout = setTimeout(() => controller.abort(), 8000);
+      const timeout = setTimeout(() => controller.abort(), SMARTCORE_TIMEOUT_MS);
       
       let smartcoreResponse;
       try {
@@ -1,6 +1,8 @@
 // SmartCore WebSocket Server
 // Railway deployment with API key authentication
-// Handles real-time events: IntentScore, HotLead, CallState, Transcript
+// Handles real-time events: IntentScore, HotLead, NextAgent, CallState, Transcript
+// SmartCore publishes score changes in batches: one {type: 'batch', events}
+// message on its socket, or POST /events with an x-api-key header
 
 const WebSocket = require('ws');
 const http = require('http');
@@ -11,7 +13,9 @@ const WS_API_KEY = process.env.WS_API_KEY || 'sales360-demo-key-2026'; // Change
 
 // Create HTTP server for health checks
 const server = http.createServer((req, res) => {
-  if (req.url === '/health') {
+  if (req.method === 'POST' && req.url === '/events') {
+    handleEventsPost(req, res);
+  } else if (req.url === '/health') {
     res.writeHead(200, { 'Content-Type': 'application/json' });
     res.end(JSON.stringify({ 
       status: 'healthy', 
@@ -119,16 +123,22 @@ wss.on('connection', (ws, req) => {
   });
 });
 
+// Validate event types
+const validEvents = ['intentScore', 'hotLead', 'nextAgent', 'callState', 'transcript'];
+
 // Event handler
 function handleEvent(data, senderId) {
   const { type, event, payload } = data;
 
+  if (type === 'batch') {
+    handleBatch(data.events, senderId);
+    return;
+  }
+
   if (type !== 'event') return;
 
   console.log(`[WebSocket] Event received - Type: ${event}, From: ${senderId}`);
 
-  // Validate event types
-  const validEvents = ['intentScore', 'hotLead', 'callState', 'transcript'];
   if (!validEvents.includes(event)) {
     console.warn(`[WebSocket] Unknown event type: ${event}`);
     return;
@@ -144,8 +154,47 @@ function handleEvent(data, senderId) {
   }, senderId);
 }
 
+// Batch handler: each event reaches clients as its own 'event' message,
+// so dashboards need no changes. Returns how many were broadcast.
+function handleBatch(events, senderId) {
+  if (!Array.isArray(events)) return 0;
+
+  const timestamp = new Date().toISOString();
+  let accepted = 0;
+  events.forEach(({ event, payload } = {}) => {
+    if (!validEvents.includes(event)) return;
+    broadcast({ type: 'event', event, payload, timestamp, source: senderId }, senderId, false);
+    accepted++;
+  });
+
+  console.log(`[WebSocket] Batch from ${senderId}: ${accepted}/${events.length} events broadcast`);
+  return accepted;
+}
+
+// HTTP push: POST /events {events: [...]} with x-api-key
+function handleEventsPost(req, res) {
+  if (req.headers['x-api-key'] !== WS_API_KEY) {
+    res.writeHead(401, { 'Content-Type': 'application/json' });
+    res.end(JSON.stringify({ error: 'Invalid API key' }));
+    return;
+  }
+
+  let body = '';
+  req.on('data', (chunk) => { body += chunk; });
+  req.on('end', () => {
+    try {
+      const accepted = handleBatch(JSON.parse(body).events, 'smartcore-http');
+      res.writeHead(202, { 'Content-Type': 'application/json' });
+      res.end(JSON.stringify({ accepted }));
+    } catch (error) {
+      res.writeHead(400, { 'Content-Type': 'application/json' });
+      res.end(JSON.stringify({ error: 'Expected {"events": [...]}' }));
+    }
+  });
+}
+
 // Broadcast function (excludes sender)
-function broadcast(message, excludeClientId = null) {
+function broadcast(message, excludeClientId = null, log = true) {
   const messageStr = JSON.stringify(message);
   let broadcastCount = 0;
 
@@ -156,7 +205,9 @@ function broadcast(message, excludeClientId = null) {
     }
   });
 
-  console.log(`[WebSocket] Broadcasted ${message.type || message.event} to ${broadcastCount} clients`);
+  if (log) {
+    console.log(`[WebSocket] Broadcasted ${message.type || message.event} to ${broadcastCount} clients`);
+  }
 }
 
 // Utility: Generate unique client ID
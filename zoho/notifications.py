@@ -0,0 +1,162 @@
+"""
+zoho/notifications.py
+─────────────────────
+Receives Zoho CRM change notifications for the Leads module and rescores
+just the leads that changed — no polling of /zoho/leads needed.
+
+Flow:
+  Zoho → POST /zoho/notifications
+       → verify channel token
+       → add ids to the pending set (bursts collapse here)
+       → after a short debounce window, one batched fetch of those ids
+       → score_lead → scoring/score_store.py
+
+Environment variables:
+  ZOHO_NOTIFY_TOKEN        — token given when the channel was enabled (required)
+  ZOHO_NOTIFY_CHANNEL_ID   — optional; notifications for other channels are rejected
+  ZOHO_NOTIFY_DEBOUNCE_MS  — burst window before fetching, default 500
+  ZOHO_NOTIFY_RECORD_FILE  — optional; every accepted payload is appended here
+                             as JSON lines, for replay with
+                             python -m zoho.replay_notifications
+"""
+
+import asyncio
+import hmac
+import json
+import logging
+import os
+
+from metrics.registry import register_gauge
+from resilience.circuit_breaker import CircuitOpen
+from scoring.scoring_engine import score_lead
+from scoring.score_store import forget_lead, record_scoring
+from zoho.zoho_client import fetch_leads_by_ids, lead_data_from_record
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationRejected(Exception):
+    """Raised when a notification fails channel/token verification."""
+
+
+# ── Pending ids waiting for the next batched fetch ─────────────────────────
+_pending_ids: set[str] = set()
+_flush_task: asyncio.Task | None = None
+
+_stats = {
+    "notifications":  0,
+    "ids_received":   0,
+    "ids_coalesced":  0,
+    "fetches":        0,
+    "leads_rescored": 0,
+    "leads_removed":  0,
+}
+
+
+def verify_notification(payload: dict) -> None:
+    """
+    Checks the channel token (and channel id, if configured).
+    Raises NotificationRejected on mismatch.
+    """
+    expected_token = os.environ["ZOHO_NOTIFY_TOKEN"]
+    if not hmac.compare_digest(str(payload.get("token") or ""), expected_token):
+        raise NotificationRejected("Invalid channel token")
+
+    expected_channel = os.environ.get("ZOHO_NOTIFY_CHANNEL_ID")
+    if expected_channel and str(payload.get("channel_id")) != expected_channel:
+        raise NotificationRejected("Unknown channel id")
+
+
+async def handle_notification(payload: dict) -> dict:
+    """
+    Verifies a notification and schedules the changed leads for rescoring.
+    Returns immediately — Zoho expects a fast 2xx.
+    """
+    global _flush_task
+
+    verify_notification(payload)
+    _record_payload(payload)
+
+    _stats["notifications"] += 1
+
+    if payload.get("module") != "Leads":
+        return {"accepted": 0, "queued": 0, "ignored": "module"}
+
+    ids = [str(i) for i in payload.get("ids") or []]
+    _stats["ids_received"] += len(ids)
+
+    # Deleted leads need no fetch — drop them straight away
+    if payload.get("operation") == "delete":
+        for lead_id in ids:
+            _pending_ids.discard(lead_id)
+            forget_lead(lead_id)
+        _stats["leads_removed"] += len(ids)
+        return {"accepted": len(ids), "queued": 0, "removed": len(ids)}
+
+    new_ids = set(ids) - _pending_ids
+    _pending_ids.update(new_ids)
+    _stats["ids_coalesced"] += len(ids) - len(new_ids)
+
+    if _pending_ids and (_flush_task is None or _flush_task.done()):
+        _flush_task = asyncio.create_task(_flush_after_debounce())
+
+    return {"accepted": len(ids), "queued": len(new_ids)}
+
+
+async def _flush_after_debounce(delay: float | None = None) -> None:
+    global _flush_task
+
+    debounce_ms = int(os.environ.get("ZOHO_NOTIFY_DEBOUNCE_MS", "500"))
+    await asyncio.sleep(debounce_ms / 1000 if delay is None else delay)
+
+    ids = sorted(_pending_ids)
+    _pending_ids.clear()
+
+    try:
+        await rescore_leads(ids)
+    except CircuitOpen as e:
+        # Zoho is being given a rest: keep the ids and try once it is probed again
+        logger.warning("Zoho circuit open; retrying %d notified leads in %.0fs", len(ids), e.retry_after)
+        _pending_ids.update(ids)
+        _flush_task = asyncio.create_task(_flush_after_debounce(max(e.retry_after, 1.0)))
+    except Exception:
+        logger.exception("Rescoring %d notified leads failed", len(ids))
+
+
+async def rescore_leads(ids: list[str]) -> list[dict]:
+    """
+    Fetches the given leads in one batched call and rescores each.
+    Returns the new score_store entries.
+    """
+    if not ids:
+        return []
+
+    records = await fetch_leads_by_ids(ids)
+    _stats["fetches"] += 1
+
+    entries = []
+    for raw in records:
+        lead = lead_data_from_record(raw)
+        scoring = score_lead(lead)
+        entries.append(record_scoring(lead.lead_id, lead, scoring, source="zoho_notification"))
+
+    _stats["leads_rescored"] += len(entries)
+    return entries
+
+
+def notification_stats() -> dict:
+    return {**_stats, "pending": len(_pending_ids)}
+
+
+register_gauge(
+    "smartcore_zoho_notification_pending", "Changed lead ids waiting for the debounce flush.",
+    lambda: len(_pending_ids),
+)
+
+
+def _record_payload(payload: dict) -> None:
+    path = os.environ.get("ZOHO_NOTIFY_RECORD_FILE")
+    if not path:
+        return
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(payload) + "\n")
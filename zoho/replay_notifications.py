@@ -0,0 +1,69 @@
+"""
+zoho/replay_notifications.py
+────────────────────────────
+Replays recorded Zoho notification payloads against a running SmartCore,
+keeping the original spacing between them (from Zoho's server_time).
+
+Record payloads by setting ZOHO_NOTIFY_RECORD_FILE on the receiving
+instance, then:
+
+  python -m zoho.replay_notifications recorded.jsonl
+  python -m zoho.replay_notifications recorded.jsonl --speed 10
+  python -m zoho.replay_notifications recorded.jsonl --url http://localhost:8000/zoho/notifications
+
+The input may be JSON lines or a single JSON list of payloads.
+"""
+
+import argparse
+import json
+import time
+
+import httpx
+
+
+def load_payloads(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        text = f.read().strip()
+    if text.startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def replay(payloads: list[dict], url: str, speed: float = 1.0) -> list[dict]:
+    results = []
+    previous_time = None
+
+    with httpx.Client(timeout=10.0) as client:
+        for payload in payloads:
+            server_time = payload.get("server_time")
+            if speed > 0 and previous_time is not None and server_time is not None:
+                gap = (int(server_time) - previous_time) / 1000 / speed
+                if gap > 0:
+                    time.sleep(gap)
+            if server_time is not None:
+                previous_time = int(server_time)
+
+            response = client.post(url, json=payload)
+            results.append({
+                "status": response.status_code,
+                "ids":    payload.get("ids", []),
+                "body":   response.json() if response.headers.get("content-type", "").startswith("application/json") else response.text,
+            })
+            print(f"{response.status_code} {payload.get('operation', '?'):>7} ids={len(payload.get('ids', []))} → {results[-1]['body']}")
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded Zoho notification payloads.")
+    parser.add_argument("path", help="JSON lines (or JSON list) of recorded payloads")
+    parser.add_argument("--url", default="http://localhost:8000/zoho/notifications")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Replay speed multiplier; 0 sends back-to-back")
+    args = parser.parse_args()
+
+    replay(load_payloads(args.path), args.url, args.speed)
+
+
+if __name__ == "__main__":
+    main()
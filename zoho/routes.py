@@ -6,16 +6,34 @@ FastAPI router exposing Zoho CRM data to the Sales360 dashboard.
 Endpoints:
   GET /zoho/leads              → all leads
   GET /zoho/leads?view=NAME    → leads filtered by custom view
-  GET /zoho/health             → confirms Zoho connection is working
+  GET /zoho/leads?fields=name,score&format=compact
+                               → only those fields, as columns + rows
+  GET /zoho/health             → confirms Zoho connection is working (and
+                                 the CRM circuit breaker's state)
+  POST /zoho/notifications         → Zoho CRM change notifications (Leads)
+  POST /zoho/notifications/enable  → subscribes the Leads notification channel
+                                     (admin key or ZOHO_NOTIFY_TOKEN required)
+  GET /zoho/notifications/stats    → received / coalesced / rescored counters
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from zoho.zoho_client import fetch_leads, get_access_token
+import hmac
+import os
+from datetime import datetime, timedelta, timezone
 
-router = APIRouter(prefix="/zoho", tags=["Zoho CRM"])
+from fastapi import APIRouter, Body, Header, HTTPException, Query
+from resilience.circuit_breaker import CircuitOpen
+from models.codec import FastJSONResponse
+from zoho.zoho_client import (
+    compact_leads, enable_lead_notifications, fetch_leads, get_access_token, parse_lead_fields, zoho_breaker,
+)
+from zoho.notifications import NotificationRejected, handle_notification, notification_stats
+from profiling.profiler import ProfiledRoute
+from security.admin_key import admin_key_matches
 
+router = APIRouter(prefix="/zoho", tags=["Zoho CRM"], route_class=ProfiledRoute)
 
-@router.get("/leads")
+
+@router.get("/leads", response_class=FastJSONResponse)
 async def get_leads(
     view: str = Query(
         default=None,
@@ -23,6 +41,14 @@ async def get_leads(
     ),
     page: int = Query(default=1, ge=1, description="Page number"),
     per_page: int = Query(default=50, ge=1, le=200, description="Records per page (max 200)"),
+    fields: str = Query(
+        default=None,
+        description="Comma-separated lead fields to return, e.g. 'name,score,status' (id is always included). Omit for all.",
+    ),
+    format: str = Query(
+        default="objects", pattern="^(objects|compact)$",
+        description="'objects' (one dict per lead) or 'compact' (columns once, then one array per lead)",
+    ),
 ):
     """
     Returns leads from Zoho CRM, optionally filtered by a custom view.
@@ -36,9 +62,27 @@ async def get_leads(
 
       GET /zoho/leads?view=Sales360_Brokerage_Pilot&page=2&per_page=20
         → Paginated pilot leads
+
+      GET /zoho/leads?fields=name,score,status&format=compact
+        → {"columns": ["id", "name", "score", "status"], "rows": [[...], ...]}
+          — only those fields are requested from Zoho, too
+
+    Large responses are gzip/br compressed when the client accepts it
+    (compression/middleware.py).
+
+    While Zoho is unavailable the last good copy of the page is served
+    with "stale": true; with none cached, 503 + Retry-After when the
+    circuit breaker is open.
     """
     try:
-        result = await fetch_leads(view_name=view, page=page, per_page=per_page)
+        selected = parse_lead_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    try:
+        result = await fetch_leads(view_name=view, page=page, per_page=per_page, fields=selected)
+        if format == "compact":
+            rows = compact_leads(result["leads"], selected)
+            result = {k: v for k, v in result.items() if k != "leads"} | rows
         return {
             "success": True,
             "source":  "zoho_crm",
@@ -50,6 +94,12 @@ async def get_leads(
             status_code=500,
             detail=f"Missing environment variable: {e}. Please set ZOHO_CLIENT_ID, ZOHO_CLIENT_SECRET, and ZOHO_REFRESH_TOKEN on Railway.",
         )
+    except CircuitOpen as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Zoho CRM unavailable: {e}",
+            headers={"Retry-After": str(max(1, round(e.retry_after)))},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=502,
@@ -71,6 +121,7 @@ async def zoho_health():
             "success": True,
             "message": "Zoho OAuth connection healthy",
             "token_preview": masked,
+            "circuit": zoho_breaker.status(),
         }
     except KeyError as e:
         raise HTTPException(
@@ -81,4 +132,70 @@ async def zoho_health():
         raise HTTPException(
             status_code=502,
             detail=f"Zoho connection failed: {str(e)}",
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/notifications")
+async def zoho_notifications(payload: dict = Body(...)):
+    """
+    Receiver for Zoho CRM notifications on the Leads module.
+    Changed ids are deduplicated and rescored in one batched fetch shortly after.
+    """
+    try:
+        result = await handle_notification(payload)
+    except KeyError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Missing environment variable: {e}",
+        )
+    except NotificationRejected as e:
+        raise HTTPException(status_code=401, detail=str(e))
+
+    return {"success": True, **result}
+
+
+@router.post("/notifications/enable")
+async def zoho_enable_notifications(
+    notify_url: str = Query(..., description="Public URL of POST /zoho/notifications"),
+    channel_id: str = Query(default=None, description="Defaults to ZOHO_NOTIFY_CHANNEL_ID"),
+    hours: int = Query(default=24, ge=1, le=24, description="Channel lifetime (Zoho max is 1 day)"),
+    x_smartcore_admin_key: str | None = Header(default=None),
+    x_zoho_notify_token: str | None = Header(default=None),
+):
+    """
+    Subscribes the Leads notification channel. Re-run before it expires.
+    Needs X-SmartCore-Admin-Key, or X-Zoho-Notify-Token set to
+    ZOHO_NOTIFY_TOKEN — otherwise anyone could point the channel's
+    notify_url at their own server and receive CRM changes.
+    """
+    notify_token = os.environ.get("ZOHO_NOTIFY_TOKEN")
+    token_ok = bool(notify_token) and x_zoho_notify_token is not None and hmac.compare_digest(
+        x_zoho_notify_token, notify_token
+    )
+    if not (token_ok or admin_key_matches(x_smartcore_admin_key)):
+        raise HTTPException(status_code=403, detail="Admin key or notification token required")
+
+    try:
+        channel_id = channel_id or os.environ["ZOHO_NOTIFY_CHANNEL_ID"]
+        result = await enable_lead_notifications(
+            notify_url=notify_url,
+            channel_id=channel_id,
+            token=os.environ["ZOHO_NOTIFY_TOKEN"],
+            expiry=datetime.now(timezone.utc) + timedelta(hours=hours),
+        )
+        return {"success": True, "channel_id": channel_id, "zoho": result}
+    except KeyError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Missing environment variable: {e}",
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=502,
+            detail=f"Zoho notification setup failed: {str(e)}",
+        )
+
+
+@router.get("/notifications/stats")
+async def zoho_notification_stats():
+    return {"success": True, **notification_stats()}
@@ -8,40 +8,230 @@ Environment variables required on Railway:
   ZOHO_CLIENT_ID       — from api-console.zoho.eu
   ZOHO_CLIENT_SECRET   — from api-console.zoho.eu
   ZOHO_REFRESH_TOKEN   — obtained during OAuth setup
+
+Optional (point SmartCore at another data centre or a local stand-in):
+  ZOHO_ACCOUNTS_URL    — token endpoint, default accounts.zoho.eu
+  ZOHO_CRM_BASE        — CRM API base, default www.zohoapis.eu/crm/v7
+
+The access token and view ids are cached in the shared state backend
+(state/backends.py), so with SMARTCORE_STATE_BACKEND=sqlite|redis every
+worker reuses one token instead of each refreshing its own.
+
+CRM reads go through a circuit breaker (resilience/circuit_breaker.py):
+after repeated timeouts / 5xx / 429s, or when most recent calls are slow,
+calls fail fast with CircuitOpen for a while, then a few probes decide
+whether Zoho is back. fetch_leads answers from the last good copy of the
+same page (marked "stale") while Zoho is unavailable, so the dashboard
+keeps working instead of queueing behind 15 s timeouts. Reads can also
+be hedged (resilience/hedging.py): a second identical GET after the
+call's recent p95 latency, first answer wins.
+
+Optional resilience settings:
+  SMARTCORE_ZOHO_BREAKER           — "0" disables the circuit breaker
+  SMARTCORE_ZOHO_BREAKER_FAILURES  — consecutive failures that open it (default 5)
+  SMARTCORE_ZOHO_BREAKER_SLOW_S    — a call slower than this counts as slow (default 5)
+  SMARTCORE_ZOHO_BREAKER_OPEN_S    — how long it stays open before probing (default 30)
+  SMARTCORE_ZOHO_HEDGE             — "1" hedges CRM GETs (off by default: a
+                                     hedge spends a second API credit)
+  SMARTCORE_ZOHO_HEDGE_FALLBACK_MS — hedge delay until enough latencies are
+                                     known for a p95 (default 1000)
+  SMARTCORE_ZOHO_STALE_TTL_S       — how long lead pages are kept for stale
+                                     answers (default 3600)
 """
 
+import asyncio
 import os
-import httpx
-from datetime import datetime, timedelta
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
 
-# ── Zoho EU data centre endpoints ──────────────────────────────────────────
-ZOHO_ACCOUNTS_URL = "https://accounts.zoho.eu/oauth/v2/token"
-ZOHO_CRM_BASE     = "https://www.zohoapis.eu/crm/v7"
+import httpx
 
-# ── In-memory token cache (refreshed automatically when expired) ────────────
-_token_cache = {
-    "access_token": None,
-    "expires_at":   datetime.utcnow(),
+from metrics.registry import ZOHO_SECONDS, cache_hit, cache_miss, timed
+from models.lead_model import LeadData
+from resilience.circuit_breaker import CLOSED, CircuitBreaker, CircuitOpen
+from resilience.hedging import LatencyWindow, hedged
+from state.backends import get_backend
+from state.snapshots import register_namespace
+from tracing.http import traced_client
+
+# ── Zoho EU data centre endpoints (overridable, e.g. for loadtest/fake_zoho) ─
+ZOHO_ACCOUNTS_URL = os.environ.get("ZOHO_ACCOUNTS_URL", "https://accounts.zoho.eu/oauth/v2/token")
+ZOHO_CRM_BASE     = os.environ.get("ZOHO_CRM_BASE", "https://www.zohoapis.eu/crm/v7")
+
+# Zoho's limit on ids per GET /Leads?ids=... call
+MAX_IDS_PER_FETCH = 100
+
+# Fields SmartCore needs to rescore a lead (read by lead_data_from_record)
+SCORING_FIELDS = [
+    "First_Name",
+    "Last_Name",
+    "Full_Name",
+    "Company",
+    "Email",
+    "Phone",
+    "Designation",
+    "Country",
+    "Lead_Source",
+    "Industry_Type",
+    "Business_Size",
+    "Monthly_Leads_No",
+    "Budget_Readiness",
+    "Decision_Level",
+    "Current_Challenges",
+    "Interested_Services",
+    "Modified_Time",
+]
+
+# Fields the dashboard lead list can show (normalise_lead output key →
+# the Zoho fields it is built from; Zoho always returns the record id).
+# fetch_leads(fields=[...]) asks Zoho for just the fields behind the keys
+# requested, and returns just those keys.
+LEAD_LIST_FIELDS = {
+    "id":          (),
+    "name":        ("First_Name", "Last_Name"),
+    "company":     ("Company",),
+    "email":       ("Email",),
+    "phone":       ("Phone",),
+    "status":      ("Lead_Status",),
+    "source":      ("Lead_Source",),
+    "score":       ("SmartCore_Score", "SmartScore_Intent", "SmartScore_Fit", "SmartScore_Behaviour"),
+    "intent":      ("SmartScore_Intent",),
+    "fit":         ("SmartScore_Fit",),
+    "behaviour":   ("SmartScore_Behaviour",),
+    "created_at":  ("Created_Time",),
+    "modified_at": ("Modified_Time",),
 }
 
 
+def parse_lead_fields(spec: str | None) -> list[str] | None:
+    """
+    "name,score,status" → ["id", "name", "score", "status"] (id is always
+    kept, order follows LEAD_LIST_FIELDS); None or "" → None (every field).
+    Raises ValueError for unknown names.
+    """
+    if not spec:
+        return None
+    requested = {f.strip() for f in spec.split(",") if f.strip()}
+    unknown = requested - LEAD_LIST_FIELDS.keys()
+    if unknown:
+        raise ValueError(f"unknown lead fields: {', '.join(sorted(unknown))}; "
+                         f"choose from {', '.join(LEAD_LIST_FIELDS)}")
+    return [f for f in LEAD_LIST_FIELDS if f == "id" or f in requested]
+
+
+def zoho_fields_for(fields: list[str] | None) -> list[str]:
+    """The Zoho fields to request for these lead list fields (None = all)."""
+    needed = {z for f in (fields or LEAD_LIST_FIELDS) for z in LEAD_LIST_FIELDS[f]}
+    ordered = [z for f in LEAD_LIST_FIELDS for z in LEAD_LIST_FIELDS[f]]
+    # Zoho needs at least one field; Last_Name is mandatory on every lead
+    return list(dict.fromkeys(z for z in ordered if z in needed)) or ["Last_Name"]
+
+# ── Shared token / view-id caches (refreshed automatically when expired) ────
+_token_cache = get_backend("zoho_token")
+_view_cache  = get_backend("zoho_views")
+
+# Single-worker memory backend: keep the token and view ids across restarts
+register_namespace(_token_cache, keys=("access_token",))
+register_namespace(_view_cache)
+
+VIEW_ID_TTL_SECONDS   = 3600
+REFRESH_LOCK_SECONDS  = 10
+
+# ── Circuit breaker, hedging and stale lead pages ──────────────────────────
+BREAKER_ENABLED = os.environ.get("SMARTCORE_ZOHO_BREAKER", "1") != "0"
+HEDGE_ENABLED   = os.environ.get("SMARTCORE_ZOHO_HEDGE", "0") == "1"
+STALE_TTL_SECONDS = int(os.environ.get("SMARTCORE_ZOHO_STALE_TTL_S", "3600"))
+
+zoho_breaker = CircuitBreaker(
+    "zoho_crm",
+    failures=int(os.environ.get("SMARTCORE_ZOHO_BREAKER_FAILURES", "5")),
+    slow_seconds=float(os.environ.get("SMARTCORE_ZOHO_BREAKER_SLOW_S", "5")),
+    open_seconds=float(os.environ.get("SMARTCORE_ZOHO_BREAKER_OPEN_S", "30")),
+)
+_hedge_fallback = int(os.environ.get("SMARTCORE_ZOHO_HEDGE_FALLBACK_MS", "1000")) / 1000
+_latency: defaultdict[str, LatencyWindow] = defaultdict(lambda: LatencyWindow(fallback=_hedge_fallback))
+
+_stale_pages = get_backend("zoho_lead_pages")
+register_namespace(_stale_pages)
+
+
+def _is_outage(response: httpx.Response) -> bool:
+    return response.status_code >= 500 or response.status_code == 429
+
+
+def zoho_unavailable(error: BaseException) -> bool:
+    """True for errors that mean Zoho is down or overloaded (not a bad request)."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return _is_outage(error.response)
+    return isinstance(error, (CircuitOpen, httpx.TransportError))
+
+
+async def _crm_get(client: httpx.AsyncClient, call: str, url: str, **kwargs) -> httpx.Response:
+    """
+    GET against the CRM through the circuit breaker, hedged when enabled.
+    Timeouts, connection errors, 5xx and 429 count against the breaker.
+    """
+    if BREAKER_ENABLED:
+        zoho_breaker.before_call()
+    latency = _latency[call]
+    started = time.perf_counter()
+    try:
+        if HEDGE_ENABLED and zoho_breaker.state == CLOSED:
+            response = await hedged(lambda: client.get(url, **kwargs), latency.hedge_delay(), call)
+        else:
+            response = await client.get(url, **kwargs)
+    except httpx.TransportError:
+        if BREAKER_ENABLED:
+            zoho_breaker.record(False)
+        raise
+
+    elapsed = time.perf_counter() - started
+    if BREAKER_ENABLED:
+        zoho_breaker.record(not _is_outage(response), elapsed)
+    if not _is_outage(response):
+        latency.add(elapsed)
+    return response
+
+
 async def get_access_token() -> str:
     """
     Returns a valid Zoho access token.
     Automatically refreshes using the refresh token if expired.
     """
-    now = datetime.utcnow()
+    # Cached token is stored with a TTL 60s shorter than Zoho's expiry
+    token = _token_cache.get("access_token")
+    if token:
+        cache_hit("zoho_token")
+        return token
+    cache_miss("zoho_token")
+
+    # Only one worker refreshes; the others wait briefly for its token.
+    # The lock holds a per-attempt token so only its holder releases it.
+    lock_token = f"{os.getpid()}:{uuid.uuid4().hex}"
+    holds_lock = _token_cache.compare_and_swap("refresh_lock", None, lock_token, ttl=REFRESH_LOCK_SECONDS)
+    if not holds_lock:
+        for _ in range(REFRESH_LOCK_SECONDS * 10):
+            await asyncio.sleep(0.1)
+            token = _token_cache.get("access_token")
+            if token:
+                return token
+
+    try:
+        return await _refresh_access_token()
+    finally:
+        if holds_lock:
+            _token_cache.compare_and_delete("refresh_lock", lock_token)
 
-    # Return cached token if still valid (with 60s buffer)
-    if _token_cache["access_token"] and _token_cache["expires_at"] > now + timedelta(seconds=60):
-        return _token_cache["access_token"]
 
-    # Refresh the token
+@timed(ZOHO_SECONDS, call="token_refresh")
+async def _refresh_access_token() -> str:
     client_id     = os.environ["ZOHO_CLIENT_ID"]
     client_secret = os.environ["ZOHO_CLIENT_SECRET"]
     refresh_token = os.environ["ZOHO_REFRESH_TOKEN"]
 
-    async with httpx.AsyncClient() as client:
+    async with traced_client() as client:
         response = await client.post(
             ZOHO_ACCOUNTS_URL,
             data={
@@ -57,14 +247,16 @@ async def get_access_token() -> str:
     if "access_token" not in data:
         raise ValueError(f"Zoho token refresh failed: {data}")
 
-    # Cache the new token
-    _token_cache["access_token"] = data["access_token"]
-    _token_cache["expires_at"]   = now + timedelta(seconds=data.get("expires_in", 3600))
+    # Cache the new token (with 60s buffer)
+    ttl = max(data.get("expires_in", 3600) - 60, 1)
+    _token_cache.set("access_token", data["access_token"], ttl=ttl)
 
-    return _token_cache["access_token"]
+    return data["access_token"]
 
 
-async def fetch_leads(view_name: str = None, page: int = 1, per_page: int = 50) -> dict:
+@timed(ZOHO_SECONDS, call="lead_fetch")
+async def fetch_leads(view_name: str = None, page: int = 1, per_page: int = 50,
+                      fields: list[str] | None = None) -> dict:
     """
     Fetches leads from Zoho CRM Leads module.
 
@@ -73,10 +265,33 @@ async def fetch_leads(view_name: str = None, page: int = 1, per_page: int = 50)
                    If None, returns all leads.
         page:      Page number for pagination (default 1).
         per_page:  Records per page, max 200 (default 50).
+        fields:    LEAD_LIST_FIELDS keys to fetch and return (see
+                   parse_lead_fields); None for all of them.
 
     Returns:
         dict with keys: leads (list), total (int), page (int), has_more (bool)
+        While Zoho is unavailable (breaker open, timeouts, 5xx), the last
+        good copy of the same page is returned with stale=True and
+        cached_at; with no copy, the error is raised.
     """
+    key = f"{view_name or ''}|{page}|{per_page}|{','.join(fields or ())}"
+    try:
+        result = await _fetch_leads_page(view_name, page, per_page, fields)
+    except Exception as e:
+        cached = _stale_pages.get(key) if zoho_unavailable(e) else None
+        if cached is None:
+            raise
+        cache_hit("zoho_stale_leads")
+        return {**cached["result"], "stale": True, "cached_at": cached["cached_at"]}
+
+    _stale_pages.set(key, {
+        "result":    result,
+        "cached_at": datetime.now(timezone.utc).isoformat(),
+    }, ttl=STALE_TTL_SECONDS)
+    return result
+
+
+async def _fetch_leads_page(view_name: str | None, page: int, per_page: int, fields: list[str] | None) -> dict:
     token = await get_access_token()
 
     headers = {
@@ -88,22 +303,8 @@ async def fetch_leads(view_name: str = None, page: int = 1, per_page: int = 50)
     params = {
         "page":     page,
         "per_page": per_page,
-        # Pull only the fields the dashboard needs
-        "fields": ",".join([
-            "First_Name",
-            "Last_Name",
-            "Company",
-            "Email",
-            "Phone",
-            "Lead_Status",
-            "Lead_Source",
-            "SmartCore_Score",
-            "SmartScore_Intent",
-            "SmartScore_Fit",
-            "SmartScore_Behaviour",
-            "Created_Time",
-            "Modified_Time",
-        ]),
+        # Pull only the fields the dashboard asked for
+        "fields": ",".join(zoho_fields_for(fields)),
     }
 
     # Apply custom view filter if provided
@@ -113,8 +314,9 @@ async def fetch_leads(view_name: str = None, page: int = 1, per_page: int = 50)
         if view_id:
             params["cvid"] = view_id
 
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        response = await client.get(
+    async with traced_client(timeout=15.0) as client:
+        response = await _crm_get(
+            client, "lead_fetch",
             f"{ZOHO_CRM_BASE}/Leads",
             headers=headers,
             params=params,
@@ -131,7 +333,7 @@ async def fetch_leads(view_name: str = None, page: int = 1, per_page: int = 50)
     info      = data.get("info", {})
 
     # Normalise each lead into a clean dashboard-ready shape
-    leads = [normalise_lead(lead) for lead in raw_leads]
+    leads = [normalise_lead(lead, fields) for lead in raw_leads]
 
     return {
         "leads":    leads,
@@ -141,15 +343,23 @@ async def fetch_leads(view_name: str = None, page: int = 1, per_page: int = 50)
     }
 
 
+@timed(ZOHO_SECONDS, call="view_resolve")
 async def resolve_view_id(view_name: str, token: str) -> str | None:
     """
     Resolves a Zoho custom view name to its ID.
-    Returns None if not found.
+    Returns None if not found. Found ids are cached for VIEW_ID_TTL_SECONDS.
     """
+    cached = _view_cache.get(view_name.strip())
+    if cached:
+        cache_hit("zoho_views")
+        return cached
+    cache_miss("zoho_views")
+
     headers = {"Authorization": f"Zoho-oauthtoken {token}"}
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        response = await client.get(
+    async with traced_client(timeout=10.0) as client:
+        response = await _crm_get(
+            client, "view_resolve",
             f"{ZOHO_CRM_BASE}/Leads/views",
             headers=headers,
         )
@@ -160,15 +370,116 @@ async def resolve_view_id(view_name: str, token: str) -> str | None:
     views = response.json().get("views", [])
     for view in views:
         if view.get("display_value", "").strip() == view_name.strip():
+            _view_cache.set(view_name.strip(), view.get("id"), ttl=VIEW_ID_TTL_SECONDS)
             return view.get("id")
 
     return None
 
 
-def normalise_lead(raw: dict) -> dict:
+@timed(ZOHO_SECONDS, call="lead_fetch_by_ids")
+async def fetch_leads_by_ids(ids: list[str]) -> list[dict]:
+    """
+    Fetches just the given lead records (raw Zoho shape), batching ids
+    MAX_IDS_PER_FETCH at a time. Unknown / deleted ids are simply absent.
+    """
+    if not ids:
+        return []
+
+    token = await get_access_token()
+    headers = {"Authorization": f"Zoho-oauthtoken {token}"}
+
+    records = []
+    async with traced_client(timeout=15.0) as client:
+        for start in range(0, len(ids), MAX_IDS_PER_FETCH):
+            batch = ids[start:start + MAX_IDS_PER_FETCH]
+            response = await _crm_get(
+                client, "lead_fetch_by_ids",
+                f"{ZOHO_CRM_BASE}/Leads",
+                headers=headers,
+                params={
+                    "ids":    ",".join(batch),
+                    "fields": ",".join(SCORING_FIELDS),
+                },
+            )
+            if response.status_code == 204:
+                continue
+            response.raise_for_status()
+            records.extend(response.json().get("data", []))
+
+    return records
+
+
+@timed(ZOHO_SECONDS, call="enable_notifications")
+async def enable_lead_notifications(
+    notify_url: str,
+    channel_id: str,
+    token: str,
+    expiry: datetime | None = None,
+) -> dict:
+    """
+    Subscribes a notification channel to all Leads events (create, edit,
+    delete). Zoho then POSTs change notifications to notify_url.
+    Channels expire after at most one day, so this must be renewed.
+    """
+    access_token = await get_access_token()
+
+    watch = {
+        "channel_id": channel_id,
+        "events":     ["Leads.all"],
+        "notify_url": notify_url,
+        "token":      token,
+    }
+    if expiry:
+        watch["channel_expiry"] = expiry.strftime("%Y-%m-%dT%H:%M:%S+00:00")
+
+    async with traced_client(timeout=15.0) as client:
+        response = await client.post(
+            f"{ZOHO_CRM_BASE}/actions/watch",
+            headers={"Authorization": f"Zoho-oauthtoken {access_token}"},
+            json={"watch": [watch]},
+        )
+
+    response.raise_for_status()
+    return response.json()
+
+
+def lead_data_from_record(raw: dict) -> LeadData:
+    """
+    Maps a raw Zoho lead record (fetched with SCORING_FIELDS) onto the
+    LeadData shape score_lead expects.
+    """
+    full_name = raw.get("Full_Name") or (
+        f"{raw.get('First_Name') or ''} {raw.get('Last_Name') or ''}".strip() or None
+    )
+
+    services = raw.get("Interested_Services")
+    if isinstance(services, str):
+        services = [s.strip() for s in services.split(",") if s.strip()]
+
+    return LeadData(
+        lead_id=raw.get("id"),
+        full_name=full_name,
+        email=raw.get("Email"),
+        phone=raw.get("Phone"),
+        company=raw.get("Company"),
+        title=raw.get("Designation"),
+        country=raw.get("Country"),
+        industry_type=raw.get("Industry_Type"),
+        lead_source=raw.get("Lead_Source"),
+        business_size=raw.get("Business_Size"),
+        monthly_lead_volume=_safe_int(raw.get("Monthly_Leads_No")),
+        budget_readiness=raw.get("Budget_Readiness"),
+        decision_level=raw.get("Decision_Level"),
+        current_challenges=raw.get("Current_Challenges"),
+        interested_services=services or None,
+    )
+
+
+def normalise_lead(raw: dict, fields: list[str] | None = None) -> dict:
     """
     Maps raw Zoho lead fields to the clean shape expected by the dashboard.
     Handles missing SmartCore custom fields gracefully.
+    With `fields`, only those keys are returned.
     """
     first = raw.get("First_Name", "") or ""
     last  = raw.get("Last_Name", "")  or ""
@@ -184,7 +495,7 @@ def normalise_lead(raw: dict) -> dict:
     if smart_score is None and all(v is not None for v in [fit, behaviour, intent]):
         smart_score = round((fit + behaviour + intent) / 3)
 
-    return {
+    lead = {
         "id":           raw.get("id"),
         "name":         name,
         "company":      raw.get("Company") or "—",
@@ -199,6 +510,16 @@ def normalise_lead(raw: dict) -> dict:
         "created_at":   raw.get("Created_Time"),
         "modified_at":  raw.get("Modified_Time"),
     }
+    return lead if fields is None else {f: lead[f] for f in fields}
+
+
+def compact_leads(leads: list[dict], fields: list[str] | None = None) -> dict:
+    """
+    Array-of-arrays form of normalised leads for table views: the keys
+    once in "columns", then one positional row per lead.
+    """
+    columns = fields or list(LEAD_LIST_FIELDS)
+    return {"columns": columns, "rows": [[lead[c] for c in columns] for lead in leads]}
 
 
 def _safe_int(value) -> int | None: